@@ -0,0 +1,28 @@
+import numpy as np
+
+from estoque.config import ABC_LIMITES
+
+
+# Função para classificar itens pela curva ABC (Pareto), em operações vetorizadas do NumPy.
+# Retorna a ordem dos itens (maior valor primeiro), a participação acumulada e a classe de cada item nessa ordem.
+# Um item é A enquanto a participação acumulada antes dele não atinge o primeiro limite, B até o segundo, e C depois.
+def classificar_abc(valores, limites=ABC_LIMITES):
+    ordem = np.argsort(-valores, kind='stable')
+    ordenados = valores[ordem]
+    acumulado = np.cumsum(ordenados)
+    total = acumulado[-1] if len(acumulado) else 0
+    if total <= 0:
+        return ordem, np.zeros(len(valores)), np.full(len(valores), 'C')
+    
+    participacao = acumulado / total
+    anterior = participacao - ordenados / total
+    classes = np.array(['A', 'B', 'C'])[np.searchsorted(limites, anterior, side='right')]
+    return ordem, participacao, classes
+
+# Função para resumir a classificação: itens e participação no total de cada classe
+def resumir_abc(df):
+    total = df['valor'].sum()
+    resumo = df.groupby('classe', observed=True).agg(itens=('valor', 'size'), valor=('valor', 'sum'))
+    resumo['% itens'] = resumo['itens'] / len(df) * 100 if len(df) else 0
+    resumo['% valor'] = resumo['valor'] / total * 100 if total else 0
+    return resumo.reset_index()
@@ -0,0 +1,44 @@
+import argparse
+import json
+
+from estoque.banco import conectar, criar_schema
+from estoque.config import DB_PATH
+
+
+# Alterações posteriores a uma sequência, em ordem (busca pela chave primária seq)
+SQL_ALTERACOES = '''
+    SELECT seq, tabela, operacao, chave, dados
+    FROM alteracoes
+    WHERE seq > ?
+    ORDER BY seq
+    LIMIT ?
+'''
+
+# Função para obter até `limite` alterações posteriores à sequência `apos_seq`.
+# Cada alteração é [seq, tabela, operacao (I/U/D), id, {coluna: valor}], com as colunas que a tabela tinha
+# quando a alteração foi gravada. O consumidor guarda 'ultimo_seq' e pede a partir dele na próxima consulta.
+def get_alteracoes(conn, apos_seq=0, limite=1000):
+    linhas = conn.execute(SQL_ALTERACOES, (apos_seq, limite)).fetchall()
+    alteracoes = [[seq, tabela, operacao, chave, json.loads(dados)] for seq, tabela, operacao, chave, dados in linhas]
+    return {
+        'ultimo_seq': alteracoes[-1][0] if alteracoes else apos_seq,
+        'alteracoes': alteracoes,
+    }
+
+# Função para apagar as alterações já consumidas por todas as integrações (até a sequência informada)
+def limpar_alteracoes(conn, ate_seq):
+    with conn:
+        return conn.execute("DELETE FROM alteracoes WHERE seq <= ?", (ate_seq,)).rowcount
+
+# Consumo pela linha de comando: python -m estoque.alteracoes --apos 0 --limite 1000
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Feed de alterações de produtos e movimentações")
+    parser.add_argument('--banco', default=DB_PATH)
+    parser.add_argument('--apos', type=int, default=0, help="última sequência já consumida")
+    parser.add_argument('--limite', type=int, default=1000)
+    args = parser.parse_args()
+    
+    conn = conectar(args.banco)
+    criar_schema(conn)
+    print(json.dumps(get_alteracoes(conn, args.apos, args.limite), ensure_ascii=False, separators=(',', ':')))
+    conn.close()
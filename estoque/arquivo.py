@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta, timezone
+
+from estoque.banco import get_colunas
+from estoque.config import ARQUIVO_HORIZONTE_DIAS, CENTRAL_DB_PATH, EXPURGO_MOVIMENTACOES, EXPURGO_PRODUTOS_DIAS
+from estoque.sincronizacao import get_sincronizado_ate
+
+
+# Função para listar as partições de arquivo necessárias para um período
+def get_particoes_arquivo(conn, data_inicio=None, data_fim=None):
+    query = "SELECT tabela FROM arquivo_particoes WHERE 1 = 1"
+    params = []
+    if data_inicio:
+        query += " AND fim > ?"
+        params.append(str(data_inicio))
+    if data_fim:
+        query += " AND inicio < ?"
+        params.append(str(data_fim + timedelta(days=1)))
+    query += " ORDER BY inicio"
+    return [row[0] for row in conn.execute(query, params).fetchall()]
+
+# Função para adicionar a uma partição as colunas criadas na tabela atual depois dela
+def sincronizar_colunas(conn, tabela, colunas):
+    existentes = get_colunas(conn, tabela, 'arquivo')
+    for coluna in colunas:
+        if coluna not in existentes:
+            conn.execute(f'ALTER TABLE arquivo."{tabela}" ADD COLUMN {coluna}')
+
+# Função para alinhar todas as partições às colunas da tabela atual
+def sincronizar_particoes(conn):
+    colunas = get_colunas(conn, 'movimentacoes')
+    for (tabela,) in conn.execute("SELECT tabela FROM arquivo_particoes").fetchall():
+        sincronizar_colunas(conn, tabela, colunas)
+
+# Função para arquivar movimentações anteriores ao horizonte em tabelas mensais. O corte é em UTC, como o
+# criado_em (CURRENT_TIMESTAMP); no terminal, só saem as movimentações já recebidas pelo banco central
+# (as pendentes precisam continuar em movimentacoes para serem enviadas).
+def arquivar_movimentacoes(conn, horizonte_dias=None):
+    horizonte_dias = ARQUIVO_HORIZONTE_DIAS if horizonte_dias is None else horizonte_dias
+    # Corte no início do mês para que cada partição receba meses completos
+    corte = (datetime.now(timezone.utc) - timedelta(days=horizonte_dias)).replace(day=1).strftime('%Y-%m-%d')
+    ate_id = get_sincronizado_ate(conn) if CENTRAL_DB_PATH else conn.execute(
+        "SELECT COALESCE(MAX(id), 0) FROM movimentacoes"
+    ).fetchone()[0]
+    colunas = get_colunas(conn, 'movimentacoes')
+    lista_colunas = ', '.join(colunas)
+    
+    meses = [row[0] for row in conn.execute(
+        "SELECT DISTINCT strftime('%Y-%m', criado_em) FROM movimentacoes WHERE criado_em < ? AND id <= ? ORDER BY 1",
+        (corte, ate_id)
+    ).fetchall()]
+    
+    total = 0
+    for mes in meses:
+        inicio = f"{mes}-01"
+        ano, num_mes = int(mes[:4]), int(mes[5:])
+        fim = f"{ano + num_mes // 12}-{num_mes % 12 + 1:02d}-01"
+        tabela = f"movimentacoes_{mes.replace('-', '_')}"
+        
+        with conn:
+            conn.execute(f'CREATE TABLE IF NOT EXISTS arquivo."{tabela}" AS SELECT * FROM main.movimentacoes WHERE 0')
+            sincronizar_colunas(conn, tabela, colunas)
+            conn.execute(f'CREATE INDEX IF NOT EXISTS arquivo."idx_{tabela}_produto" ON "{tabela}" (produto_id, criado_em)')
+            
+            filtro = "criado_em >= ? AND criado_em < ? AND criado_em < ? AND id <= ?"
+            params = (inicio, fim, corte, ate_id)
+            conn.execute(f'''
+                INSERT INTO arquivo."{tabela}" ({lista_colunas})
+                SELECT {lista_colunas} FROM main.movimentacoes WHERE {filtro}
+            ''', params)
+            
+            # Totais arquivados por produto e local
+            conn.execute(f'''
+                INSERT INTO movimentacoes_arquivadas_saldo (produto_id, local_id, entradas, saidas, ultimo_id)
+                SELECT produto_id, local_id,
+                       SUM(CASE WHEN tipo = 'ENTRADA' THEN quantidade ELSE 0 END),
+                       SUM(CASE WHEN tipo = 'SAIDA' THEN quantidade ELSE 0 END),
+                       MAX(id)
+                FROM main.movimentacoes WHERE {filtro}
+                GROUP BY produto_id, local_id
+                ON CONFLICT (produto_id, local_id) DO UPDATE SET
+                    entradas = entradas + excluded.entradas,
+                    saidas = saidas + excluded.saidas,
+                    ultimo_id = MAX(ultimo_id, excluded.ultimo_id)
+            ''', params)
+            
+            linhas = conn.execute(f"DELETE FROM main.movimentacoes WHERE {filtro}", params).rowcount
+            conn.execute('''
+                INSERT INTO arquivo_particoes (tabela, inicio, fim, linhas) VALUES (?, ?, ?, ?)
+                ON CONFLICT (tabela) DO UPDATE SET linhas = linhas + excluded.linhas
+            ''', (tabela, inicio, fim, linhas))
+            total += linhas
+    
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('arquivamento_ultima_execucao', ?)",
+            (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),)
+        )
+    return total
+
+# Função para copiar para uma tabela do arquivo morto as linhas de uma tabela da loja de um conjunto
+# de produtos (tabela temporária `expurgo`), com a data do expurgo
+def _copiar_para_arquivo(conn, origem, destino, coluna):
+    colunas = get_colunas(conn, origem)
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS arquivo."{destino}" AS
+        SELECT *, CURRENT_TIMESTAMP AS expurgado_em FROM main."{origem}" WHERE 0
+    ''')
+    sincronizar_colunas(conn, destino, colunas)
+    lista_colunas = ', '.join(colunas)
+    conn.execute(f'''
+        INSERT INTO arquivo."{destino}" ({lista_colunas}, expurgado_em)
+        SELECT {lista_colunas}, CURRENT_TIMESTAMP FROM main."{origem}"
+        WHERE {coluna} IN (SELECT produto_id FROM temp.expurgo)
+    ''')
+
+# Função para expurgar os produtos removidos há mais de `dias` dias e sem estoque (nem em pedido em
+# rascunho): o cadastro vai para arquivo.produtos_expurgados e saem da loja os saldos zerados, lotes e
+# camadas de custo. Com `movimentacoes`, as movimentações do produto vão para
+# arquivo.movimentacoes_expurgadas e saem também o histórico de custo e de preço e os totais já
+# arquivados; sem, o livro razão e a valorização de datas passadas ficam intactos (o histórico de custo e
+# de preço e a linha zerada de custo_produtos, de onde partem as consultas em uma data, ficam na loja). No fim, o espaço liberado volta ao sistema por
+# PRAGMA incremental_vacuum (bancos antigos são convertidos por um VACUUM na primeira vez).
+def expurgar_produtos(conn, dias=None, movimentacoes=None):
+    dias = EXPURGO_PRODUTOS_DIAS if dias is None else dias
+    movimentacoes = EXPURGO_MOVIMENTACOES if movimentacoes is None else movimentacoes
+    corte = (datetime.now(timezone.utc) - timedelta(days=dias)).strftime('%Y-%m-%d %H:%M:%S')
+    
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp.expurgo")
+        conn.execute('''
+            CREATE TEMP TABLE expurgo AS
+            SELECT p.id AS produto_id FROM produtos p
+            WHERE p.ativo = 0 AND p.inativado_em < ? AND p.quantidade = 0
+              AND NOT EXISTS (
+                  SELECT 1 FROM pedidos_compra_itens i JOIN pedidos_compra pc ON pc.id = i.pedido_id
+                  WHERE i.produto_id = p.id AND pc.status = 'rascunho'
+              )
+        ''', (corte,))
+        total = conn.execute("SELECT COUNT(*) FROM temp.expurgo").fetchone()[0]
+        
+        if total:
+            _copiar_para_arquivo(conn, 'produtos', 'produtos_expurgados', 'id')
+            tabelas = ['estoque_locais', 'lotes', 'custo_camadas']
+            if movimentacoes:
+                _copiar_para_arquivo(conn, 'movimentacoes', 'movimentacoes_expurgadas', 'produto_id')
+                tabelas += ['movimentacoes', 'movimentacoes_arquivadas_saldo', 'razao_verificado', 'custo_produtos',
+                            'custo_saldos', 'precos_historico']
+            for tabela in tabelas:
+                conn.execute(f"DELETE FROM main.{tabela} WHERE produto_id IN (SELECT produto_id FROM temp.expurgo)")
+            conn.execute("DELETE FROM main.produtos WHERE id IN (SELECT produto_id FROM temp.expurgo)")
+        
+        conn.execute("DROP TABLE temp.expurgo")
+        conn.execute(
+            "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('expurgo_ultima_execucao', ?)",
+            (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),)
+        )
+    
+    if total:
+        if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] == 2:
+            # executescript: o sqlite3 do Python executaria um único passo (uma página) do pragma
+            conn.executescript("PRAGMA main.incremental_vacuum")
+        else:
+            conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM main")
+    return total
+
+# Função para obter a data/hora do último expurgo de produtos inativos
+def get_ultimo_expurgo(conn):
+    ultima = conn.execute("SELECT valor FROM controle WHERE chave = 'expurgo_ultima_execucao'").fetchone()
+    return ultima[0] if ultima else None
+
+# Função para obter a data/hora do último arquivamento
+def get_ultimo_arquivamento(conn):
+    ultima = conn.execute("SELECT valor FROM controle WHERE chave = 'arquivamento_ultima_execucao'").fetchone()
+    return ultima[0] if ultima else None
@@ -0,0 +1,753 @@
+import os
+import sqlite3
+
+from estoque.config import DB_PATH, ARQUIVO_DB_PATH, LOCAL_PADRAO
+
+
+# Versão mínima do SQLite: as migrações usam ALTER TABLE ... DROP COLUMN (3.35) e as consultas e triggers
+# usam UPDATE ... FROM (3.33)
+SQLITE_VERSAO_MINIMA = (3, 35, 0)
+
+# Função para abrir uma conexão com o banco de dados
+def conectar(caminho=DB_PATH, **kwargs):
+    return sqlite3.connect(caminho, **kwargs)
+
+# Função para criar as tabelas e índices (antes, confere a versão do SQLite, para que uma versão antiga não
+# pare as migrações no meio)
+def criar_schema(conn):
+    if sqlite3.sqlite_version_info < SQLITE_VERSAO_MINIMA:
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} não suportado: o Estoque Fácil requer o SQLite "
+            f"{'.'.join(map(str, SQLITE_VERSAO_MINIMA))} ou superior (use um Python mais novo ou atualize o SQLite)"
+        )
+    
+    cursor = conn.cursor()
+    
+    # Banco novo: páginas livres devolvidas por PRAGMA incremental_vacuum (sem efeito em banco existente)
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    
+    # Criar tabela de produtos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS produtos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            descricao TEXT,
+            categoria TEXT NOT NULL,
+            preco REAL NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            estoque_minimo INTEGER NOT NULL DEFAULT 0,
+            ativo BOOLEAN DEFAULT 1,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Criar tabela de movimentações
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS movimentacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            quantidade INTEGER NOT NULL,
+            produto_id INTEGER,
+            observacao TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        )
+    ''')
+    
+    # Índices das consultas de histórico
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movimentacoes_criado_em ON movimentacoes (criado_em)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movimentacoes_produto ON movimentacoes (produto_id, criado_em)")
+    
+    # Controle de tarefas (chave/valor)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS controle (
+            chave TEXT PRIMARY KEY,
+            valor TEXT
+        )
+    ''')
+    
+    # Partições mensais de movimentações arquivadas
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS arquivo_particoes (
+            tabela TEXT PRIMARY KEY,
+            inicio TIMESTAMP NOT NULL,
+            fim TIMESTAMP NOT NULL,
+            linhas INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    # Totais por produto das movimentações arquivadas (mantém o saldo do razão completo)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS movimentacoes_arquivadas_saldo (
+            produto_id INTEGER PRIMARY KEY,
+            entradas INTEGER NOT NULL DEFAULT 0,
+            saidas INTEGER NOT NULL DEFAULT 0,
+            ultimo_id INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    conn.commit()
+    migrar(conn)
+
+# Migração 1: locais de estoque, saldo por (produto, local) e movimentações por local
+def _migracao_locais(conn):
+    conn.execute('''
+        CREATE TABLE locais (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL UNIQUE,
+            ativo BOOLEAN DEFAULT 1,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute("INSERT INTO locais (id, nome) VALUES (?, 'Principal')", (LOCAL_PADRAO,))
+    
+    conn.execute('''
+        CREATE TABLE estoque_locais (
+            produto_id INTEGER NOT NULL,
+            local_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (produto_id, local_id),
+            FOREIGN KEY (produto_id) REFERENCES produtos (id),
+            FOREIGN KEY (local_id) REFERENCES locais (id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX idx_estoque_locais_local ON estoque_locais (local_id, quantidade)")
+    conn.execute('''
+        INSERT INTO estoque_locais (produto_id, local_id, quantidade)
+        SELECT id, ?, quantidade FROM produtos
+    ''', (LOCAL_PADRAO,))
+    
+    conn.execute("ALTER TABLE movimentacoes ADD COLUMN local_id INTEGER")
+    conn.execute("UPDATE movimentacoes SET local_id = ?", (LOCAL_PADRAO,))
+    conn.execute("CREATE INDEX idx_movimentacoes_local ON movimentacoes (local_id, criado_em)")
+    
+    # Totais arquivados passam a ser por (produto, local)
+    conn.execute("ALTER TABLE movimentacoes_arquivadas_saldo RENAME TO movimentacoes_arquivadas_saldo_antiga")
+    conn.execute('''
+        CREATE TABLE movimentacoes_arquivadas_saldo (
+            produto_id INTEGER NOT NULL,
+            local_id INTEGER NOT NULL,
+            entradas INTEGER NOT NULL DEFAULT 0,
+            saidas INTEGER NOT NULL DEFAULT 0,
+            ultimo_id INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (produto_id, local_id)
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO movimentacoes_arquivadas_saldo (produto_id, local_id, entradas, saidas, ultimo_id)
+        SELECT produto_id, ?, entradas, saidas, ultimo_id FROM movimentacoes_arquivadas_saldo_antiga
+    ''', (LOCAL_PADRAO,))
+    conn.execute("DROP TABLE movimentacoes_arquivadas_saldo_antiga")
+
+# Migração 2: lotes com data de validade por (produto, local)
+def _migracao_lotes(conn):
+    conn.execute('''
+        CREATE TABLE lotes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,
+            local_id INTEGER NOT NULL,
+            codigo TEXT,
+            validade DATE NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (produto_id) REFERENCES produtos (id),
+            FOREIGN KEY (local_id) REFERENCES locais (id)
+        )
+    ''')
+    # Índices parciais: apenas lotes com saldo (fila FEFO do produto no local e alerta de vencimento)
+    conn.execute('''
+        CREATE INDEX idx_lotes_fefo ON lotes (produto_id, local_id, validade)
+        WHERE quantidade > 0
+    ''')
+    conn.execute("CREATE INDEX idx_lotes_validade ON lotes (validade) WHERE quantidade > 0")
+
+# Migração 3: código do produto (SKU/EAN), único e indexado para a leitura por scanner
+def _migracao_codigo(conn):
+    conn.execute("ALTER TABLE produtos ADD COLUMN codigo TEXT")
+    conn.execute("CREATE UNIQUE INDEX idx_produtos_codigo ON produtos (codigo) WHERE codigo IS NOT NULL")
+
+# Migração 4: movimentacoes como livro razão (somente inclusão); os saldos de estoque_locais e
+# produtos.quantidade passam a ser uma projeção mantida por triggers a cada movimentação incluída
+def _migracao_livro_razao(conn):
+    conn.execute('''
+        CREATE TRIGGER trg_movimentacoes_somente_inclusao
+        BEFORE UPDATE ON movimentacoes
+        BEGIN
+            SELECT RAISE(ABORT, 'movimentacoes: somente inclusão');
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER trg_movimentacoes_estoque_insuficiente
+        BEFORE INSERT ON movimentacoes
+        WHEN NEW.tipo = 'SAIDA' AND COALESCE((
+            SELECT quantidade FROM estoque_locais
+            WHERE produto_id = NEW.produto_id AND local_id = NEW.local_id
+        ), 0) < NEW.quantidade
+        BEGIN
+            SELECT RAISE(ABORT, 'estoque insuficiente');
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER trg_movimentacoes_projecao
+        AFTER INSERT ON movimentacoes
+        BEGIN
+            INSERT INTO estoque_locais (produto_id, local_id, quantidade)
+            VALUES (NEW.produto_id, NEW.local_id,
+                    CASE NEW.tipo WHEN 'ENTRADA' THEN NEW.quantidade ELSE -NEW.quantidade END)
+            ON CONFLICT (produto_id, local_id) DO UPDATE SET quantidade = quantidade + excluded.quantidade;
+            
+            UPDATE produtos
+            SET quantidade = quantidade + CASE NEW.tipo WHEN 'ENTRADA' THEN NEW.quantidade ELSE -NEW.quantidade END,
+                atualizado_em = CURRENT_TIMESTAMP
+            WHERE id = NEW.produto_id;
+        END
+    ''')
+
+# Migração 5: conferência do livro razão. Movimentações de conciliação registram no razão uma
+# diferença que já está no saldo, por isso não passam pelos triggers de projeção.
+def _migracao_conciliacao(conn):
+    conn.execute("ALTER TABLE movimentacoes ADD COLUMN conciliacao INTEGER NOT NULL DEFAULT 0")
+    
+    # Versões antigas da baixa de estoque gravaram produto_id como BLOB (int64 do numpy)
+    conn.execute("DROP TRIGGER trg_movimentacoes_somente_inclusao")
+    for mov_id, produto_id in conn.execute(
+        "SELECT id, produto_id FROM movimentacoes WHERE typeof(produto_id) = 'blob'"
+    ).fetchall():
+        conn.execute("UPDATE movimentacoes SET produto_id = ? WHERE id = ?", (int.from_bytes(produto_id, 'little'), mov_id))
+    for produto_id, local_id, entradas, saidas, ultimo_id in conn.execute(
+        "SELECT * FROM movimentacoes_arquivadas_saldo WHERE typeof(produto_id) = 'blob'"
+    ).fetchall():
+        conn.execute('''
+            INSERT INTO movimentacoes_arquivadas_saldo (produto_id, local_id, entradas, saidas, ultimo_id)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (produto_id, local_id) DO UPDATE SET
+                entradas = entradas + excluded.entradas,
+                saidas = saidas + excluded.saidas,
+                ultimo_id = MAX(ultimo_id, excluded.ultimo_id)
+        ''', (int.from_bytes(produto_id, 'little'), local_id, entradas, saidas, ultimo_id))
+        conn.execute(
+            "DELETE FROM movimentacoes_arquivadas_saldo WHERE produto_id = ? AND local_id = ?", (produto_id, local_id)
+        )
+    conn.execute('''
+        CREATE TRIGGER trg_movimentacoes_somente_inclusao
+        BEFORE UPDATE ON movimentacoes
+        BEGIN
+            SELECT RAISE(ABORT, 'movimentacoes: somente inclusão');
+        END
+    ''')
+    
+    conn.execute("DROP TRIGGER trg_movimentacoes_estoque_insuficiente")
+    conn.execute("DROP TRIGGER trg_movimentacoes_projecao")
+    conn.execute('''
+        CREATE TRIGGER trg_movimentacoes_estoque_insuficiente
+        BEFORE INSERT ON movimentacoes
+        WHEN NEW.conciliacao = 0 AND NEW.tipo = 'SAIDA' AND COALESCE((
+            SELECT quantidade FROM estoque_locais
+            WHERE produto_id = NEW.produto_id AND local_id = NEW.local_id
+        ), 0) < NEW.quantidade
+        BEGIN
+            SELECT RAISE(ABORT, 'estoque insuficiente');
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER trg_movimentacoes_projecao
+        AFTER INSERT ON movimentacoes
+        WHEN NEW.conciliacao = 0
+        BEGIN
+            INSERT INTO estoque_locais (produto_id, local_id, quantidade)
+            VALUES (NEW.produto_id, NEW.local_id,
+                    CASE NEW.tipo WHEN 'ENTRADA' THEN NEW.quantidade ELSE -NEW.quantidade END)
+            ON CONFLICT (produto_id, local_id) DO UPDATE SET quantidade = quantidade + excluded.quantidade;
+            
+            UPDATE produtos
+            SET quantidade = quantidade + CASE NEW.tipo WHEN 'ENTRADA' THEN NEW.quantidade ELSE -NEW.quantidade END,
+                atualizado_em = CURRENT_TIMESTAMP
+            WHERE id = NEW.produto_id;
+        END
+    ''')
+    
+    # Saldo do razão por (produto, local) até a última movimentação conferida (controle 'razao_verificado_ate')
+    conn.execute('''
+        CREATE TABLE razao_verificado (
+            produto_id INTEGER NOT NULL,
+            local_id INTEGER NOT NULL,
+            saldo INTEGER NOT NULL,
+            PRIMARY KEY (produto_id, local_id)
+        ) WITHOUT ROWID
+    ''')
+
+# Migração 6: sincronização de terminais com o banco central. Cada movimentação recebida de um terminal
+# é identificada por (terminal, seq), e as saídas que deixariam o saldo negativo ficam como conflito.
+def _migracao_sincronizacao(conn):
+    conn.execute('''
+        CREATE TABLE sincronizacao_recebidas (
+            terminal TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            movimentacao_id INTEGER,
+            recebido_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (terminal, seq)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE sincronizacao_conflitos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            terminal TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            tipo TEXT NOT NULL,
+            quantidade INTEGER NOT NULL,
+            produto_id INTEGER,
+            local_id INTEGER,
+            observacao TEXT,
+            criado_em TIMESTAMP,
+            motivo TEXT NOT NULL,
+            recebido_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+# Função para (re)criar os triggers que registram em `alteracoes` as inclusões, alterações e exclusões de
+# uma tabela, com os valores de todas as colunas como objeto JSON (coluna -> valor). As migrações que
+# alteram as colunas de uma tabela com feed recriam os triggers.
+def criar_triggers_alteracoes(conn, tabela, operacoes=('I', 'U', 'D')):
+    colunas = get_colunas(conn, tabela)
+    eventos = {'I': ('INSERT', 'NEW'), 'U': ('UPDATE', 'NEW'), 'D': ('DELETE', 'OLD')}
+    for operacao, (evento, linha) in eventos.items():
+        nome = f"trg_{tabela}_alteracoes_{evento.lower()}"
+        conn.execute(f"DROP TRIGGER IF EXISTS {nome}")
+        if operacao not in operacoes:
+            continue
+        valores = ', '.join(f"'{coluna}', {linha}.{coluna}" for coluna in colunas)
+        conn.execute(f'''
+            CREATE TRIGGER {nome}
+            AFTER {evento} ON {tabela}
+            BEGIN
+                INSERT INTO alteracoes (tabela, operacao, chave, dados)
+                VALUES ('{tabela}', '{operacao}', {linha}.id, json_object({valores}));
+            END
+        ''')
+
+# Migração 7: feed de alterações (change data capture) de produtos e movimentacoes. As movimentações só
+# são incluídas (as exclusões do arquivamento não entram no feed).
+def _migracao_alteracoes(conn):
+    conn.execute('''
+        CREATE TABLE alteracoes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabela TEXT NOT NULL,
+            operacao TEXT NOT NULL,
+            chave INTEGER NOT NULL,
+            dados TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    criar_triggers_alteracoes(conn, 'produtos')
+    criar_triggers_alteracoes(conn, 'movimentacoes', operacoes=('I',))
+
+# Movimentações que entram na valorização do estoque: conciliações do razão e transferências entre locais
+# não mudam o custo. Até a migração 15, as transferências eram reconhecidas pela observação.
+CONDICAO_CUSTO_OBSERVACAO = "NEW.conciliacao = 0 AND COALESCE(NEW.observacao, '') NOT LIKE '%Transferência do local %'"
+CONDICAO_CUSTO = "NEW.conciliacao = 0 AND NEW.transferencia = 0"
+
+# Fila PEPS (FIFO) das camadas de custo abertas do produto, com a quantidade das camadas anteriores
+SQL_FILA_CUSTO = '''
+    SELECT id AS camada_id, custo_unitario, restante,
+           COALESCE(SUM(restante) OVER (ORDER BY id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0) AS anteriores
+    FROM custo_camadas
+    WHERE produto_id = NEW.produto_id AND restante > 0
+'''
+
+# Função para (re)criar os triggers de custo das movimentações (entradas e saídas que atendem à condição)
+def criar_triggers_custo(conn, condicao=CONDICAO_CUSTO):
+    # Entrada: nova camada pelo custo informado (sem custo, pelo custo médio atual; sem custo médio, pelo
+    # preço de venda, como na camada inicial da migração 8)
+    custo_entrada = '''COALESCE(NEW.custo_unitario, (
+        SELECT valor_medio / quantidade FROM custo_produtos WHERE produto_id = NEW.produto_id AND quantidade > 0
+    ), (SELECT preco FROM produtos WHERE id = NEW.produto_id), 0)'''
+    conn.execute("DROP TRIGGER IF EXISTS trg_movimentacoes_custo_entrada")
+    conn.execute(f'''
+        CREATE TRIGGER trg_movimentacoes_custo_entrada
+        AFTER INSERT ON movimentacoes
+        WHEN NEW.tipo = 'ENTRADA' AND {condicao}
+        BEGIN
+            INSERT INTO custo_camadas (produto_id, movimentacao_id, custo_unitario, restante)
+            VALUES (NEW.produto_id, NEW.id, {custo_entrada}, NEW.quantidade);
+            
+            INSERT INTO custo_produtos (produto_id, quantidade, valor_fifo, valor_medio)
+            VALUES (NEW.produto_id, NEW.quantidade, NEW.quantidade * {custo_entrada}, NEW.quantidade * {custo_entrada})
+            ON CONFLICT (produto_id) DO UPDATE SET
+                quantidade = quantidade + excluded.quantidade,
+                valor_fifo = valor_fifo + excluded.valor_fifo,
+                valor_medio = valor_medio + excluded.valor_medio;
+            
+            INSERT INTO custo_saldos (movimentacao_id, produto_id, criado_em, quantidade, valor_fifo, valor_medio)
+            SELECT NEW.id, produto_id, NEW.criado_em, quantidade, valor_fifo, valor_medio
+            FROM custo_produtos WHERE produto_id = NEW.produto_id;
+        END
+    ''')
+    
+    # Saída: baixa as camadas mais antigas (PEPS) e o custo médio proporcional à quantidade
+    conn.execute("DROP TRIGGER IF EXISTS trg_movimentacoes_custo_saida")
+    conn.execute(f'''
+        CREATE TRIGGER trg_movimentacoes_custo_saida
+        AFTER INSERT ON movimentacoes
+        WHEN NEW.tipo = 'SAIDA' AND {condicao}
+        BEGIN
+            UPDATE custo_produtos SET
+                valor_fifo = CASE WHEN quantidade > NEW.quantidade THEN valor_fifo - COALESCE((
+                    SELECT SUM(MIN(restante, MAX(0, NEW.quantidade - anteriores)) * custo_unitario)
+                    FROM ({SQL_FILA_CUSTO})
+                ), 0) ELSE 0 END,
+                valor_medio = CASE WHEN quantidade > NEW.quantidade
+                                   THEN valor_medio * (quantidade - NEW.quantidade) / quantidade ELSE 0 END,
+                quantidade = quantidade - NEW.quantidade
+            WHERE produto_id = NEW.produto_id;
+            
+            UPDATE custo_camadas
+            SET restante = custo_camadas.restante - MIN(custo_camadas.restante, NEW.quantidade - fila.anteriores)
+            FROM ({SQL_FILA_CUSTO}) AS fila
+            WHERE custo_camadas.id = fila.camada_id AND fila.anteriores < NEW.quantidade;
+            
+            INSERT INTO custo_saldos (movimentacao_id, produto_id, criado_em, quantidade, valor_fifo, valor_medio)
+            SELECT NEW.id, produto_id, NEW.criado_em, quantidade, valor_fifo, valor_medio
+            FROM custo_produtos WHERE produto_id = NEW.produto_id;
+        END
+    ''')
+
+# Migração 8: custo das entradas e valorização do estoque por PEPS (FIFO) e custo médio ponderado,
+# mantidas por triggers a cada movimentação: camadas de custo (custo_camadas), saldo atual de cada
+# produto (custo_produtos) e o saldo depois de cada movimentação (custo_saldos), para consultar a
+# valorização de qualquer data sem refazer o razão. O estoque existente entra como uma camada inicial
+# com o preço de venda como estimativa de custo.
+def _migracao_custos(conn):
+    conn.execute("ALTER TABLE movimentacoes ADD COLUMN custo_unitario REAL")
+    conn.execute('''
+        CREATE TABLE custo_camadas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,
+            movimentacao_id INTEGER,
+            custo_unitario REAL NOT NULL,
+            restante INTEGER NOT NULL
+        )
+    ''')
+    conn.execute("CREATE INDEX idx_custo_camadas_fila ON custo_camadas (produto_id, id) WHERE restante > 0")
+    conn.execute('''
+        CREATE TABLE custo_produtos (
+            produto_id INTEGER PRIMARY KEY,
+            quantidade INTEGER NOT NULL,
+            valor_fifo REAL NOT NULL,
+            valor_medio REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE custo_saldos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            movimentacao_id INTEGER,
+            produto_id INTEGER NOT NULL,
+            criado_em TIMESTAMP NOT NULL,
+            quantidade INTEGER NOT NULL,
+            valor_fifo REAL NOT NULL,
+            valor_medio REAL NOT NULL
+        )
+    ''')
+    conn.execute("CREATE INDEX idx_custo_saldos_produto ON custo_saldos (produto_id, criado_em)")
+    
+    # Estoque existente: camada inicial pelo preço de venda
+    conn.execute('''
+        INSERT INTO custo_camadas (produto_id, custo_unitario, restante)
+        SELECT id, preco, quantidade FROM produtos WHERE quantidade > 0
+    ''')
+    conn.execute('''
+        INSERT INTO custo_produtos (produto_id, quantidade, valor_fifo, valor_medio)
+        SELECT id, quantidade, preco * quantidade, preco * quantidade FROM produtos WHERE quantidade > 0
+    ''')
+    conn.execute('''
+        INSERT INTO custo_saldos (produto_id, criado_em, quantidade, valor_fifo, valor_medio)
+        SELECT produto_id, CURRENT_TIMESTAMP, quantidade, valor_fifo, valor_medio FROM custo_produtos
+    ''')
+    
+    criar_triggers_custo(conn, CONDICAO_CUSTO_OBSERVACAO)
+    criar_triggers_alteracoes(conn, 'movimentacoes', operacoes=('I',))
+
+# Migração 9: fornecedores dos produtos e pedidos de compra (rascunho -> recebido ou cancelado)
+def _migracao_compras(conn):
+    conn.execute('''
+        CREATE TABLE fornecedores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL UNIQUE,
+            ativo BOOLEAN DEFAULT 1,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute("ALTER TABLE produtos ADD COLUMN fornecedor_id INTEGER REFERENCES fornecedores (id)")
+    conn.execute('''
+        CREATE TABLE pedidos_compra (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fornecedor_id INTEGER REFERENCES fornecedores (id),
+            local_id INTEGER NOT NULL REFERENCES locais (id),
+            status TEXT NOT NULL DEFAULT 'rascunho',
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            recebido_em TIMESTAMP
+        )
+    ''')
+    conn.execute("CREATE INDEX idx_pedidos_compra_status ON pedidos_compra (status)")
+    conn.execute('''
+        CREATE TABLE pedidos_compra_itens (
+            pedido_id INTEGER NOT NULL REFERENCES pedidos_compra (id),
+            produto_id INTEGER NOT NULL REFERENCES produtos (id),
+            quantidade INTEGER NOT NULL,
+            custo_unitario REAL,
+            PRIMARY KEY (pedido_id, produto_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX idx_pedidos_compra_itens_produto ON pedidos_compra_itens (produto_id)")
+    
+    criar_triggers_alteracoes(conn, 'produtos')
+
+# Migração 10: histórico de preços de venda (preço vigente de cada produto a partir de uma data),
+# gravado por triggers na inclusão do produto e a cada alteração do preço
+def _migracao_historico_precos(conn):
+    conn.execute('''
+        CREATE TABLE precos_historico (
+            produto_id INTEGER NOT NULL,
+            vigente_desde TIMESTAMP NOT NULL,
+            preco REAL NOT NULL,
+            PRIMARY KEY (produto_id, vigente_desde)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        INSERT INTO precos_historico (produto_id, vigente_desde, preco)
+        SELECT id, COALESCE(criado_em, CURRENT_TIMESTAMP), preco FROM produtos
+    ''')
+    conn.execute('''
+        CREATE TRIGGER trg_produtos_preco_inclusao
+        AFTER INSERT ON produtos
+        BEGIN
+            INSERT OR REPLACE INTO precos_historico (produto_id, vigente_desde, preco)
+            VALUES (NEW.id, COALESCE(NEW.criado_em, CURRENT_TIMESTAMP), NEW.preco);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER trg_produtos_preco_alteracao
+        AFTER UPDATE OF preco ON produtos
+        WHEN NEW.preco IS NOT OLD.preco
+        BEGIN
+            INSERT OR REPLACE INTO precos_historico (produto_id, vigente_desde, preco)
+            VALUES (NEW.id, CURRENT_TIMESTAMP, NEW.preco);
+        END
+    ''')
+
+# Categorias padrão (nome usado até a migração 11 -> nome exibido, perecível)
+CATEGORIAS_PADRAO = [
+    ('eletronicos', 'Eletrônicos', 0),
+    ('roupas', 'Roupas', 0),
+    ('casa', 'Casa e Decoração', 0),
+    ('esporte', 'Esporte e Lazer', 0),
+    ('livros', 'Livros', 0),
+    ('alimentacao', 'Alimentação', 1),
+    ('beleza', 'Beleza e Cuidados', 1),
+    ('automotivo', 'Automotivo', 0),
+    ('ferramentas', 'Ferramentas', 0),
+    ('outros', 'Outros', 0),
+]
+
+# Migração 11: tabela de categorias (cadastradas pelo usuário, com o controle de lotes dos perecíveis) e
+# produtos.categoria_id no lugar do texto repetido em cada produto. Categorias fora da lista padrão
+# viram categorias com o próprio nome.
+def _migracao_categorias(conn):
+    conn.execute('''
+        CREATE TABLE categorias (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL UNIQUE,
+            perecivel BOOLEAN NOT NULL DEFAULT 0,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute("CREATE TEMP TABLE categorias_antigas (antiga TEXT PRIMARY KEY, nome TEXT NOT NULL)")
+    conn.executemany("INSERT INTO categorias_antigas (antiga, nome) VALUES (?, ?)",
+                     [(antiga, nome) for antiga, nome, _ in CATEGORIAS_PADRAO])
+    conn.executemany("INSERT INTO categorias (nome, perecivel) VALUES (?, ?)",
+                     [(nome, perecivel) for _, nome, perecivel in CATEGORIAS_PADRAO])
+    conn.execute('''
+        INSERT OR IGNORE INTO categorias (nome)
+        SELECT DISTINCT categoria FROM produtos
+        WHERE categoria NOT IN (SELECT antiga FROM categorias_antigas)
+    ''')
+    
+    conn.execute("ALTER TABLE produtos ADD COLUMN categoria_id INTEGER REFERENCES categorias (id)")
+    conn.execute('''
+        UPDATE produtos
+        SET categoria_id = (
+            SELECT c.id FROM categorias c
+            WHERE c.nome = COALESCE((SELECT nome FROM categorias_antigas WHERE antiga = produtos.categoria),
+                                    produtos.categoria)
+        )
+    ''')
+    conn.execute("DROP TABLE categorias_antigas")
+    
+    # Os triggers do feed de alterações usam todas as colunas: saem antes da remoção da coluna
+    criar_triggers_alteracoes(conn, 'produtos', operacoes=())
+    conn.execute("ALTER TABLE produtos DROP COLUMN categoria")
+    conn.execute("CREATE INDEX idx_produtos_categoria ON produtos (categoria_id)")
+    criar_triggers_alteracoes(conn, 'produtos')
+
+# Migração 12: data de inativação dos produtos removidos (base do expurgo dos inativos) e índices
+# parciais só com os produtos ativos, usados pelas consultas das páginas: ordem por nome, totais do
+# estoque (índice de cobertura) e categoria. Os já inativos contam a inativação a partir da migração.
+def _migracao_produtos_inativos(conn):
+    conn.execute("ALTER TABLE produtos ADD COLUMN inativado_em TIMESTAMP")
+    conn.execute("UPDATE produtos SET inativado_em = CURRENT_TIMESTAMP WHERE ativo = 0")
+    conn.execute("CREATE INDEX idx_produtos_inativos ON produtos (inativado_em) WHERE ativo = 0")
+    
+    conn.execute("CREATE INDEX idx_produtos_ativos_nome ON produtos (nome) WHERE ativo = 1")
+    conn.execute(
+        "CREATE INDEX idx_produtos_ativos_estoque ON produtos (quantidade, estoque_minimo, preco) WHERE ativo = 1"
+    )
+    conn.execute("DROP INDEX idx_produtos_categoria")
+    conn.execute("CREATE INDEX idx_produtos_categoria ON produtos (categoria_id) WHERE ativo = 1")
+    
+    criar_triggers_alteracoes(conn, 'produtos')
+
+# Migração 13: versão do cadastro de cada produto para o controle otimista de concorrência. Cada edição
+# do cadastro só grava se a versão ainda for a lida e a incrementa; as movimentações de estoque não
+# mudam a versão (a quantidade é alterada por diferenças, não sobrescrita).
+def _migracao_versao_produtos(conn):
+    conn.execute("ALTER TABLE produtos ADD COLUMN versao INTEGER NOT NULL DEFAULT 0")
+    criar_triggers_alteracoes(conn, 'produtos')
+
+# Colunas dos arrays JSON gravados pelos triggers do feed antes da migração 14, por tabela: (colunas,
+# condição que identifica as linhas). A versão das migrações 9-10 e a da migração 11 de produtos têm o
+# mesmo tamanho; só a primeira tem a categoria (texto) na posição 3.
+COLUNAS_ALTERACOES_ANTIGAS = {
+    'produtos': [
+        (['id', 'nome', 'descricao', 'categoria', 'preco', 'quantidade', 'estoque_minimo', 'ativo', 'criado_em',
+          'atualizado_em', 'codigo'], "json_array_length(dados) = 11"),
+        (['id', 'nome', 'descricao', 'categoria', 'preco', 'quantidade', 'estoque_minimo', 'ativo', 'criado_em',
+          'atualizado_em', 'codigo', 'fornecedor_id'],
+         "json_array_length(dados) = 12 AND json_type(dados, '$[3]') = 'text'"),
+        (['id', 'nome', 'descricao', 'preco', 'quantidade', 'estoque_minimo', 'ativo', 'criado_em', 'atualizado_em',
+          'codigo', 'fornecedor_id', 'categoria_id'],
+         "json_array_length(dados) = 12 AND json_type(dados, '$[3]') != 'text'"),
+        (['id', 'nome', 'descricao', 'preco', 'quantidade', 'estoque_minimo', 'ativo', 'criado_em', 'atualizado_em',
+          'codigo', 'fornecedor_id', 'categoria_id', 'inativado_em'], "json_array_length(dados) = 13"),
+        (['id', 'nome', 'descricao', 'preco', 'quantidade', 'estoque_minimo', 'ativo', 'criado_em', 'atualizado_em',
+          'codigo', 'fornecedor_id', 'categoria_id', 'inativado_em', 'versao'], "json_array_length(dados) = 14"),
+    ],
+    'movimentacoes': [
+        (['id', 'tipo', 'quantidade', 'produto_id', 'observacao', 'criado_em', 'local_id', 'conciliacao'],
+         "json_array_length(dados) = 8"),
+        (['id', 'tipo', 'quantidade', 'produto_id', 'observacao', 'criado_em', 'local_id', 'conciliacao',
+          'custo_unitario'], "json_array_length(dados) = 9"),
+    ],
+}
+
+# Migração 14: o feed de alterações grava cada linha como objeto JSON (os nomes das colunas vão junto com
+# os valores, e as alterações antigas continuam legíveis depois de mudanças nas colunas). As linhas já
+# gravadas como array são convertidas com as colunas da versão dos triggers que as gravou.
+def _migracao_alteracoes_objeto(conn):
+    for tabela, versoes in COLUNAS_ALTERACOES_ANTIGAS.items():
+        for colunas, condicao in versoes:
+            valores = ', '.join(f"'{coluna}', json_extract(dados, '$[{i}]')" for i, coluna in enumerate(colunas))
+            conn.execute(f'''
+                UPDATE alteracoes SET dados = json_object({valores})
+                WHERE tabela = ? AND json_type(dados) = 'array' AND {condicao}
+            ''', (tabela,))
+    criar_triggers_alteracoes(conn, 'produtos')
+    criar_triggers_alteracoes(conn, 'movimentacoes', operacoes=('I',))
+
+# Migração 15: transferências entre locais marcadas na própria movimentação (antes reconhecidas pelo texto
+# da observação, que também podia aparecer em uma observação digitada). As transferências já registradas
+# são marcadas pela observação gerada por registrar_transferencia (com o prefixo do terminal, se houver).
+def _migracao_transferencias(conn):
+    conn.execute("ALTER TABLE movimentacoes ADD COLUMN transferencia BOOLEAN NOT NULL DEFAULT 0")
+    conn.execute('''
+        UPDATE movimentacoes SET transferencia = 1
+        WHERE observacao LIKE 'Transferência do local % para o local %'
+           OR observacao LIKE '[%] Transferência do local % para o local %'
+    ''')
+    criar_triggers_custo(conn)
+    criar_triggers_alteracoes(conn, 'movimentacoes', operacoes=('I',))
+
+# Migração 16: linha zerada em custo_produtos para os produtos já expurgados que mantiveram o histórico de
+# custo (as consultas de valorização em uma data partem de custo_produtos)
+def _migracao_custo_expurgados(conn):
+    conn.execute('''
+        INSERT INTO custo_produtos (produto_id, quantidade, valor_fifo, valor_medio)
+        SELECT DISTINCT produto_id, 0, 0, 0 FROM custo_saldos
+        WHERE produto_id NOT IN (SELECT produto_id FROM custo_produtos)
+    ''')
+
+# Migração 17: o código (SKU/EAN) é único só entre os produtos ativos, para que o código de um produto
+# removido possa ser usado em um novo cadastro
+def _migracao_codigo_ativos(conn):
+    conn.execute("DROP INDEX idx_produtos_codigo")
+    conn.execute("CREATE UNIQUE INDEX idx_produtos_codigo ON produtos (codigo) WHERE codigo IS NOT NULL AND ativo = 1")
+
+# Migração 18: índices por data dos saldos de custo e do histórico de preços, para as consultas de um período
+# da evolução do valor do estoque (os índices existentes começam pelo produto)
+def _migracao_indices_periodo(conn):
+    conn.execute("CREATE INDEX idx_custo_saldos_criado_em ON custo_saldos (criado_em)")
+    conn.execute("CREATE INDEX idx_precos_historico_vigente_desde ON precos_historico (vigente_desde)")
+
+# Migração 19: entradas sem custo de produtos sem custo médio passam a entrar pelo preço de venda (antes,
+# abriam uma camada de custo zero)
+def _migracao_custo_preco(conn):
+    criar_triggers_custo(conn)
+
+# Migrações do schema, aplicadas em ordem conforme PRAGMA user_version
+MIGRACOES = [
+    _migracao_locais,
+    _migracao_lotes,
+    _migracao_codigo,
+    _migracao_livro_razao,
+    _migracao_conciliacao,
+    _migracao_sincronizacao,
+    _migracao_alteracoes,
+    _migracao_custos,
+    _migracao_compras,
+    _migracao_historico_precos,
+    _migracao_categorias,
+    _migracao_produtos_inativos,
+    _migracao_versao_produtos,
+    _migracao_alteracoes_objeto,
+    _migracao_transferencias,
+    _migracao_custo_expurgados,
+    _migracao_codigo_ativos,
+    _migracao_indices_periodo,
+    _migracao_custo_preco,
+]
+
+# Função para aplicar as migrações pendentes
+def migrar(conn):
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    for numero, migracao in enumerate(MIGRACOES[versao:], start=versao + 1):
+        # BEGIN explícito: o sqlite3 não abre transação antes de comandos DDL
+        conn.execute("BEGIN")
+        try:
+            migracao(conn)
+            conn.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+# Função para verificar se o banco já está na versão atual do schema (sem migrações pendentes)
+def schema_atualizado(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRACOES)
+
+# Função para obter o caminho do banco de arquivo morto de um banco (de loja)
+def caminho_arquivo(caminho=DB_PATH):
+    if caminho == DB_PATH:
+        return ARQUIVO_DB_PATH
+    return f"{os.path.splitext(caminho)[0]}_arquivo.db"
+
+# Função para obter o caminho da cópia de leitura (relatórios) de um banco (de loja)
+def caminho_relatorio(caminho=DB_PATH):
+    return f"{os.path.splitext(caminho)[0]}_relatorio.db"
+
+# Função para anexar o banco de arquivo morto à conexão (somente leitura: a conexão precisa aceitar URIs)
+def anexar_arquivo(conn, caminho=DB_PATH, somente_leitura=False):
+    arquivo = f"file:{caminho_arquivo(caminho)}?mode=ro" if somente_leitura else caminho_arquivo(caminho)
+    conn.execute("ATTACH DATABASE ? AS arquivo", (arquivo,))
+
+# Função para obter as colunas de uma tabela
+def get_colunas(conn, tabela, schema='main'):
+    return [row[1] for row in conn.execute(f'PRAGMA {schema}.table_info("{tabela}")').fetchall()]
@@ -0,0 +1,116 @@
+from estoque.config import COMPRA_FATOR_MINIMO
+from estoque.consultas import SQL_COMPRA_SUGERIDA, SQL_COMPRA_SUGERIDA_LOCAL, SQL_INSERIR_LOTE
+
+
+# Exceção para pedidos que não estão mais em rascunho (já recebidos ou cancelados)
+class PedidoFechado(Exception):
+    pass
+
+# Exceção para o recebimento de produtos perecíveis sem a validade do lote
+class ValidadeObrigatoria(Exception):
+    pass
+
+# Função para gerar, em uma transação, os pedidos de compra em rascunho de todos os produtos com estoque
+# baixo (da loja ou do local `local_id`), um pedido por fornecedor, a receber no local `local_destino`.
+# Os pedidos e os itens são incluídos com INSERT ... SELECT. Retorna (pedidos, itens) criados.
+def gerar_pedidos_compra(conn, local_destino, local_id=None, fator=None):
+    fator = fator or COMPRA_FATOR_MINIMO
+    sugerida, params = (SQL_COMPRA_SUGERIDA_LOCAL, (fator, local_id)) if local_id else (SQL_COMPRA_SUGERIDA, (fator,))
+    
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        ultimo_pedido = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM pedidos_compra").fetchone()[0]
+        cursor.execute(f'''
+            INSERT INTO pedidos_compra (fornecedor_id, local_id)
+            SELECT DISTINCT fornecedor_id, ? FROM ({sugerida})
+            ORDER BY fornecedor_id
+        ''', (local_destino, *params))
+        pedidos = cursor.rowcount
+        cursor.execute(f'''
+            INSERT INTO pedidos_compra_itens (pedido_id, produto_id, quantidade, custo_unitario)
+            SELECT pc.id, s.produto_id, s.quantidade, s.custo_unitario
+            FROM ({sugerida}) s
+            JOIN pedidos_compra pc ON pc.id > ? AND pc.fornecedor_id IS s.fornecedor_id
+        ''', (*params, ultimo_pedido))
+        itens = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return pedidos, itens
+
+# Função para atualizar quantidades e custos dos itens de um pedido em rascunho [(produto_id, quantidade, custo)]
+def atualizar_itens_pedido(conn, pedido_id, itens):
+    with conn:
+        status = conn.execute("SELECT status FROM pedidos_compra WHERE id = ?", (pedido_id,)).fetchone()
+        if status is None or status[0] != 'rascunho':
+            raise PedidoFechado(f"Pedido {pedido_id} não está em rascunho")
+        conn.executemany(
+            "UPDATE pedidos_compra_itens SET quantidade = ?, custo_unitario = ? WHERE pedido_id = ? AND produto_id = ?",
+            [(quantidade, custo, pedido_id, produto_id) for produto_id, quantidade, custo in itens]
+        )
+        conn.execute("DELETE FROM pedidos_compra_itens WHERE pedido_id = ? AND quantidade <= 0", (pedido_id,))
+
+# Função para receber um pedido em uma transação: uma ENTRADA por item no local do pedido, com o custo
+# do item (os saldos e o custo do estoque acompanham pelos triggers). Os lotes recebidos vêm em
+# {produto_id: (codigo, validade)}; todo item perecível precisa da validade. Retorna o número de entradas.
+def receber_pedido(conn, pedido_id, lotes=None):
+    lotes = {produto_id: lote for produto_id, lote in (lotes or {}).items() if lote[1]}
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute('''
+            UPDATE pedidos_compra SET status = 'recebido', recebido_em = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'rascunho'
+        ''', (pedido_id,))
+        if cursor.rowcount == 0:
+            raise PedidoFechado(f"Pedido {pedido_id} não está em rascunho")
+        
+        itens = cursor.execute('''
+            SELECT i.produto_id, p.nome, i.quantidade, pc.local_id, COALESCE(c.perecivel, 0)
+            FROM pedidos_compra_itens i
+            JOIN pedidos_compra pc ON pc.id = i.pedido_id
+            JOIN produtos p ON p.id = i.produto_id
+            LEFT JOIN categorias c ON c.id = p.categoria_id
+            WHERE i.pedido_id = ? AND i.quantidade > 0
+        ''', (pedido_id,)).fetchall()
+        sem_validade = [nome for produto_id, nome, _, _, perecivel in itens if perecivel and produto_id not in lotes]
+        if sem_validade:
+            raise ValidadeObrigatoria(f"Informe a validade do lote de: {', '.join(sem_validade)}")
+        cursor.executemany(SQL_INSERIR_LOTE, [
+            (produto_id, local_id, lotes[produto_id][0], str(lotes[produto_id][1]), quantidade)
+            for produto_id, _, quantidade, local_id, _ in itens if produto_id in lotes
+        ])
+        
+        cursor.execute('''
+            INSERT INTO movimentacoes (tipo, quantidade, produto_id, observacao, local_id, custo_unitario)
+            SELECT 'ENTRADA', i.quantidade, i.produto_id, 'Pedido de compra ' || pc.id, pc.local_id, i.custo_unitario
+            FROM pedidos_compra_itens i
+            JOIN pedidos_compra pc ON pc.id = i.pedido_id
+            WHERE i.pedido_id = ? AND i.quantidade > 0
+        ''', (pedido_id,))
+        entradas = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return entradas
+
+# Função para cancelar um pedido em rascunho
+def cancelar_pedido(conn, pedido_id):
+    with conn:
+        cursor = conn.execute(
+            "UPDATE pedidos_compra SET status = 'cancelado' WHERE id = ? AND status = 'rascunho'", (pedido_id,)
+        )
+        if cursor.rowcount == 0:
+            raise PedidoFechado(f"Pedido {pedido_id} não está em rascunho")
+
+# Função para definir o fornecedor de vários produtos de uma vez
+def definir_fornecedor(conn, fornecedor_id, produtos_ids):
+    with conn:
+        conn.executemany(
+            "UPDATE produtos SET fornecedor_id = ?, versao = versao + 1, atualizado_em = CURRENT_TIMESTAMP "
+            "WHERE id = ?",
+            [(fornecedor_id, produto_id) for produto_id in produtos_ids]
+        )
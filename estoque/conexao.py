@@ -0,0 +1,92 @@
+import functools
+import os
+import threading
+
+import streamlit as st
+
+from estoque.arquivo import sincronizar_particoes
+from estoque.banco import conectar, criar_schema, anexar_arquivo, caminho_arquivo, caminho_relatorio
+from estoque.lojas import get_banco_atual
+
+
+# Função para abrir (uma vez por processo) a conexão com o banco de uma loja
+@st.cache_resource
+def abrir_banco(caminho):
+    conn = conectar(caminho, check_same_thread=False)
+    criar_schema(conn)
+    anexar_arquivo(conn, caminho)
+    sincronizar_particoes(conn)
+    return conn
+
+# Função para inicializar o banco de dados (da loja selecionada na sessão)
+def init_database():
+    return abrir_banco(get_banco_atual())
+
+# Conexão somente leitura com a cópia dos relatórios de uma loja (reaberta quando a cópia é atualizada)
+@st.cache_resource
+def _get_estado_relatorio(caminho):
+    return {'lock': threading.Lock(), 'conn': None, 'versao': None}
+
+# Função para obter a conexão dos relatórios: a cópia de leitura da loja da sessão, para que
+# leituras longas não concorram com as gravações. Sem cópia ainda, usa o banco da loja.
+def init_relatorio():
+    caminho = get_banco_atual()
+    destino = caminho_relatorio(caminho)
+    if not os.path.exists(destino):
+        return init_database()
+    
+    estado = _get_estado_relatorio(caminho)
+    versao = os.stat(destino).st_mtime_ns
+    with estado['lock']:
+        if estado['versao'] != versao:
+            conn = conectar(f"file:{destino}?mode=ro", uri=True, check_same_thread=False)
+            if os.path.exists(caminho_arquivo(caminho)):
+                anexar_arquivo(conn, caminho, somente_leitura=True)
+            estado.update(conn=conn, versao=versao)
+        return estado['conn']
+
+# Conexão usada só para detectar alterações: o PRAGMA data_version dela muda sempre que outra
+# conexão (a compartilhada, tarefas, sincronização, outros processos) grava no banco
+@st.cache_resource
+def _abrir_monitor(caminho):
+    return {'lock': threading.Lock(), 'conn': conectar(caminho, check_same_thread=False)}
+
+# Função para obter a versão dos dados da loja da sessão, sem consultar tabelas (muda quando o banco é
+# alterado). Com relatorio, é a versão da cópia de leitura, que muda quando a cópia é substituída.
+def get_versao_dados(relatorio=False):
+    caminho = get_banco_atual()
+    if relatorio:
+        destino = caminho_relatorio(caminho)
+        if os.path.exists(destino):
+            return os.stat(destino).st_mtime_ns
+    
+    monitor = _abrir_monitor(caminho)
+    with monitor['lock']:
+        return monitor['conn'].execute("PRAGMA data_version").fetchone()[0]
+
+# Geração do cache de cada loja (banco): muda quando uma tarefa em segundo plano altera o banco da loja
+@st.cache_resource
+def _get_geracoes_cache():
+    return {}
+
+# Função para invalidar as consultas em cache de uma loja, sem afetar o cache das outras lojas
+def invalidar_cache_loja(caminho):
+    geracoes = _get_geracoes_cache()
+    geracoes[caminho] = geracoes.get(caminho, 0) + 1
+
+# Decorador equivalente a st.cache_data, com o banco da loja da sessão e a geração do cache da loja como
+# parte da chave do cache
+def cache_por_loja(funcao):
+    def em_cache(banco, geracao, *args, **kwargs):
+        return funcao(*args, **kwargs)
+    
+    # O Streamlit separa os caches pelo nome qualificado da função
+    em_cache.__module__ = funcao.__module__
+    em_cache.__qualname__ = funcao.__qualname__
+    em_cache = st.cache_data(em_cache)
+    
+    @functools.wraps(funcao)
+    def wrapper(*args, **kwargs):
+        banco = get_banco_atual()
+        return em_cache(banco, _get_geracoes_cache().get(banco, 0), *args, **kwargs)
+    return wrapper
@@ -0,0 +1,64 @@
+import os
+import socket
+
+# Caminho do banco de dados
+DB_PATH = os.environ.get('ESTOQUE_DB', 'estoque_facil.db')
+
+# Modo terminal (offline): as movimentações ficam no banco local e são enviadas em lotes ao banco central
+CENTRAL_DB_PATH = os.environ.get('ESTOQUE_CENTRAL_DB')
+TERMINAL_NOME = os.environ.get('ESTOQUE_TERMINAL', socket.gethostname())
+SINCRONIZACAO_INTERVALO_S = int(os.environ.get('ESTOQUE_SINCRONIZACAO_INTERVALO_S', '60'))
+SINCRONIZACAO_LOTE = int(os.environ.get('ESTOQUE_SINCRONIZACAO_LOTE', '500'))
+
+# Lojas da rede: pasta com um banco por loja (<loja>.db, com o arquivo morto em <loja>_arquivo.db).
+# Sem a pasta configurada, o sistema usa um único banco (DB_PATH).
+LOJAS_DIR = os.environ.get('ESTOQUE_LOJAS_DIR')
+REDE_TRABALHADORES = int(os.environ.get('ESTOQUE_REDE_TRABALHADORES', '8'))
+
+# Intervalo (segundos) de atualização da cópia de leitura usada pelos relatórios
+RELATORIO_INTERVALO_S = int(os.environ.get('ESTOQUE_RELATORIO_INTERVALO_S', '300'))
+
+# Relatórios diários gerados fora do aplicativo (python -m estoque.relatorios_diarios): pasta de saída,
+# processos em paralelo (uma loja por processo) e linhas lidas do banco por vez
+RELATORIOS_DIR = os.environ.get('ESTOQUE_RELATORIOS_DIR', 'relatorios')
+RELATORIOS_TRABALHADORES = int(os.environ.get('ESTOQUE_RELATORIOS_TRABALHADORES', str(os.cpu_count() or 1)))
+RELATORIOS_LOTE = int(os.environ.get('ESTOQUE_RELATORIOS_LOTE', '1000'))
+
+# Intervalo (segundos) da verificação de alterações do Dashboard em atualização automática
+DASHBOARD_INTERVALO_S = int(os.environ.get('ESTOQUE_DASHBOARD_INTERVALO_S', '10'))
+
+# Local de estoque usado quando nenhum é escolhido (criado na migração dos locais)
+LOCAL_PADRAO = 1
+
+# Antecedência (dias) do alerta de vencimento dos lotes
+VALIDADE_ALERTA_DIAS = int(os.environ.get('ESTOQUE_VALIDADE_ALERTA_DIAS', '30'))
+
+# Pedidos de compra do estoque baixo: a quantidade sugerida repõe o estoque até N vezes o estoque mínimo
+COMPRA_FATOR_MINIMO = int(os.environ.get('ESTOQUE_COMPRA_FATOR_MINIMO', '2'))
+
+# Curva ABC: participação acumulada que fecha as classes A e B (o restante é C)
+ABC_LIMITES = (0.80, 0.95)
+
+# Banco de arquivo morto das movimentações antigas (tabelas mensais) e horizonte de arquivamento
+ARQUIVO_DB_PATH = os.environ.get('ESTOQUE_ARQUIVO_DB', f"{os.path.splitext(DB_PATH)[0]}_arquivo.db")
+ARQUIVO_HORIZONTE_DIAS = int(os.environ.get('ESTOQUE_ARQUIVO_DIAS', '365'))
+
+# Espera (segundos) antes de repetir o arquivamento ou o expurgo automático que falhou
+ARQUIVAMENTO_ESPERA_FALHA_S = int(os.environ.get('ESTOQUE_ARQUIVAMENTO_ESPERA_FALHA_S', '3600'))
+
+# Expurgo dos produtos removidos (inativos) há mais de N dias e sem estoque: o cadastro vai para o
+# arquivo morto; com ESTOQUE_EXPURGO_MOVIMENTACOES=1, as movimentações do produto vão junto
+EXPURGO_PRODUTOS_DIAS = int(os.environ.get('ESTOQUE_EXPURGO_PRODUTOS_DIAS', '180'))
+EXPURGO_MOVIMENTACOES = os.environ.get('ESTOQUE_EXPURGO_MOVIMENTACOES', '0') == '1'
+
+# Reconstrução dos saldos a partir do livro razão: produtos por lote e leituras em paralelo
+RAZAO_PRODUTOS_POR_LOTE = int(os.environ.get('ESTOQUE_RAZAO_PRODUTOS_POR_LOTE', '1000'))
+RAZAO_TRABALHADORES = int(os.environ.get('ESTOQUE_RAZAO_TRABALHADORES', str(min(4, os.cpu_count() or 1))))
+
+# Orçamento de tempo (ms) da primeira execução do processo e de cada nova execução do script
+ORCAMENTO_INICIALIZACAO_MS = int(os.environ.get('ESTOQUE_ORCAMENTO_INICIALIZACAO_MS', '1000'))
+ORCAMENTO_EXECUCAO_MS = int(os.environ.get('ESTOQUE_ORCAMENTO_EXECUCAO_MS', '300'))
+
+# Logotipo exibido no menu lateral: arquivo dentro de static/ (servido pelo próprio Streamlit)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+LOGO_ARQUIVO = os.environ.get('ESTOQUE_LOGO', 'logo.svg')
@@ -0,0 +1,323 @@
+# Consultas usadas pelas funções de dados
+SQL_PRODUTOS = '''
+    SELECT p.id, p.nome, p.codigo, p.categoria_id, c.nome AS categoria, p.preco, p.quantidade, p.estoque_minimo,
+           p.criado_em, p.atualizado_em
+    FROM produtos p
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE p.ativo = 1
+    ORDER BY p.nome
+'''
+SQL_PRODUTOS_COM_DESCRICAO = '''
+    SELECT p.id, p.nome, p.codigo, p.descricao, p.categoria_id, c.nome AS categoria, p.preco, p.quantidade,
+           p.estoque_minimo, p.criado_em, p.atualizado_em
+    FROM produtos p
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE p.ativo = 1
+    ORDER BY p.nome
+'''
+SQL_PRODUTOS_LOCAL = '''
+    SELECT p.id, p.nome, p.codigo, p.categoria_id, c.nome AS categoria, p.preco, el.quantidade, p.estoque_minimo,
+           p.criado_em, p.atualizado_em
+    FROM estoque_locais el
+    JOIN produtos p ON p.id = el.produto_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE el.local_id = ? AND p.ativo = 1
+    ORDER BY p.nome
+'''
+SQL_PRODUTOS_LOCAL_COM_DESCRICAO = '''
+    SELECT p.id, p.nome, p.codigo, p.descricao, p.categoria_id, c.nome AS categoria, p.preco, el.quantidade,
+           p.estoque_minimo, p.criado_em, p.atualizado_em
+    FROM estoque_locais el
+    JOIN produtos p ON p.id = el.produto_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE el.local_id = ? AND p.ativo = 1
+    ORDER BY p.nome
+'''
+SQL_PRODUTO_POR_CODIGO = "SELECT id, nome, estoque_minimo FROM produtos WHERE codigo = ? AND ativo = 1"
+SQL_TOTAL_PRODUTOS = "SELECT COUNT(*) FROM produtos WHERE ativo = 1"
+SQL_PRODUTOS_BAIXO_ESTOQUE = "SELECT COUNT(*) FROM produtos WHERE ativo = 1 AND quantidade <= estoque_minimo"
+SQL_VALOR_TOTAL = "SELECT SUM(preco * quantidade) FROM produtos WHERE ativo = 1"
+SQL_PRODUTOS_ESGOTADOS = "SELECT COUNT(*) FROM produtos WHERE ativo = 1 AND quantidade = 0"
+SQL_ESTATISTICAS = '''
+    SELECT COUNT(*),
+           COALESCE(SUM(quantidade <= estoque_minimo), 0),
+           COALESCE(SUM(preco * quantidade), 0),
+           COALESCE(SUM(quantidade = 0), 0)
+    FROM produtos
+    WHERE ativo = 1
+'''
+SQL_ESTATISTICAS_LOCAL = '''
+    SELECT COUNT(*),
+           COALESCE(SUM(el.quantidade <= p.estoque_minimo), 0),
+           COALESCE(SUM(p.preco * el.quantidade), 0),
+           COALESCE(SUM(el.quantidade = 0), 0)
+    FROM estoque_locais el
+    JOIN produtos p ON p.id = el.produto_id
+    WHERE el.local_id = ? AND p.ativo = 1
+'''
+SQL_RESUMO_LOCAIS = '''
+    SELECT l.id AS local_id, l.nome AS local,
+           COUNT(e.produto_id) AS produtos,
+           COALESCE(SUM(e.quantidade), 0) AS unidades,
+           COALESCE(SUM(e.preco * e.quantidade), 0) AS valor,
+           COALESCE(SUM(e.quantidade <= e.estoque_minimo), 0) AS estoque_baixo,
+           COALESCE(SUM(e.quantidade = 0), 0) AS esgotados
+    FROM locais l
+    LEFT JOIN (
+        SELECT el.local_id, el.produto_id, el.quantidade, p.preco, p.estoque_minimo
+        FROM estoque_locais el
+        JOIN produtos p ON p.id = el.produto_id
+        WHERE p.ativo = 1
+    ) e ON e.local_id = l.id
+    WHERE l.ativo = 1
+    GROUP BY l.id
+    ORDER BY l.nome
+'''
+SQL_ESTOQUE_BAIXO_LOCAIS = '''
+    SELECT l.nome AS local, p.nome, c.nome AS categoria, el.quantidade, p.estoque_minimo
+    FROM estoque_locais el
+    JOIN produtos p ON p.id = el.produto_id
+    JOIN locais l ON l.id = el.local_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE p.ativo = 1 AND l.ativo = 1 AND el.quantidade <= p.estoque_minimo
+    ORDER BY l.nome, p.nome
+'''
+SQL_LOCAIS = "SELECT id, nome FROM locais WHERE ativo = 1 ORDER BY id"
+SQL_MOVIMENTACOES_PRODUTO = '''
+    SELECT m.*, p.nome as produto_nome
+    FROM movimentacoes m
+    JOIN produtos p ON m.produto_id = p.id
+    WHERE m.produto_id = ?
+    ORDER BY m.criado_em DESC
+'''
+SQL_MOVIMENTACOES_RECENTES = '''
+    SELECT m.*, p.nome as produto_nome
+    FROM movimentacoes m
+    JOIN produtos p ON m.produto_id = p.id
+    ORDER BY m.criado_em DESC
+    LIMIT 50
+'''
+SQL_QUANTIDADE_LOCAL = "SELECT quantidade FROM estoque_locais WHERE produto_id = ? AND local_id = ?"
+# Cadastro atual de um produto (com a versão) e o saldo dele em um local, para a edição do produto
+SQL_PRODUTO_EDICAO = '''
+    SELECT p.id, p.nome, p.codigo, p.descricao, p.categoria_id, p.preco, p.estoque_minimo, p.versao,
+           COALESCE(el.quantidade, 0) AS quantidade
+    FROM produtos p
+    LEFT JOIN estoque_locais el ON el.produto_id = p.id AND el.local_id = ?
+    WHERE p.id = ?
+'''
+SQL_INSERIR_MOVIMENTACAO = '''
+    INSERT INTO movimentacoes (tipo, quantidade, produto_id, observacao, local_id, custo_unitario, transferencia)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_LOTES_FEFO = '''
+    SELECT id, codigo, validade, quantidade
+    FROM lotes
+    WHERE produto_id = ? AND local_id = ? AND quantidade > 0
+    ORDER BY validade, id
+'''
+SQL_CONSUMIR_LOTE = "UPDATE lotes SET quantidade = quantidade - ? WHERE id = ?"
+SQL_INSERIR_LOTE = '''
+    INSERT INTO lotes (produto_id, local_id, codigo, validade, quantidade)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SQL_LOTES_VENCENDO = '''
+    SELECT lt.validade, p.nome, c.nome AS categoria, lt.codigo AS lote, lt.local_id, lc.nome AS local, lt.quantidade
+    FROM lotes lt
+    JOIN produtos p ON p.id = lt.produto_id
+    JOIN locais lc ON lc.id = lt.local_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE lt.quantidade > 0 AND lt.validade <= date('now', '+' || ? || ' days')
+      AND p.ativo = 1
+    ORDER BY lt.validade
+'''
+
+# Valor de custo do estoque (PEPS e custo médio): atual e em uma data (último saldo de cada produto
+# antes da data, pelo índice (produto_id, criado_em) de custo_saldos). As consultas em uma data partem de
+# custo_produtos, que tem uma linha para todo produto com movimentação, inclusive os expurgados sem as
+# movimentações (assim o valor de datas passadas não muda com o expurgo).
+SQL_VALOR_CUSTO = "SELECT COALESCE(SUM(valor_fifo), 0), COALESCE(SUM(valor_medio), 0) FROM custo_produtos"
+SQL_VALOR_CUSTO_DATA = '''
+    SELECT COALESCE(SUM(cs.valor_fifo), 0), COALESCE(SUM(cs.valor_medio), 0)
+    FROM custo_produtos cp
+    JOIN custo_saldos cs ON cs.id = (
+        SELECT id FROM custo_saldos
+        WHERE produto_id = cp.produto_id AND criado_em < ?
+        ORDER BY criado_em DESC, id DESC
+        LIMIT 1
+    )
+'''
+
+# Estoque da loja em uma data: quantidade e custo PEPS de cada produto (último saldo de custo antes da data)
+# e o preço de venda vigente na data (último preço do histórico antes da data), ambos por busca nos índices
+SQL_ESTOQUE_DATA = '''
+    SELECT cp.produto_id, cs.quantidade, cs.valor_fifo,
+           (SELECT ph.preco FROM precos_historico ph
+            WHERE ph.produto_id = cp.produto_id AND ph.vigente_desde < ?
+            ORDER BY ph.vigente_desde DESC
+            LIMIT 1) AS preco
+    FROM custo_produtos cp
+    LEFT JOIN custo_saldos cs ON cs.id = (
+        SELECT id FROM custo_saldos
+        WHERE produto_id = cp.produto_id AND criado_em < ?
+        ORDER BY criado_em DESC, id DESC
+        LIMIT 1
+    )
+'''
+SQL_VALOR_VENDA_DATA = f"SELECT COALESCE(SUM(quantidade * preco), 0) FROM ({SQL_ESTOQUE_DATA})"
+SQL_SALDOS_PERIODO = '''
+    SELECT produto_id, criado_em AS em, quantidade, valor_fifo
+    FROM custo_saldos
+    WHERE criado_em >= ? AND criado_em < ?
+'''
+SQL_PRECOS_PERIODO = '''
+    SELECT produto_id, vigente_desde AS em, preco
+    FROM precos_historico
+    WHERE vigente_desde >= ? AND vigente_desde < ?
+'''
+
+# Pedidos de compra: produtos com estoque baixo (da loja ou de um local) fora de pedidos em rascunho,
+# com a quantidade que repõe o estoque até `fator` vezes o mínimo e o custo médio atual como sugestão
+SQL_COMPRA_SUGERIDA = '''
+    SELECT p.id AS produto_id, p.fornecedor_id, p.estoque_minimo * ? - p.quantidade AS quantidade,
+           (SELECT valor_medio / quantidade FROM custo_produtos WHERE produto_id = p.id AND quantidade > 0) AS custo_unitario
+    FROM produtos p
+    WHERE p.ativo = 1 AND p.estoque_minimo > 0 AND p.quantidade <= p.estoque_minimo
+      AND NOT EXISTS (
+          SELECT 1 FROM pedidos_compra_itens i JOIN pedidos_compra pc ON pc.id = i.pedido_id
+          WHERE i.produto_id = p.id AND pc.status = 'rascunho'
+      )
+'''
+SQL_COMPRA_SUGERIDA_LOCAL = '''
+    SELECT p.id AS produto_id, p.fornecedor_id, p.estoque_minimo * ? - COALESCE(el.quantidade, 0) AS quantidade,
+           (SELECT valor_medio / quantidade FROM custo_produtos WHERE produto_id = p.id AND quantidade > 0) AS custo_unitario
+    FROM produtos p
+    LEFT JOIN estoque_locais el ON el.produto_id = p.id AND el.local_id = ?
+    WHERE p.ativo = 1 AND p.estoque_minimo > 0 AND COALESCE(el.quantidade, 0) <= p.estoque_minimo
+      AND NOT EXISTS (
+          SELECT 1 FROM pedidos_compra_itens i JOIN pedidos_compra pc ON pc.id = i.pedido_id
+          WHERE i.produto_id = p.id AND pc.status = 'rascunho'
+      )
+'''
+SQL_PEDIDOS_COMPRA = '''
+    SELECT pc.id, COALESCE(f.nome, 'Sem fornecedor') AS fornecedor, pc.local_id, l.nome AS local, pc.status,
+           pc.criado_em, pc.recebido_em, COUNT(i.produto_id) AS itens, SUM(i.quantidade) AS unidades,
+           SUM(i.quantidade * i.custo_unitario) AS valor
+    FROM pedidos_compra pc
+    LEFT JOIN fornecedores f ON f.id = pc.fornecedor_id
+    JOIN locais l ON l.id = pc.local_id
+    LEFT JOIN pedidos_compra_itens i ON i.pedido_id = pc.id
+    WHERE pc.status = ?
+    GROUP BY pc.id
+    ORDER BY pc.id DESC
+'''
+SQL_ITENS_PEDIDO = '''
+    SELECT i.produto_id, p.nome, i.quantidade, i.custo_unitario, COALESCE(c.perecivel, 0) AS perecivel
+    FROM pedidos_compra_itens i
+    JOIN produtos p ON p.id = i.produto_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE i.pedido_id = ?
+    ORDER BY p.nome
+'''
+SQL_FORNECEDORES = "SELECT id, nome FROM fornecedores WHERE ativo = 1 ORDER BY nome"
+
+# Categorias e totais dos produtos ativos de cada categoria (busca pelo índice de produtos.categoria_id)
+SQL_CATEGORIAS = "SELECT id, nome, perecivel FROM categorias ORDER BY nome"
+SQL_RESUMO_CATEGORIAS = '''
+    SELECT c.id AS categoria_id, c.nome AS categoria, c.perecivel,
+           COUNT(p.id) AS produtos,
+           COALESCE(SUM(p.quantidade), 0) AS unidades,
+           COALESCE(SUM(p.preco * p.quantidade), 0) AS valor,
+           COALESCE(SUM(p.quantidade <= p.estoque_minimo), 0) AS estoque_baixo
+    FROM categorias c
+    LEFT JOIN produtos p ON p.categoria_id = c.id AND p.ativo = 1
+    GROUP BY c.id
+    ORDER BY c.nome
+'''
+
+# Curva ABC: volume de saídas de cada produto nos últimos dias (da loja ou de um local).
+# Transferências entre locais e conciliações do livro razão não contam como saída.
+SQL_ABC_SAIDAS = '''
+    SELECT produto_id, SUM(quantidade) AS saidas
+    FROM movimentacoes
+    WHERE criado_em >= datetime('now', '-' || ? || ' days') AND tipo = 'SAIDA' AND conciliacao = 0
+      AND transferencia = 0
+    GROUP BY produto_id
+'''
+SQL_ABC_SAIDAS_LOCAL = '''
+    SELECT produto_id, SUM(quantidade) AS saidas
+    FROM movimentacoes
+    WHERE local_id = ? AND criado_em >= datetime('now', '-' || ? || ' days') AND tipo = 'SAIDA'
+      AND conciliacao = 0 AND transferencia = 0
+    GROUP BY produto_id
+'''
+
+# Resumo das movimentações de um período por categoria (sem transferências entre locais e conciliações).
+# {movimentacoes}: movimentações do período (produto_id, tipo, quantidade, conciliacao, transferencia), da
+# tabela atual ou dela com as partições do arquivo morto que cobrem o período
+SQL_MOVIMENTACOES_CATEGORIA_TABELAS = '''
+    SELECT COALESCE(c.nome, 'Sem categoria') AS categoria,
+           COUNT(DISTINCT m.produto_id) AS produtos,
+           COALESCE(SUM(CASE WHEN m.tipo = 'ENTRADA' THEN m.quantidade END), 0) AS entradas,
+           COALESCE(SUM(CASE WHEN m.tipo = 'SAIDA' THEN m.quantidade END), 0) AS saidas,
+           COALESCE(SUM(CASE WHEN m.tipo = 'SAIDA' THEN m.quantidade * p.preco END), 0) AS valor_saidas
+    FROM ({movimentacoes}) m
+    LEFT JOIN produtos p ON p.id = m.produto_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE m.conciliacao = 0 AND m.transferencia = 0
+    GROUP BY c.id
+    ORDER BY categoria
+'''
+SQL_MOVIMENTACOES_CATEGORIA = SQL_MOVIMENTACOES_CATEGORIA_TABELAS.format(movimentacoes='''
+        SELECT produto_id, tipo, quantidade, conciliacao, transferencia FROM movimentacoes
+        WHERE criado_em >= ? AND criado_em < ?
+''')
+
+# Posição do estoque da loja no fim de um dia (relatórios diários): quantidade e preço de cada produto pela
+# consulta do estoque em uma data, com os produtos ativos e os que tinham estoque na data
+SQL_POSICAO_ESTOQUE_DATA = f'''
+    SELECT COALESCE(p.nome, 'Produto ' || e.produto_id) AS nome, p.codigo, c.nome AS categoria, e.preco,
+           COALESCE(e.quantidade, 0) AS quantidade, p.estoque_minimo
+    FROM ({SQL_ESTOQUE_DATA}) e
+    LEFT JOIN produtos p ON p.id = e.produto_id
+    LEFT JOIN categorias c ON c.id = p.categoria_id
+    WHERE e.quantidade > 0 OR (p.ativo = 1 AND p.criado_em < ?)
+    ORDER BY nome
+'''
+
+# Consultas da aplicação exibidas na página de Diagnóstico: nome -> (sql, parâmetros de exemplo)
+CONSULTAS_APP = {
+    'get_produtos': (SQL_PRODUTOS, ()),
+    'get_produto_edicao': (SQL_PRODUTO_EDICAO, (1, 1)),
+    'dar_baixa_por_codigo': (SQL_PRODUTO_POR_CODIGO, ('7890000000000',)),
+    'get_estatisticas (total)': (SQL_TOTAL_PRODUTOS, ()),
+    'get_estatisticas (estoque baixo)': (SQL_PRODUTOS_BAIXO_ESTOQUE, ()),
+    'get_estatisticas (valor total)': (SQL_VALOR_TOTAL, ()),
+    'get_estatisticas (esgotados)': (SQL_PRODUTOS_ESGOTADOS, ()),
+    'get_produtos (por local)': (SQL_PRODUTOS_LOCAL, (1,)),
+    'get_estatisticas (por local)': (SQL_ESTATISTICAS_LOCAL, (1,)),
+    'get_estatisticas_rede (por loja)': (SQL_ESTATISTICAS, ()),
+    'get_resumo_locais': (SQL_RESUMO_LOCAIS, ()),
+    'get_estoque_baixo_locais': (SQL_ESTOQUE_BAIXO_LOCAIS, ()),
+    'get_movimentacoes (por produto)': (SQL_MOVIMENTACOES_PRODUTO, (1,)),
+    'get_movimentacoes (recentes)': (SQL_MOVIMENTACOES_RECENTES, ()),
+    'dar_baixa_estoque (quantidade no local)': (SQL_QUANTIDADE_LOCAL, (1, 1)),
+    'registrar_movimentacao (movimentação)': (SQL_INSERIR_MOVIMENTACAO, ('SAIDA', 1, 1, '', 1, None, 0)),
+    'consumir_lotes (fila FEFO)': (SQL_LOTES_FEFO, (1, 1)),
+    'get_lotes_vencendo': (SQL_LOTES_VENCENDO, (30,)),
+    'get_valor_custo': (SQL_VALOR_CUSTO, ()),
+    'get_valor_custo (em uma data)': (SQL_VALOR_CUSTO_DATA, ('2025-01-01',)),
+    'get_valor_venda (em uma data)': (SQL_VALOR_VENDA_DATA, ('2025-01-01', '2025-01-01')),
+    'get_evolucao_valor (saldos do período)': (SQL_SALDOS_PERIODO, ('2025-01-01', '2025-02-01')),
+    'get_evolucao_valor (preços do período)': (SQL_PRECOS_PERIODO, ('2025-01-01', '2025-02-01')),
+    'gerar_pedidos_compra': (SQL_COMPRA_SUGERIDA, (2,)),
+    'gerar_pedidos_compra (por local)': (SQL_COMPRA_SUGERIDA_LOCAL, (2, 1)),
+    'get_categorias': (SQL_CATEGORIAS, ()),
+    'get_resumo_categorias': (SQL_RESUMO_CATEGORIAS, ()),
+    'get_pedidos_compra': (SQL_PEDIDOS_COMPRA, ('rascunho',)),
+    'get_itens_pedido': (SQL_ITENS_PEDIDO, (1,)),
+    'get_curva_abc (saídas)': (SQL_ABC_SAIDAS, (90,)),
+    'get_curva_abc (saídas por local)': (SQL_ABC_SAIDAS_LOCAL, (1, 90)),
+    'relatórios diários (movimentações por categoria)': (SQL_MOVIMENTACOES_CATEGORIA, ('2025-01-01', '2025-01-02')),
+    'relatórios diários (posição do estoque)': (SQL_POSICAO_ESTOQUE_DATA, ('2025-01-02', '2025-01-02', '2025-01-02')),
+}
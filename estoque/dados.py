@@ -0,0 +1,342 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pandas as pd
+
+from estoque.abc import classificar_abc
+from estoque.arquivo import get_particoes_arquivo, get_ultimo_arquivamento
+from estoque.banco import get_colunas
+from estoque.conexao import cache_por_loja, init_database, init_relatorio
+from estoque.consultas import (
+    SQL_PRODUTOS, SQL_PRODUTOS_COM_DESCRICAO, SQL_PRODUTOS_LOCAL, SQL_PRODUTOS_LOCAL_COM_DESCRICAO,
+    SQL_ESTATISTICAS_LOCAL, SQL_RESUMO_LOCAIS, SQL_ESTOQUE_BAIXO_LOCAIS, SQL_TOTAL_PRODUTOS, SQL_PRODUTOS_BAIXO_ESTOQUE, SQL_VALOR_TOTAL,
+    SQL_PRODUTOS_ESGOTADOS, SQL_MOVIMENTACOES_PRODUTO, SQL_MOVIMENTACOES_RECENTES, SQL_LOTES_FEFO, SQL_LOTES_VENCENDO,
+    SQL_ABC_SAIDAS, SQL_ABC_SAIDAS_LOCAL, SQL_VALOR_CUSTO, SQL_VALOR_CUSTO_DATA, SQL_PEDIDOS_COMPRA, SQL_ITENS_PEDIDO,
+    SQL_FORNECEDORES, SQL_VALOR_VENDA_DATA, SQL_CATEGORIAS, SQL_RESUMO_CATEGORIAS, SQL_PRODUTO_EDICAO
+)
+from estoque.relatorio import get_data_copia
+from estoque.valorizacao import evolucao_valor
+
+
+# Tipos compactos das colunas do DataFrame de produtos
+TIPOS_PRODUTOS = {
+    'id': 'int32',
+    'nome': 'string[pyarrow]',
+    'codigo': 'string[pyarrow]',
+    'descricao': 'string[pyarrow]',
+    'categoria_id': 'Int32',
+    'categoria': 'category',
+    'quantidade': 'int32',
+    'estoque_minimo': 'int32',
+}
+DATAS_PRODUTOS = {'criado_em': '%Y-%m-%d %H:%M:%S', 'atualizado_em': '%Y-%m-%d %H:%M:%S'}
+
+# Função para obter dados dos produtos (a descrição é carregada sob demanda por get_produto_edicao).
+# Com local_id, a quantidade é o saldo do produto naquele local; com relatorio, lê a cópia de leitura.
+# A versão dos dados (get_versao_dados) só entra na chave do cache: mudou a versão, a consulta é refeita.
+@cache_por_loja
+def get_produtos(incluir_descricao=False, local_id=None, relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    if local_id:
+        query = SQL_PRODUTOS_LOCAL_COM_DESCRICAO if incluir_descricao else SQL_PRODUTOS_LOCAL
+        df = pd.read_sql_query(query, conn, params=(local_id,), parse_dates=DATAS_PRODUTOS)
+    else:
+        query = SQL_PRODUTOS_COM_DESCRICAO if incluir_descricao else SQL_PRODUTOS
+        df = pd.read_sql_query(query, conn, parse_dates=DATAS_PRODUTOS)
+    df = df.astype({coluna: tipo for coluna, tipo in TIPOS_PRODUTOS.items() if coluna in df.columns})
+    return df
+
+# Função para obter o uso de memória (bytes por coluna) do DataFrame de produtos em cache,
+# comparado à leitura com descrição e tipos padrão do pandas
+def get_uso_memoria_produtos():
+    conn = init_database()
+    compacto = get_produtos().memory_usage(deep=True)
+    original = pd.read_sql_query(SQL_PRODUTOS_COM_DESCRICAO, conn).memory_usage(deep=True)
+    return pd.DataFrame({'compacto': compacto, 'sem_conversao': original}).fillna(0).astype('int64')
+
+# Função para obter estatísticas (de toda a rede ou de um local)
+@cache_por_loja
+def get_estatisticas(local_id=None, relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    cursor = conn.cursor()
+    
+    if local_id:
+        cursor.execute(SQL_ESTATISTICAS_LOCAL, (local_id,))
+        total_produtos, produtos_baixo_estoque, valor_total, produtos_esgotados = cursor.fetchone()
+        return {
+            'total_produtos': total_produtos,
+            'produtos_baixo_estoque': produtos_baixo_estoque,
+            'valor_total': valor_total,
+            'produtos_esgotados': produtos_esgotados
+        }
+    
+    # Total de produtos
+    cursor.execute(SQL_TOTAL_PRODUTOS)
+    total_produtos = cursor.fetchone()[0]
+    
+    # Produtos com estoque baixo
+    cursor.execute(SQL_PRODUTOS_BAIXO_ESTOQUE)
+    produtos_baixo_estoque = cursor.fetchone()[0]
+    
+    # Valor total do estoque
+    cursor.execute(SQL_VALOR_TOTAL)
+    valor_total = cursor.fetchone()[0] or 0
+    
+    # Produtos esgotados
+    cursor.execute(SQL_PRODUTOS_ESGOTADOS)
+    produtos_esgotados = cursor.fetchone()[0]
+    
+    return {
+        'total_produtos': total_produtos,
+        'produtos_baixo_estoque': produtos_baixo_estoque,
+        'valor_total': valor_total,
+        'produtos_esgotados': produtos_esgotados
+    }
+
+# Função para obter o valor de custo do estoque da loja por PEPS (FIFO) e por custo médio ponderado,
+# atual ou no fim de uma data (consulta aos saldos de custo gravados a cada movimentação)
+@cache_por_loja
+def get_valor_custo(data=None, relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    if data:
+        valor_fifo, valor_medio = conn.execute(SQL_VALOR_CUSTO_DATA, (str(data + timedelta(days=1)),)).fetchone()
+    else:
+        valor_fifo, valor_medio = conn.execute(SQL_VALOR_CUSTO).fetchone()
+    return {'valor_fifo': valor_fifo, 'valor_medio': valor_medio}
+
+# Função para obter o valor de venda do estoque da loja no fim de uma data, pelo preço vigente na data
+@cache_por_loja
+def get_valor_venda(data, relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    limite = str(data + timedelta(days=1))
+    return conn.execute(SQL_VALOR_VENDA_DATA, (limite, limite)).fetchone()[0]
+
+# Função para obter a evolução diária do valor de venda e do custo (PEPS) do estoque da loja nos últimos dias
+@cache_por_loja
+def get_evolucao_valor(dias, relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    fim = date.today()
+    return evolucao_valor(conn, fim - timedelta(days=dias), fim)
+
+# Função para ler o cadastro atual de um produto, com a versão e o saldo no local (sem cache), para edição
+def get_produto_edicao(produto_id, local_id):
+    conn = init_database()
+    cursor = conn.execute(SQL_PRODUTO_EDICAO, (local_id, produto_id))
+    row = cursor.fetchone()
+    return dict(zip([coluna[0] for coluna in cursor.description], row)) if row else None
+
+# Função para obter o resumo de estoque por local
+@cache_por_loja
+def get_resumo_locais(relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    return pd.read_sql_query(SQL_RESUMO_LOCAIS, conn)
+
+# Função para obter os produtos com estoque baixo em cada local
+@cache_por_loja
+def get_estoque_baixo_locais():
+    conn = init_database()
+    return pd.read_sql_query(SQL_ESTOQUE_BAIXO_LOCAIS, conn)
+
+# Função para obter os lotes com saldo de um produto no local, na ordem de saída (FEFO)
+@cache_por_loja
+def get_lotes_produto(produto_id, local_id):
+    conn = init_database()
+    df = pd.read_sql_query(SQL_LOTES_FEFO, conn, params=(produto_id, local_id))
+    return df[['codigo', 'validade', 'quantidade']]
+
+# Função para obter os lotes que vencem nos próximos dias (ou já vencidos), de toda a rede ou de um local
+@cache_por_loja
+def get_lotes_vencendo(dias, local_id=None):
+    conn = init_database()
+    df = pd.read_sql_query(SQL_LOTES_VENCENDO, conn, params=(dias,), parse_dates=['validade'])
+    if local_id:
+        df = df[df['local_id'] == local_id]
+    return df.drop(columns='local_id')
+
+# Função para obter movimentações (com relatorio, da cópia de leitura, em cache pela versão dos dados)
+@cache_por_loja
+def get_movimentacoes(produto_id=None, data_inicio=None, data_fim=None, relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    sem_periodo = not data_inicio and not data_fim
+    if sem_periodo and not produto_id:
+        # Últimas movimentações: sempre na tabela atual
+        return pd.read_sql_query(SQL_MOVIMENTACOES_RECENTES, conn)
+    
+    # Histórico completo do produto ou período: somente as partições que cobrem o intervalo
+    particoes = get_particoes_arquivo(conn, data_inicio, data_fim)
+    if sem_periodo and not particoes:
+        return pd.read_sql_query(SQL_MOVIMENTACOES_PRODUTO, conn, params=(produto_id,))
+    
+    # Filtros aplicados em cada partição para aproveitar os índices
+    filtros = []
+    params_filtro = []
+    if produto_id:
+        filtros.append("produto_id = ?")
+        params_filtro.append(produto_id)
+    if data_inicio:
+        filtros.append("criado_em >= ?")
+        params_filtro.append(str(data_inicio))
+    if data_fim:
+        filtros.append("criado_em < ?")
+        params_filtro.append(str(data_fim + timedelta(days=1)))
+    where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    
+    colunas = ', '.join(get_colunas(conn, 'movimentacoes'))
+    tabelas = ['main.movimentacoes'] + [f'arquivo."{tabela}"' for tabela in particoes]
+    union = ' UNION ALL '.join(f"SELECT {colunas} FROM {tabela} {where}" for tabela in tabelas)
+    query = f'''
+        SELECT m.*, p.nome as produto_nome
+        FROM ({union}) m
+        JOIN produtos p ON m.produto_id = p.id
+        ORDER BY m.criado_em DESC
+    '''
+    df = pd.read_sql_query(query, conn, params=params_filtro * len(tabelas))
+    return df
+
+# Função para obter a curva ABC dos produtos (da cópia de leitura), por valor em estoque ('valor') ou por
+# volume de saídas nos últimos `dias` ('saidas'), ordenada do maior para o menor, com a participação
+# acumulada e a classe de cada produto. Parte dos produtos já em cache; o banco só soma as saídas.
+# Em cache pela versão dos dados (get_versao_dados).
+@cache_por_loja
+def get_curva_abc(criterio='valor', dias=90, local_id=None, versao=None):
+    produtos = get_produtos(local_id=local_id, relatorio=True, versao=versao)
+    if criterio == 'valor':
+        valores = (produtos['preco'] * produtos['quantidade']).to_numpy('float64')
+    else:
+        query, params = (SQL_ABC_SAIDAS_LOCAL, (local_id, dias)) if local_id else (SQL_ABC_SAIDAS, (dias,))
+        saidas = pd.read_sql_query(query, init_relatorio(), params=params, index_col='produto_id')['saidas']
+        valores = saidas.reindex(produtos['id'].to_numpy(), fill_value=0).to_numpy('float64')
+    
+    ordem, participacao, classes = classificar_abc(valores)
+    df = produtos[['id', 'nome', 'categoria']].iloc[ordem].reset_index(drop=True)
+    df['valor'] = valores[ordem]
+    df['acumulado'] = participacao * 100
+    df['classe'] = pd.Categorical(classes, categories=['A', 'B', 'C'])
+    return df
+
+# Função para obter as categorias (id, nome, perecível)
+@cache_por_loja
+def get_categorias():
+    conn = init_database()
+    return conn.execute(SQL_CATEGORIAS).fetchall()
+
+# Função para obter o total de produtos, unidades, valor e estoque baixo de cada categoria
+@cache_por_loja
+def get_resumo_categorias(relatorio=False, versao=None):
+    conn = init_relatorio() if relatorio else init_database()
+    return pd.read_sql_query(SQL_RESUMO_CATEGORIAS, conn)
+
+# Função para obter os fornecedores ativos (id, nome)
+@cache_por_loja
+def get_fornecedores():
+    conn = init_database()
+    return conn.execute(SQL_FORNECEDORES).fetchall()
+
+# Função para obter os pedidos de compra com um status (rascunho, recebido ou cancelado)
+@cache_por_loja
+def get_pedidos_compra(status='rascunho'):
+    conn = init_database()
+    return pd.read_sql_query(SQL_PEDIDOS_COMPRA, conn, params=(status,))
+
+# Função para obter os itens de um pedido de compra
+@cache_por_loja
+def get_itens_pedido(pedido_id):
+    conn = init_database()
+    return pd.read_sql_query(SQL_ITENS_PEDIDO, conn, params=(pedido_id,))
+
+# Função para obter a data/hora dos dados dos relatórios (None = dados em tempo real)
+def get_data_relatorio():
+    return get_data_copia(init_relatorio())
+
+# Função para obter o resumo das movimentações recebidas de cada terminal (banco central)
+def get_sincronizacao_terminais():
+    conn = init_database()
+    return pd.read_sql_query('''
+        SELECT terminal, COUNT(*) AS recebidas, MAX(seq) AS ultima_seq, MAX(recebido_em) AS ultimo_recebimento
+        FROM sincronizacao_recebidas
+        GROUP BY terminal
+        ORDER BY terminal
+    ''', conn)
+
+# Função para obter as movimentações de terminais não aplicadas no banco central
+def get_conflitos_sincronizacao():
+    conn = init_database()
+    return pd.read_sql_query("SELECT * FROM sincronizacao_conflitos ORDER BY id DESC", conn)
+
+# Função para obter as partições do arquivo morto
+def get_info_arquivo():
+    conn = init_database()
+    df = pd.read_sql_query("SELECT tabela, inicio, fim, linhas FROM arquivo_particoes ORDER BY inicio", conn)
+    return df, get_ultimo_arquivamento(conn)
+
+# Função para obter o plano de execução (EXPLAIN QUERY PLAN) de uma consulta
+def get_plano_consulta(sql, params=()):
+    conn = init_database()
+    df = pd.read_sql_query(f"EXPLAIN QUERY PLAN {sql}", conn, params=params)
+    return df[['id', 'parent', 'detail']]
+
+# Função para obter estatísticas das tabelas e índices
+def get_estatisticas_tabelas():
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+    tabelas = [row[0] for row in cursor.fetchall()]
+    
+    # Páginas ocupadas por tabela/índice (tabela virtual dbstat, quando disponível)
+    try:
+        cursor.execute("SELECT name, COUNT(*), SUM(unused) FROM dbstat GROUP BY name")
+        paginas = {nome: (qtd, livres) for nome, qtd, livres in cursor.fetchall()}
+    except sqlite3.OperationalError:
+        paginas = {}
+    
+    linhas_tabelas = []
+    linhas_indices = []
+    for tabela in tabelas:
+        cursor.execute(f'SELECT COUNT(*) FROM "{tabela}"')
+        total_linhas = cursor.fetchone()[0]
+        qtd_paginas, bytes_livres = paginas.get(tabela, (None, None))
+        linhas_tabelas.append({
+            'tabela': tabela,
+            'linhas': total_linhas,
+            'paginas': qtd_paginas,
+            'bytes_nao_usados': bytes_livres
+        })
+        
+        cursor.execute(f'PRAGMA index_list("{tabela}")')
+        for _, indice, unico, origem, parcial in cursor.fetchall():
+            cursor.execute(f'PRAGMA index_info("{indice}")')
+            colunas = [row[2] for row in cursor.fetchall()]
+            linhas_indices.append({
+                'tabela': tabela,
+                'indice': indice,
+                'colunas': ', '.join(str(c) for c in colunas),
+                'unico': bool(unico),
+                'parcial': bool(parcial),
+                'origem': origem,
+                'paginas': paginas.get(indice, (None, None))[0]
+            })
+    
+    # Estatísticas coletadas pelo ANALYZE (se já executado)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+    if cursor.fetchone():
+        df_stat = pd.read_sql_query("SELECT tbl AS tabela, idx AS indice, stat FROM sqlite_stat1", conn)
+    else:
+        df_stat = pd.DataFrame(columns=['tabela', 'indice', 'stat'])
+    
+    return pd.DataFrame(linhas_tabelas), pd.DataFrame(linhas_indices), df_stat
+
+# Função para obter o uso de páginas do arquivo (fragmentação)
+def get_info_paginas():
+    conn = init_database()
+    cursor = conn.cursor()
+    page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+    page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+    return {
+        'page_size': page_size,
+        'page_count': page_count,
+        'freelist_count': freelist_count,
+        'tamanho_bytes': page_size * page_count,
+        'fragmentacao': (freelist_count / page_count * 100) if page_count else 0
+    }
@@ -0,0 +1,24 @@
+import threading
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+
+from estoque.config import ORCAMENTO_INICIALIZACAO_MS, ORCAMENTO_EXECUCAO_MS
+
+
+# Tempos medidos no processo: primeira execução (partida a frio) e últimas execuções do script
+@st.cache_resource
+def get_tempos_execucao():
+    return {'lock': threading.Lock(), 'inicializacao': None, 'execucoes': deque(maxlen=100)}
+
+# Função para registrar o tempo de uma execução do script (retorna o orçamento estourado, se houver)
+def registrar_tempo(pagina, ms):
+    tempos = get_tempos_execucao()
+    with tempos['lock']:
+        primeira = tempos['inicializacao'] is None
+        if primeira:
+            tempos['inicializacao'] = {'pagina': pagina, 'ms': ms, 'em': datetime.now()}
+        tempos['execucoes'].append({'pagina': pagina, 'ms': ms, 'em': datetime.now()})
+    orcamento = ORCAMENTO_INICIALIZACAO_MS if primeira else ORCAMENTO_EXECUCAO_MS
+    return orcamento if ms > orcamento else None
@@ -0,0 +1,65 @@
+import json
+
+from estoque.consultas import SQL_INSERIR_MOVIMENTACAO
+
+
+# Produtos de uma seleção: a lista de ids vai como um único parâmetro (array JSON), e cada alteração é
+# um UPDATE só para toda a seleção
+FILTRO_SELECAO = "id IN (SELECT value FROM json_each(?))"
+
+# Saldos positivos dos produtos da seleção em cada local
+SQL_SALDOS_SELECAO = '''
+    SELECT produto_id, local_id, quantidade FROM estoque_locais
+    WHERE quantidade > 0 AND produto_id IN (SELECT value FROM json_each(?))
+'''
+
+# Função para atualizar colunas de todos os produtos da seleção em um UPDATE, incrementando a versão do
+# cadastro de cada um (retorna os produtos alterados)
+def _atualizar_selecao(conn, produtos_ids, atribuicoes, params=()):
+    with conn:
+        return conn.execute(f'''
+            UPDATE produtos SET {atribuicoes}, versao = versao + 1, atualizado_em = CURRENT_TIMESTAMP
+            WHERE {FILTRO_SELECAO}
+        ''', (*params, json.dumps(produtos_ids))).rowcount
+
+# Função para remover (inativar) os produtos da seleção. Com zerar_estoque, o saldo de cada produto em
+# cada local sai em movimentações de saída gravadas com executemany, e os lotes abertos são zerados,
+# na mesma transação (produtos sem estoque podem ser expurgados depois).
+def remover_produtos(conn, produtos_ids, zerar_estoque=False, observacao='Remoção do produto'):
+    selecao = json.dumps(produtos_ids)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if zerar_estoque:
+            saldos = conn.execute(SQL_SALDOS_SELECAO, (selecao,)).fetchall()
+            conn.execute(
+                "UPDATE lotes SET quantidade = 0 WHERE quantidade > 0 AND produto_id IN (SELECT value FROM json_each(?))",
+                (selecao,)
+            )
+            conn.executemany(SQL_INSERIR_MOVIMENTACAO, [
+                ('SAIDA', quantidade, produto_id, observacao, local_id, None, 0)
+                for produto_id, local_id, quantidade in saldos
+            ])
+        
+        removidos = conn.execute(f'''
+            UPDATE produtos SET ativo = 0, inativado_em = CURRENT_TIMESTAMP, versao = versao + 1
+            WHERE ativo = 1 AND {FILTRO_SELECAO}
+        ''', (selecao,)).rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return removidos
+
+# Função para mudar a categoria dos produtos da seleção
+def alterar_categoria(conn, produtos_ids, categoria_id):
+    return _atualizar_selecao(conn, produtos_ids, "categoria_id = ?", (categoria_id,))
+
+# Função para definir o estoque mínimo dos produtos da seleção
+def definir_estoque_minimo(conn, produtos_ids, estoque_minimo):
+    return _atualizar_selecao(conn, produtos_ids, "estoque_minimo = ?", (estoque_minimo,))
+
+# Função para reajustar em `percentual` % o preço dos produtos da seleção (arredondado em centavos,
+# nunca abaixo de R$ 0,01); cada novo preço entra no histórico de preços pelos triggers
+def reajustar_precos(conn, produtos_ids, percentual):
+    return _atualizar_selecao(conn, produtos_ids, "preco = MAX(ROUND(preco * (100 + ?) / 100.0, 2), 0.01)",
+                              (percentual,))
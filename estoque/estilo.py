@@ -0,0 +1,72 @@
+import os
+
+import streamlit as st
+
+from estoque.config import STATIC_DIR, LOGO_ARQUIVO
+
+# CSS personalizado para tema escuro
+CSS = """
+<style>
+    .main-header {
+        background: linear-gradient(90deg, #1f4e79 0%, #2e5984 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        text-align: center;
+    }
+    
+    .metric-card {
+        background: #f8f9fa;
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #007bff;
+        margin-bottom: 1rem;
+    }
+    
+    .alert-low {
+        background: #fff3cd;
+        border: 1px solid #ffeaa7;
+        color: #856404;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    
+    .alert-danger {
+        background: #f8d7da;
+        border: 1px solid #f5c6cb;
+        color: #721c24;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    
+    .alert-success {
+        background: #d4edda;
+        border: 1px solid #c3e6cb;
+        color: #155724;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+</style>
+"""
+
+
+# Função para aplicar o CSS (precisa ser reenviado a cada execução do script)
+def aplicar_estilo():
+    st.markdown(CSS, unsafe_allow_html=True)
+
+# Função para verificar se o logotipo configurado existe (verificado uma vez por processo)
+@st.cache_resource
+def logo_disponivel(arquivo):
+    return os.path.isfile(os.path.join(STATIC_DIR, arquivo))
+
+# Função para exibir o logotipo a partir dos arquivos estáticos locais
+def exibir_logo():
+    if logo_disponivel(LOGO_ARQUIVO):
+        # Servido pelo próprio Streamlit (app/static) com Last-Modified/ETag: o navegador reaproveita a imagem
+        st.markdown(f'<img src="app/static/{LOGO_ARQUIVO}" width="200" alt="Estoque Fácil">', unsafe_allow_html=True)
+    else:
+        st.markdown("### 📦 Estoque Fácil")
@@ -0,0 +1,77 @@
+import pandas as pd
+
+from estoque.consultas import SQL_INSERIR_MOVIMENTACAO
+from estoque.movimentacoes import consumir_lotes, descrever_lotes
+
+
+# Saldos do local e produtos com lotes abertos no local
+SQL_SALDOS_INVENTARIO = "SELECT produto_id, quantidade FROM estoque_locais WHERE local_id = ?"
+SQL_PRODUTOS_COM_LOTES = "SELECT DISTINCT produto_id FROM lotes WHERE local_id = ? AND quantidade > 0"
+
+# Exceção para contagens com colunas ou códigos que não identificam os produtos
+class ContagemInvalida(Exception):
+    pass
+
+# Função para normalizar uma contagem (planilha ou grade) em uma Series contado indexada por produto_id.
+# A contagem identifica os produtos pela coluna produto_id (ou id) ou codigo, e traz a quantidade
+# contada em contado (ou quantidade). Produtos repetidos têm as contagens somadas.
+def ler_contagem(conn, df):
+    df = df.rename(columns={'id': 'produto_id', 'quantidade': 'contado'})
+    if 'contado' not in df.columns:
+        raise ContagemInvalida("A contagem precisa da coluna 'contado' (ou 'quantidade')")
+    
+    df = df[df['contado'].notna()]
+    if 'produto_id' not in df.columns:
+        if 'codigo' not in df.columns:
+            raise ContagemInvalida("A contagem precisa da coluna 'produto_id' ou 'codigo'")
+        codigos = pd.read_sql_query(
+            "SELECT id AS produto_id, codigo FROM produtos WHERE codigo IS NOT NULL AND ativo = 1", conn
+        )
+        df = df.astype({'codigo': 'string'}).merge(codigos.astype({'codigo': 'string'}), on='codigo', how='left')
+        desconhecidos = df.loc[df['produto_id'].isna(), 'codigo']
+        if not desconhecidos.empty:
+            raise ContagemInvalida(f"Códigos não cadastrados: {', '.join(desconhecidos.head(10))}")
+    
+    ids = pd.read_sql_query("SELECT id FROM produtos", conn)['id']
+    inexistentes = df.loc[~df['produto_id'].isin(ids), 'produto_id']
+    if not inexistentes.empty:
+        raise ContagemInvalida(f"Produtos não cadastrados: {', '.join(inexistentes.astype(str).head(10))}")
+    if (df['contado'] < 0).any():
+        raise ContagemInvalida("Há quantidades contadas negativas")
+    return df.astype({'produto_id': 'int64', 'contado': 'int64'}).groupby('produto_id')['contado'].sum()
+
+# Função para comparar a contagem com os saldos do local (somente os produtos contados).
+# Retorna DataFrame [produto_id, sistema, contado, diferenca] dos produtos com diferença.
+def calcular_diferencas(conn, local_id, contagem):
+    saldos = pd.read_sql_query(SQL_SALDOS_INVENTARIO, conn, params=(local_id,), index_col='produto_id')['quantidade']
+    sistema = saldos.reindex(contagem.index, fill_value=0).astype('int64')
+    df = pd.DataFrame({'sistema': sistema, 'contado': contagem})
+    df['diferenca'] = df['contado'] - df['sistema']
+    return df[df['diferenca'] != 0].rename_axis('produto_id').reset_index()
+
+# Função para aplicar um inventário do local em uma transação: as diferenças são recalculadas com o
+# local bloqueado e gravadas como movimentações de ajuste com executemany. Saídas de produtos com
+# lotes abertos consomem os lotes por FEFO. Retorna o DataFrame das diferenças aplicadas.
+def aplicar_inventario(conn, local_id, contagem, observacao='Inventário'):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        diferencas = calcular_diferencas(conn, local_id, contagem)
+        com_lotes = {row[0] for row in conn.execute(SQL_PRODUTOS_COM_LOTES, (local_id,)).fetchall()}
+        
+        cursor = conn.cursor()
+        movimentacoes = []
+        for produto_id, diferenca in zip(diferencas['produto_id'].tolist(), diferencas['diferenca'].tolist()):
+            tipo = 'ENTRADA' if diferenca > 0 else 'SAIDA'
+            texto = observacao
+            if tipo == 'SAIDA' and produto_id in com_lotes:
+                consumidos = consumir_lotes(cursor, produto_id, local_id, -diferenca)
+                if consumidos:
+                    texto = f"{observacao} [lotes: {descrever_lotes(consumidos)}]"
+            movimentacoes.append((tipo, abs(diferenca), produto_id, texto, local_id, None, 0))
+        
+        cursor.executemany(SQL_INSERIR_MOVIMENTACAO, movimentacoes)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return diferencas
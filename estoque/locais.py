@@ -0,0 +1,36 @@
+import streamlit as st
+
+from estoque.config import LOCAL_PADRAO
+from estoque.conexao import cache_por_loja, init_database
+from estoque.consultas import SQL_LOCAIS
+
+
+# Função para obter os locais de estoque ativos (id, nome)
+@cache_por_loja
+def get_locais():
+    conn = init_database()
+    return conn.execute(SQL_LOCAIS).fetchall()
+
+# Função para exibir o seletor de local no menu lateral (None = todos os locais)
+def seletor_local():
+    locais = dict(get_locais())
+    if st.session_state.get('local_id') not in locais:
+        st.session_state.local_id = None
+    st.selectbox(
+        "🏬 Local:",
+        [None] + list(locais),
+        format_func=lambda local_id: "Todos os locais" if local_id is None else locais[local_id],
+        key='local_id'
+    )
+
+# Função para obter o local selecionado (None = todos os locais)
+def get_local_atual():
+    return st.session_state.get('local_id')
+
+# Função para obter o local das operações de estoque (o selecionado ou o padrão)
+def get_local_operacao():
+    return get_local_atual() or LOCAL_PADRAO
+
+# Função para obter o nome de um local
+def get_nome_local(local_id):
+    return dict(get_locais()).get(local_id, "Todos os locais")
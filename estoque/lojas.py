@@ -0,0 +1,38 @@
+import os
+
+import streamlit as st
+
+from estoque.config import DB_PATH, LOJAS_DIR
+
+
+# Sufixos de arquivos da pasta de lojas que não são bancos de loja
+SUFIXOS_AUXILIARES = ('_arquivo', '_relatorio')
+
+# Função para listar as lojas de uma pasta (nome -> caminho do banco); vazio quando não há pasta de lojas
+def listar_lojas(pasta=LOJAS_DIR):
+    if not pasta or not os.path.isdir(pasta):
+        return {}
+    lojas = {}
+    for arquivo in sorted(os.listdir(pasta)):
+        nome, extensao = os.path.splitext(arquivo)
+        if extensao == '.db' and not nome.endswith(SUFIXOS_AUXILIARES):
+            lojas[nome] = os.path.join(pasta, arquivo)
+    return lojas
+
+# Função para listar as lojas da rede (em cache para as páginas)
+@st.cache_data(ttl=60)
+def get_lojas():
+    return listar_lojas()
+
+# Função para exibir o seletor de loja no menu lateral (somente com mais de uma loja)
+def seletor_loja():
+    lojas = get_lojas()
+    if len(lojas) > 1:
+        st.selectbox("🏪 Loja:", list(lojas), key='loja')
+
+# Função para obter o caminho do banco da loja da sessão
+def get_banco_atual():
+    lojas = get_lojas()
+    if not lojas:
+        return DB_PATH
+    return lojas.get(st.session_state.get('loja')) or next(iter(lojas.values()))
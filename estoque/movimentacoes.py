@@ -0,0 +1,74 @@
+import sqlite3
+
+from estoque.config import LOCAL_PADRAO
+from estoque.consultas import SQL_INSERIR_MOVIMENTACAO, SQL_LOTES_FEFO, SQL_CONSUMIR_LOTE, SQL_INSERIR_LOTE
+
+
+# Exceção para saídas maiores que o saldo do produto no local
+class EstoqueInsuficiente(Exception):
+    pass
+
+# Função para consumir os lotes de um produto no local, o que vence primeiro sai primeiro (FEFO).
+# Retorna os lotes consumidos [(codigo, validade, quantidade)]; o que faltar sai do estoque sem lote.
+def consumir_lotes(cursor, produto_id, local_id, quantidade):
+    consumidos = []
+    restante = quantidade
+    for lote_id, codigo, validade, saldo in cursor.execute(SQL_LOTES_FEFO, (produto_id, local_id)).fetchall():
+        if restante == 0:
+            break
+        retirada = min(saldo, restante)
+        cursor.execute(SQL_CONSUMIR_LOTE, (retirada, lote_id))
+        consumidos.append((codigo, validade, retirada))
+        restante -= retirada
+    return consumidos
+
+# Função para dar entrada de lotes [(codigo, validade, quantidade)] de um produto no local
+def criar_lotes(cursor, produto_id, local_id, lotes):
+    cursor.executemany(SQL_INSERIR_LOTE, [
+        (produto_id, local_id, codigo, validade, quantidade) for codigo, validade, quantidade in lotes
+    ])
+
+# Texto dos lotes consumidos, anexado à observação da movimentação
+def descrever_lotes(lotes):
+    return ", ".join(f"{codigo or 's/ código'} (val. {validade}): {quantidade}" for codigo, validade, quantidade in lotes)
+
+# Função para gravar a movimentação no livro razão; os saldos do local e do produto são
+# atualizados pelos triggers de movimentacoes, que recusam saídas maiores que o saldo do local
+def _gravar_movimentacao(cursor, tipo, quantidade, produto_id, observacao, local_id, custo_unitario=None,
+                        transferencia=0):
+    try:
+        cursor.execute(SQL_INSERIR_MOVIMENTACAO,
+                       (tipo, quantidade, produto_id, observacao, local_id, custo_unitario, transferencia))
+    except sqlite3.IntegrityError as e:
+        if 'estoque insuficiente' in str(e):
+            raise EstoqueInsuficiente(f"Estoque insuficiente do produto {produto_id} no local {local_id}") from e
+        raise
+    return cursor.lastrowid
+
+# Função para registrar uma movimentação (os saldos do local e do produto acompanham pelos triggers)
+# (executa dentro da transação do cursor recebido; o commit fica com quem chama).
+# Entradas podem trazer lotes [(codigo, validade, quantidade)] e o custo unitário (sem custo, entram pelo
+# custo médio atual ou, sem ele, pelo preço de venda); saídas consomem os lotes por FEFO e as camadas de
+# custo por PEPS (triggers).
+def registrar_movimentacao(cursor, tipo, quantidade, produto_id, observacao, local_id=LOCAL_PADRAO, lotes=None,
+                           custo_unitario=None):
+    if tipo == 'ENTRADA':
+        if lotes:
+            criar_lotes(cursor, produto_id, local_id, lotes)
+    else:
+        consumidos = consumir_lotes(cursor, produto_id, local_id, quantidade)
+        if consumidos:
+            observacao = f"{observacao} [lotes: {descrever_lotes(consumidos)}]".strip()
+    
+    return _gravar_movimentacao(cursor, tipo, quantidade, produto_id, observacao, local_id, custo_unitario)
+
+# Função para transferir estoque entre locais; os lotes consumidos na origem entram no destino. As duas
+# movimentações são marcadas como transferência (não mudam o custo nem contam como entrada ou saída).
+def registrar_transferencia(cursor, produto_id, quantidade, local_origem, local_destino, observacao):
+    consumidos = consumir_lotes(cursor, produto_id, local_origem, quantidade)
+    if consumidos:
+        observacao = f"{observacao} [lotes: {descrever_lotes(consumidos)}]"
+    
+    _gravar_movimentacao(cursor, 'SAIDA', quantidade, produto_id, observacao, local_origem, transferencia=1)
+    criar_lotes(cursor, produto_id, local_destino, consumidos)
+    _gravar_movimentacao(cursor, 'ENTRADA', quantidade, produto_id, observacao, local_destino, transferencia=1)
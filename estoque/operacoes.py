@@ -0,0 +1,380 @@
+import sqlite3
+
+import streamlit as st
+
+from estoque.compras import (
+    PedidoFechado, ValidadeObrigatoria, atualizar_itens_pedido, cancelar_pedido, definir_fornecedor,
+    gerar_pedidos_compra, receber_pedido
+)
+from estoque.config import CENTRAL_DB_PATH, LOCAL_PADRAO
+from estoque.conexao import init_database
+from estoque.edicao_lote import alterar_categoria, definir_estoque_minimo, reajustar_precos, remover_produtos
+from estoque.inventario import ContagemInvalida, aplicar_inventario, calcular_diferencas, ler_contagem
+from estoque.consultas import SQL_PRODUTO_POR_CODIGO, SQL_QUANTIDADE_LOCAL
+from estoque.movimentacoes import EstoqueInsuficiente, registrar_movimentacao, registrar_transferencia
+from estoque.razao import conciliar_razao, verificar_razao
+
+
+# Função para adicionar produto (com validade, o estoque inicial entra como um lote; custo_unitario é o
+# custo de compra do estoque inicial). Em modo terminal, o cadastro é recusado: os ids dos produtos são
+# gerados pelo banco central.
+def adicionar_produto(nome, descricao, categoria_id, preco, quantidade, estoque_minimo, local_id=LOCAL_PADRAO,
+                      codigo_lote=None, validade=None, codigo=None, custo_unitario=None):
+    if CENTRAL_DB_PATH:
+        st.error("❌ Em modo terminal, os produtos são cadastrados no banco central.")
+        return False
+    
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+            INSERT INTO produtos (nome, codigo, descricao, categoria_id, preco, quantidade, estoque_minimo)
+            VALUES (?, ?, ?, ?, ?, 0, ?)
+        ''', (nome, codigo, descricao, categoria_id, preco, estoque_minimo))
+        
+        produto_id = cursor.lastrowid
+        
+        # Adicionar movimentação inicial se houver quantidade
+        if quantidade > 0:
+            lotes = [(codigo_lote, str(validade), quantidade)] if validade else None
+            registrar_movimentacao(cursor, 'ENTRADA', quantidade, produto_id, 'Estoque inicial', local_id, lotes,
+                                   custo_unitario)
+        
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        if 'produtos.codigo' in str(e):
+            st.error(f"❌ Já existe um produto com o código {codigo}.")
+        else:
+            st.error(f"Erro ao adicionar produto: {str(e)}")
+        return False
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao adicionar produto: {str(e)}")
+        return False
+
+# Função para editar produto com controle otimista de concorrência: o cadastro só é gravado se a versão
+# ainda for a lida na abertura da edição. A quantidade entra como diferença (ajuste) sobre o saldo do
+# local, para que vendas feitas durante a edição não sejam sobrescritas.
+# Retorna True, False (erro) ou None (o produto foi alterado por outra pessoa desde a leitura).
+def editar_produto(produto_id, nome, descricao, categoria_id, preco, ajuste, estoque_minimo, local_id=LOCAL_PADRAO,
+                   codigo=None, versao=0):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        # Atualizar produto (somente na versão lida)
+        cursor.execute('''
+            UPDATE produtos
+            SET nome = ?, codigo = ?, descricao = ?, categoria_id = ?, preco = ?,
+                estoque_minimo = ?, versao = versao + 1, atualizado_em = CURRENT_TIMESTAMP
+            WHERE id = ? AND versao = ?
+        ''', (nome, codigo, descricao, categoria_id, preco, estoque_minimo, produto_id, versao))
+        if cursor.rowcount == 0:
+            conn.rollback()
+            st.warning("⚠️ O produto foi alterado por outra pessoa enquanto você editava. "
+                       "Os dados atuais foram recarregados; refaça as alterações.")
+            return None
+        
+        # Registrar movimentação do ajuste de quantidade
+        if ajuste > 0:
+            registrar_movimentacao(cursor, 'ENTRADA', ajuste, produto_id, 'Ajuste de estoque', local_id)
+        elif ajuste < 0:
+            registrar_movimentacao(cursor, 'SAIDA', -ajuste, produto_id, 'Ajuste de estoque', local_id)
+        
+        conn.commit()
+        return True
+    except EstoqueInsuficiente:
+        conn.rollback()
+        st.error("❌ O ajuste deixaria o estoque do local negativo.")
+        return False
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        if 'produtos.codigo' in str(e):
+            st.error(f"❌ Já existe um produto com o código {codigo}.")
+        else:
+            st.error(f"Erro ao editar produto: {str(e)}")
+        return False
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao editar produto: {str(e)}")
+        return False
+
+# Função para remover (soft delete) os produtos selecionados, opcionalmente zerando o estoque deles
+# (retorna o número de produtos removidos ou None; o expurgo dos inativos os leva ao arquivo morto depois)
+def remover_produtos_selecionados(produtos_ids, zerar_estoque=False):
+    try:
+        return remover_produtos(init_database(), produtos_ids, zerar_estoque)
+    except Exception as e:
+        st.error(f"Erro ao remover produtos: {str(e)}")
+        return None
+
+# Função para mudar a categoria dos produtos selecionados (retorna o número de produtos alterados ou None)
+def alterar_categoria_produtos(produtos_ids, categoria_id):
+    try:
+        return alterar_categoria(init_database(), produtos_ids, categoria_id)
+    except Exception as e:
+        st.error(f"Erro ao alterar a categoria: {str(e)}")
+        return None
+
+# Função para definir o estoque mínimo dos produtos selecionados (retorna o número de produtos alterados ou None)
+def definir_minimo_produtos(produtos_ids, estoque_minimo):
+    try:
+        return definir_estoque_minimo(init_database(), produtos_ids, estoque_minimo)
+    except Exception as e:
+        st.error(f"Erro ao definir o estoque mínimo: {str(e)}")
+        return None
+
+# Função para reajustar o preço dos produtos selecionados em um percentual (retorna o número de produtos
+# alterados ou None)
+def reajustar_preco_produtos(produtos_ids, percentual):
+    try:
+        return reajustar_precos(init_database(), produtos_ids, percentual)
+    except Exception as e:
+        st.error(f"Erro ao reajustar os preços: {str(e)}")
+        return None
+
+# Função para dar baixa no estoque de um local
+# (retorna o novo estoque no local, ou None se a quantidade for maior que o estoque)
+def dar_baixa_estoque(produto_id, quantidade, observacao, local_id=LOCAL_PADRAO):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        registrar_movimentacao(cursor, 'SAIDA', quantidade, produto_id, observacao, local_id)
+        
+        cursor.execute(SQL_QUANTIDADE_LOCAL, (produto_id, local_id))
+        nova_qtd = cursor.fetchone()[0]
+        conn.commit()
+        return nova_qtd
+    except EstoqueInsuficiente:
+        conn.rollback()
+        return None
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao dar baixa no estoque: {str(e)}")
+        return None
+
+# Função para dar baixa pelo código (SKU/EAN) lido no scanner. Retorna None se o código não existir,
+# senão (nome, novo estoque no local ou None se a quantidade for maior que o estoque, estoque mínimo)
+def dar_baixa_por_codigo(codigo, quantidade, local_id=LOCAL_PADRAO):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        row = cursor.execute(SQL_PRODUTO_POR_CODIGO, (codigo,)).fetchone()
+        if row is None:
+            return None
+        produto_id, nome, estoque_minimo = row
+        
+        registrar_movimentacao(cursor, 'SAIDA', quantidade, produto_id, 'Baixa por leitura de código', local_id)
+        cursor.execute(SQL_QUANTIDADE_LOCAL, (produto_id, local_id))
+        nova_qtd = cursor.fetchone()[0]
+        conn.commit()
+        return nome, nova_qtd, estoque_minimo
+    except EstoqueInsuficiente:
+        conn.rollback()
+        return nome, None, estoque_minimo
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao dar baixa no estoque: {str(e)}")
+        return None
+
+# Função para dar entrada de estoque em um local (com validade, a entrada é um novo lote)
+def dar_entrada_estoque(produto_id, quantidade, observacao, local_id=LOCAL_PADRAO, codigo_lote=None, validade=None,
+                        custo_unitario=None):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        lotes = [(codigo_lote, str(validade), quantidade)] if validade else None
+        registrar_movimentacao(cursor, 'ENTRADA', quantidade, produto_id, observacao, local_id, lotes, custo_unitario)
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao dar entrada no estoque: {str(e)}")
+        return False
+
+# Função para transferir estoque entre locais (os lotes acompanham a transferência)
+def transferir_estoque(produto_id, quantidade, local_origem, local_destino):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        observacao = f"Transferência do local {local_origem} para o local {local_destino}"
+        registrar_transferencia(cursor, produto_id, quantidade, local_origem, local_destino, observacao)
+        conn.commit()
+        return True
+    except EstoqueInsuficiente:
+        conn.rollback()
+        st.error("❌ Quantidade maior que o estoque do local de origem.")
+        return False
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao transferir estoque: {str(e)}")
+        return False
+
+# Função para adicionar local de estoque
+def adicionar_local(nome):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("INSERT INTO locais (nome) VALUES (?)", (nome,))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao adicionar local: {str(e)}")
+        return False
+
+# Função para conferir os saldos com o livro razão (retorna (divergências, movimentações lidas) ou None)
+def conferir_livro_razao():
+    try:
+        return verificar_razao(init_database())
+    except Exception as e:
+        st.error(f"Erro ao conferir o livro razão: {str(e)}")
+        return None
+
+# Função para registrar as movimentações de conciliação das divergências encontradas
+def conciliar_livro_razao(divergencias):
+    try:
+        return conciliar_razao(init_database(), divergencias)
+    except Exception as e:
+        st.error(f"Erro ao conciliar o livro razão: {str(e)}")
+        return None
+
+# Função para adicionar categoria (perecível = produtos com controle de lotes e validade)
+def adicionar_categoria(nome, perecivel=False):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("INSERT INTO categorias (nome, perecivel) VALUES (?, ?)", (nome, perecivel))
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        st.error(f"❌ Já existe uma categoria chamada {nome}.")
+        return False
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao adicionar categoria: {str(e)}")
+        return False
+
+# Função para editar o nome e o controle de validade de uma categoria
+def editar_categoria(categoria_id, nome, perecivel):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("UPDATE categorias SET nome = ?, perecivel = ? WHERE id = ?", (nome, perecivel, categoria_id))
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        st.error(f"❌ Já existe uma categoria chamada {nome}.")
+        return False
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao editar categoria: {str(e)}")
+        return False
+
+# Função para adicionar fornecedor
+def adicionar_fornecedor(nome):
+    conn = init_database()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("INSERT INTO fornecedores (nome) VALUES (?)", (nome,))
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        st.error(f"❌ Já existe um fornecedor chamado {nome}.")
+        return False
+    except Exception as e:
+        conn.rollback()
+        st.error(f"Erro ao adicionar fornecedor: {str(e)}")
+        return False
+
+# Função para definir o fornecedor dos produtos selecionados
+def definir_fornecedor_produtos(fornecedor_id, produtos_ids):
+    try:
+        definir_fornecedor(init_database(), fornecedor_id, produtos_ids)
+        return True
+    except Exception as e:
+        st.error(f"Erro ao definir o fornecedor: {str(e)}")
+        return False
+
+# Função para gerar os pedidos de compra do estoque baixo (retorna (pedidos, itens) ou None)
+def gerar_pedidos_estoque_baixo(local_destino, local_id=None):
+    try:
+        return gerar_pedidos_compra(init_database(), local_destino, local_id)
+    except Exception as e:
+        st.error(f"Erro ao gerar pedidos de compra: {str(e)}")
+        return None
+
+# Função para salvar as quantidades e custos dos itens de um pedido em rascunho
+def salvar_itens_pedido(pedido_id, itens):
+    try:
+        atualizar_itens_pedido(init_database(), pedido_id, itens)
+        return True
+    except PedidoFechado:
+        st.error("❌ O pedido não está mais em rascunho.")
+        return False
+    except Exception as e:
+        st.error(f"Erro ao salvar o pedido: {str(e)}")
+        return False
+
+# Função para receber um pedido de compra com os lotes {produto_id: (codigo, validade)} (retorna o número
+# de entradas ou None)
+def receber_pedido_compra(pedido_id, lotes=None):
+    try:
+        return receber_pedido(init_database(), pedido_id, lotes)
+    except PedidoFechado:
+        st.error("❌ O pedido já foi recebido ou cancelado.")
+        return None
+    except ValidadeObrigatoria as e:
+        st.error(f"❌ {str(e)}")
+        return None
+    except Exception as e:
+        st.error(f"Erro ao receber o pedido: {str(e)}")
+        return None
+
+# Função para cancelar um pedido de compra
+def cancelar_pedido_compra(pedido_id):
+    try:
+        cancelar_pedido(init_database(), pedido_id)
+        return True
+    except PedidoFechado:
+        st.error("❌ O pedido já foi recebido ou cancelado.")
+        return False
+    except Exception as e:
+        st.error(f"Erro ao cancelar o pedido: {str(e)}")
+        return False
+
+# Função para ler uma contagem de inventário e compará-la com os saldos do local
+# (retorna (contagem, diferenças) ou None)
+def conferir_inventario(df_contagem, local_id=LOCAL_PADRAO):
+    conn = init_database()
+    try:
+        contagem = ler_contagem(conn, df_contagem)
+        return contagem, calcular_diferencas(conn, local_id, contagem)
+    except ContagemInvalida as e:
+        st.error(f"❌ {str(e)}")
+        return None
+    except Exception as e:
+        st.error(f"Erro ao conferir o inventário: {str(e)}")
+        return None
+
+# Função para aplicar os ajustes de um inventário do local em uma transação (retorna as diferenças ou None)
+def aplicar_inventario_local(contagem, local_id=LOCAL_PADRAO):
+    try:
+        return aplicar_inventario(init_database(), local_id, contagem)
+    except Exception as e:
+        st.error(f"Erro ao aplicar o inventário: {str(e)}")
+        return None
@@ -0,0 +1,185 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from estoque.banco import conectar
+from estoque.config import RAZAO_PRODUTOS_POR_LOTE, RAZAO_TRABALHADORES
+
+
+# Saldo líquido por (produto, local) de uma faixa de produtos: movimentações atuais + totais arquivados
+SQL_SALDOS_FAIXA = '''
+    SELECT produto_id, local_id, SUM(saldo) FROM (
+        SELECT produto_id, local_id,
+               SUM(CASE WHEN tipo = 'ENTRADA' THEN quantidade ELSE -quantidade END) AS saldo
+        FROM movimentacoes
+        WHERE produto_id BETWEEN ? AND ?
+        GROUP BY produto_id, local_id
+        UNION ALL
+        SELECT produto_id, local_id, entradas - saidas
+        FROM movimentacoes_arquivadas_saldo
+        WHERE produto_id BETWEEN ? AND ?
+    )
+    GROUP BY produto_id, local_id
+'''
+
+# Função para dividir os ids de produtos em faixas (primeiro id, último id) de até `tamanho` produtos
+def faixas_produtos(conn, tamanho=None):
+    tamanho = tamanho or RAZAO_PRODUTOS_POR_LOTE
+    ids = [row[0] for row in conn.execute("SELECT id FROM produtos ORDER BY id").fetchall()]
+    return [(ids[i], ids[min(i + tamanho, len(ids)) - 1]) for i in range(0, len(ids), tamanho)]
+
+# Função para somar o livro razão de uma faixa de produtos (conexão própria, para ler em paralelo)
+def _saldos_faixa(caminho, faixa):
+    conn = conectar(caminho)
+    try:
+        return conn.execute(SQL_SALDOS_FAIXA, faixa + faixa).fetchall()
+    finally:
+        conn.close()
+
+# Função para reconstruir estoque_locais e produtos.quantidade repassando o livro razão.
+# As faixas de produtos são somadas em paralelo enquanto a transação de escrita, já aberta,
+# impede novas movimentações; retorna quantos saldos (por local e totais dos produtos) foram corrigidos.
+def reconstruir_saldos(conn, tamanho=None, trabalhadores=None):
+    caminho = conn.execute("PRAGMA database_list").fetchone()[2]
+    trabalhadores = trabalhadores or RAZAO_TRABALHADORES
+    
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        faixas = faixas_produtos(conn, tamanho)
+        with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+            saldos = [linha for linhas in executor.map(lambda faixa: _saldos_faixa(caminho, faixa), faixas)
+                      for linha in linhas]
+        
+        atuais = {(produto_id, local_id): quantidade for produto_id, local_id, quantidade
+                  in conn.execute("SELECT produto_id, local_id, quantidade FROM estoque_locais").fetchall()}
+        novos = {(produto_id, local_id): quantidade for produto_id, local_id, quantidade in saldos}
+        corrigidos = sum(1 for chave in atuais.keys() | novos.keys() if atuais.get(chave, 0) != novos.get(chave, 0))
+        
+        conn.execute("DELETE FROM estoque_locais")
+        conn.executemany(
+            "INSERT INTO estoque_locais (produto_id, local_id, quantidade) VALUES (?, ?, ?)", saldos
+        )
+        corrigidos += conn.execute('''
+            UPDATE produtos SET quantidade = totais.quantidade
+            FROM (
+                SELECT p.id, COALESCE(SUM(el.quantidade), 0) AS quantidade
+                FROM produtos p
+                LEFT JOIN estoque_locais el ON el.produto_id = p.id
+                GROUP BY p.id
+            ) AS totais
+            WHERE totais.id = produtos.id AND produtos.quantidade != totais.quantidade
+        ''').rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return corrigidos
+
+# Saldo do razão por (produto, local): movimentações atuais em uma faixa de ids + totais arquivados
+SQL_RAZAO_ATE = '''
+    SELECT produto_id, local_id, SUM(saldo) AS saldo FROM (
+        SELECT produto_id, local_id,
+               SUM(CASE WHEN tipo = 'ENTRADA' THEN quantidade ELSE -quantidade END) AS saldo
+        FROM movimentacoes
+        WHERE id <= ?
+        GROUP BY produto_id, local_id
+        UNION ALL
+        SELECT produto_id, local_id, entradas - saidas
+        FROM movimentacoes_arquivadas_saldo
+    )
+    GROUP BY produto_id, local_id
+'''
+SQL_RAZAO_NOVAS = '''
+    SELECT produto_id, local_id,
+           SUM(CASE WHEN tipo = 'ENTRADA' THEN quantidade ELSE -quantidade END) AS saldo
+    FROM movimentacoes
+    WHERE id > ? AND id <= ?
+    GROUP BY produto_id, local_id
+'''
+
+# Função para ler um resultado (produto_id, local_id, valor) como Series indexada por (produto_id, local_id)
+def _serie(conn, sql, params=()):
+    df = pd.read_sql_query(sql, conn, params=params)
+    return df.set_index(['produto_id', 'local_id']).iloc[:, 0].astype('int64')
+
+# Função para conferir os saldos de estoque_locais e o total de cada produto (produtos.quantidade) com o
+# livro razão. Só as movimentações posteriores à última conferida são somadas (a conferência completa é
+# refeita se o arquivamento levou movimentações ainda não conferidas). Retorna (divergências, movimentações
+# lidas); as divergências do total do produto vêm sem local_id.
+def verificar_razao(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT valor FROM controle WHERE chave = 'razao_verificado_ate'").fetchone()
+        verificado_ate = int(row[0]) if row else None
+        ultimo_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM movimentacoes").fetchone()[0]
+        ultimo_arquivado = conn.execute(
+            "SELECT COALESCE(MAX(ultimo_id), 0) FROM movimentacoes_arquivadas_saldo"
+        ).fetchone()[0]
+        
+        if verificado_ate is None or ultimo_arquivado > verificado_ate:
+            primeiro_id = 0
+            razao = _serie(conn, SQL_RAZAO_ATE, (ultimo_id,))
+            conn.execute("DELETE FROM razao_verificado")
+            alterados = razao
+        else:
+            primeiro_id = verificado_ate
+            novas = _serie(conn, SQL_RAZAO_NOVAS, (verificado_ate, ultimo_id))
+            razao = _serie(conn, "SELECT produto_id, local_id, saldo FROM razao_verificado")
+            razao = razao.add(novas, fill_value=0).astype('int64')
+            alterados = razao.loc[novas.index]
+        
+        lidas = conn.execute(
+            "SELECT COUNT(*) FROM movimentacoes WHERE id > ? AND id <= ?", (primeiro_id, ultimo_id)
+        ).fetchone()[0]
+        
+        conn.executemany('''
+            INSERT INTO razao_verificado (produto_id, local_id, saldo) VALUES (?, ?, ?)
+            ON CONFLICT (produto_id, local_id) DO UPDATE SET saldo = excluded.saldo
+        ''', [(int(p), int(l), int(s)) for (p, l), s in alterados.items()])
+        conn.execute(
+            "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('razao_verificado_ate', ?)", (str(ultimo_id),)
+        )
+        
+        saldos = _serie(conn, "SELECT produto_id, local_id, quantidade FROM estoque_locais")
+        totais = pd.read_sql_query(
+            "SELECT id AS produto_id, quantidade FROM produtos", conn, index_col='produto_id'
+        )['quantidade']
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    # Comparação vetorizada: (produto, local) presentes em qualquer um dos lados, e o total de cada produto
+    # com a soma do razão nos locais
+    df = pd.DataFrame({'saldo': saldos, 'razao': razao}).fillna(0).astype('int64').reset_index()
+    df_totais = pd.DataFrame({'saldo': totais, 'razao': razao.groupby(level='produto_id').sum()})
+    df_totais = df_totais.fillna(0).astype('int64').rename_axis('produto_id').reset_index()
+    df = pd.concat([df, df_totais], ignore_index=True).astype({'local_id': 'Int64'})
+    df['diferenca'] = df['saldo'] - df['razao']
+    return df[df['diferenca'] != 0].reset_index(drop=True), lidas
+
+# Função para registrar no razão, em lote, movimentações de conciliação que igualam o razão aos
+# saldos atuais dos locais (o saldo não muda); o total dos produtos divergentes é refeito pela soma dos
+# saldos dos locais (que passa a ser o total do razão). Retorna quantos ajustes foram feitos.
+def conciliar_razao(conn, divergencias):
+    por_local = divergencias['local_id'].notna()
+    movimentacoes = [
+        ('ENTRADA' if diferenca > 0 else 'SAIDA', abs(int(diferenca)), int(produto_id),
+         'Conciliação do livro razão', int(local_id))
+        for produto_id, local_id, diferenca
+        in divergencias.loc[por_local, ['produto_id', 'local_id', 'diferenca']].itertuples(index=False)
+    ]
+    produtos = [(int(produto_id),) for produto_id in divergencias['produto_id'].unique()]
+    with conn:
+        conn.executemany('''
+            INSERT INTO movimentacoes (tipo, quantidade, produto_id, observacao, local_id, conciliacao)
+            VALUES (?, ?, ?, ?, ?, 1)
+        ''', movimentacoes)
+        totais = conn.executemany('''
+            UPDATE produtos SET quantidade = totais.quantidade, atualizado_em = CURRENT_TIMESTAMP
+            FROM (
+                SELECT COALESCE(SUM(quantidade), 0) AS quantidade FROM estoque_locais WHERE produto_id = ?1
+            ) AS totais
+            WHERE produtos.id = ?1 AND produtos.quantidade != totais.quantidade
+        ''', produtos).rowcount
+    return len(movimentacoes) + totais
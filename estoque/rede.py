@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from estoque.banco import conectar, criar_schema, schema_atualizado
+from estoque.config import REDE_TRABALHADORES
+from estoque.consultas import SQL_ESTATISTICAS
+from estoque.lojas import get_lojas
+
+
+# Colunas das estatísticas consolidadas da rede
+COLUNAS_ESTATISTICAS = ['total_produtos', 'produtos_baixo_estoque', 'valor_total', 'produtos_esgotados']
+
+# Função para executar uma consulta no banco de uma loja (conexão própria, fechada ao final). O schema só é
+# criado/migrado quando a loja ainda não está na versão atual (a consulta normal só lê o PRAGMA user_version).
+def _consultar_loja(caminho, sql, params):
+    conn = conectar(caminho, timeout=30)
+    try:
+        if not schema_atualizado(conn):
+            criar_schema(conn)
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+# Função para executar a mesma consulta em todas as lojas em paralelo (uma conexão por loja).
+# Retorna {loja: linhas}, com a exceção no lugar das linhas quando a loja falhar.
+def consultar_rede(lojas, sql, params=(), trabalhadores=None):
+    with ThreadPoolExecutor(max_workers=trabalhadores or REDE_TRABALHADORES) as executor:
+        futuros = {loja: executor.submit(_consultar_loja, caminho, sql, params) for loja, caminho in lojas.items()}
+    
+    resultados = {}
+    for loja, futuro in futuros.items():
+        try:
+            resultados[loja] = futuro.result()
+        except Exception as e:
+            resultados[loja] = e
+    return resultados
+
+# Função para obter as estatísticas de cada loja e o total da rede
+@st.cache_data(ttl=60)
+def get_estatisticas_rede():
+    linhas = []
+    for loja, resultado in consultar_rede(get_lojas(), SQL_ESTATISTICAS).items():
+        if isinstance(resultado, Exception):
+            linhas.append({'loja': loja, 'erro': str(resultado)})
+        else:
+            linhas.append({'loja': loja, **dict(zip(COLUNAS_ESTATISTICAS, resultado[0])), 'erro': None})
+    
+    df = pd.DataFrame(linhas, columns=['loja'] + COLUNAS_ESTATISTICAS + ['erro'])
+    totais = df[COLUNAS_ESTATISTICAS].fillna(0).sum().to_dict()
+    return df, totais
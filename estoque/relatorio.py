@@ -0,0 +1,34 @@
+import os
+from datetime import datetime
+
+from estoque.banco import conectar, caminho_relatorio
+
+
+# Função para atualizar a cópia de leitura dos relatórios com a API de backup online do SQLite.
+# A cópia é feita em uma única etapa (em etapas, o SQLite recomeça a cópia a cada gravação de outra
+# conexão, e em uma loja movimentada a cópia de um banco grande podia não terminar nunca), em um arquivo
+# temporário (um por processo) publicado com os.replace: quem já lê a cópia anterior não é afetado.
+def atualizar_copia_relatorio(caminho):
+    destino = caminho_relatorio(caminho)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    
+    origem = conectar(caminho, timeout=30)
+    copia = conectar(temporario)
+    try:
+        origem.backup(copia, pages=-1)
+        copia.execute(
+            "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('copia_relatorio_em', ?)",
+            (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),)
+        )
+        copia.commit()
+    finally:
+        copia.close()
+        origem.close()
+    
+    os.replace(temporario, destino)
+    return destino
+
+# Função para obter a data/hora dos dados de uma cópia de leitura
+def get_data_copia(conn):
+    row = conn.execute("SELECT valor FROM controle WHERE chave = 'copia_relatorio_em'").fetchone()
+    return row[0] if row else None
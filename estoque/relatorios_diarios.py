@@ -0,0 +1,211 @@
+import argparse
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+from estoque.arquivo import get_particoes_arquivo
+from estoque.banco import (
+    conectar, criar_schema, anexar_arquivo, caminho_arquivo, caminho_relatorio, get_colunas, schema_atualizado
+)
+from estoque.config import DB_PATH, RELATORIOS_DIR, RELATORIOS_LOTE, RELATORIOS_TRABALHADORES
+from estoque.consultas import SQL_ESTOQUE_BAIXO_LOCAIS, SQL_MOVIMENTACOES_CATEGORIA_TABELAS, SQL_POSICAO_ESTOQUE_DATA
+from estoque.lojas import listar_lojas
+from estoque.relatorio import atualizar_copia_relatorio
+
+
+# Transferências arquivadas antes da coluna transferencia (reconhecidas pela observação, como na migração)
+TRANSFERENCIA_OBSERVACAO = (
+    "(observacao LIKE 'Transferência do local % para o local %' "
+    "OR observacao LIKE '[%] Transferência do local % para o local %')"
+)
+
+# Posição do estoque no fim do dia (último saldo de cada produto antes do dia seguinte e o preço vigente)
+def _consulta_posicao(conn, dia, periodo):
+    return SQL_POSICAO_ESTOQUE_DATA, (periodo[1],) * 3
+
+# Estoque baixo por local: os locais só têm o saldo atual, então o relatório só é gerado para ontem (o dia
+# padrão da geração agendada); para outros dias, retorna None
+def _consulta_estoque_baixo(conn, dia, periodo):
+    if dia != date.today() - timedelta(days=1):
+        return None
+    return SQL_ESTOQUE_BAIXO_LOCAIS, ()
+
+# Movimentações por categoria: a tabela atual e as partições do arquivo morto que cobrem o dia (como no
+# Histórico), com os filtros em cada tabela para aproveitar os índices. Partições antigas podem não ter
+# as colunas criadas depois delas.
+def _consulta_movimentacoes(conn, dia, periodo):
+    tabelas = [('main.movimentacoes', 'conciliacao', 'transferencia')]
+    if 'arquivo' in [row[1] for row in conn.execute("PRAGMA database_list").fetchall()]:
+        for tabela in get_particoes_arquivo(conn, dia, dia):
+            colunas = get_colunas(conn, tabela, 'arquivo')
+            tabelas.append((
+                f'arquivo."{tabela}"',
+                'COALESCE(conciliacao, 0)' if 'conciliacao' in colunas else '0',
+                f'COALESCE(transferencia, {TRANSFERENCIA_OBSERVACAO})' if 'transferencia' in colunas
+                else TRANSFERENCIA_OBSERVACAO,
+            ))
+    union = ' UNION ALL '.join(
+        f"SELECT produto_id, tipo, quantidade, {conciliacao} AS conciliacao, {transferencia} AS transferencia "
+        f"FROM {tabela} WHERE criado_em >= ? AND criado_em < ?"
+        for tabela, conciliacao, transferencia in tabelas
+    )
+    return SQL_MOVIMENTACOES_CATEGORIA_TABELAS.format(movimentacoes=union), periodo * len(tabelas)
+
+# Relatórios diários de cada loja: arquivo -> (título, função da consulta do dia (conn, dia, período) ->
+# (sql, parâmetros) ou None, colunas exibidas (coluna, título, formato))
+RELATORIOS = {
+    'posicao_estoque': ("Posição do Estoque", _consulta_posicao, [
+        ('nome', 'Produto', None), ('codigo', 'Código', None), ('categoria', 'Categoria', None),
+        ('preco', 'Preço (R$)', '{:,.2f}'), ('quantidade', 'Estoque', None), ('estoque_minimo', 'Mínimo', None),
+    ]),
+    'estoque_baixo': ("Estoque Baixo por Local", _consulta_estoque_baixo, [
+        ('local', 'Local', None), ('nome', 'Produto', None), ('categoria', 'Categoria', None),
+        ('quantidade', 'Estoque', None), ('estoque_minimo', 'Mínimo', None),
+    ]),
+    'movimentacoes_categoria': ("Movimentações por Categoria", _consulta_movimentacoes, [
+        ('categoria', 'Categoria', None), ('produtos', 'Produtos', None), ('entradas', 'Entradas', None),
+        ('saidas', 'Saídas', None), ('valor_saidas', 'Valor das Saídas (R$)', '{:,.2f}'),
+    ]),
+}
+
+# Página HTML dos relatórios (o estilo de impressão permite salvar em PDF pelo navegador)
+HTML_INICIO = '''<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{titulo} - {loja} - {data}</title>
+<style>
+body {{ font-family: sans-serif; color: #222; margin: 2rem; }}
+h1 {{ color: #1f4e79; margin-bottom: 0; }}
+table {{ border-collapse: collapse; width: 100%; margin-top: 1rem; font-size: 0.9rem; }}
+th {{ background: #1f4e79; color: #fff; text-align: left; }}
+th, td {{ padding: 4px 8px; border-bottom: 1px solid #ddd; }}
+td.numero {{ text-align: right; }}
+@media print {{ body {{ margin: 0; }} thead {{ display: table-header-group; }} }}
+</style>
+</head>
+<body>
+<h1>{titulo}</h1>
+<p>Loja: {loja} &middot; Data: {data} &middot; Dados de {dados_em}</p>
+<table>
+<thead><tr>{cabecalho}</tr></thead>
+<tbody>
+'''
+HTML_FIM = '''</tbody>
+</table>
+<p>{linhas} linha(s) &middot; gerado em {gerado_em}</p>
+</body>
+</html>
+'''
+
+# Função para formatar uma célula da tabela (números alinhados à direita)
+def _celula(valor, formato):
+    if valor is None:
+        return '<td></td>'
+    if isinstance(valor, (int, float)):
+        texto = formato.format(valor) if formato else str(valor)
+        return f'<td class="numero">{texto}</td>'
+    return f'<td>{html.escape(str(valor))}</td>'
+
+# Função para gravar um relatório lendo a consulta em blocos de `lote` linhas (a tabela inteira nunca fica
+# em memória). O arquivo é escrito em um temporário publicado com os.replace; retorna as linhas gravadas.
+def _gravar_relatorio(conn, destino, loja, data, dados_em, titulo, sql, colunas, params, lote):
+    cursor = conn.execute(sql, params)
+    posicoes = {descricao[0]: i for i, descricao in enumerate(cursor.description)}
+    campos = [(posicoes[coluna], formato) for coluna, _, formato in colunas]
+    
+    temporario = f"{destino}.tmp"
+    linhas = 0
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(HTML_INICIO.format(
+            titulo=titulo, loja=html.escape(loja), data=data, dados_em=dados_em,
+            cabecalho=''.join(f'<th>{html.escape(nome)}</th>' for _, nome, _ in colunas)
+        ))
+        while True:
+            bloco = cursor.fetchmany(lote)
+            if not bloco:
+                break
+            arquivo.writelines(
+                '<tr>' + ''.join(_celula(row[i], formato) for i, formato in campos) + '</tr>\n' for row in bloco
+            )
+            linhas += len(bloco)
+        arquivo.write(HTML_FIM.format(linhas=linhas, gerado_em=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    
+    os.replace(temporario, destino)
+    return linhas
+
+# Função para gerar os relatórios de uma loja (executada em um processo do pool). As consultas leem uma
+# cópia do banco atualizada agora pela API de backup, para não bloquear as gravações da loja, com o arquivo
+# morto anexado somente para leitura. Retorna {relatório: linhas} (sem os relatórios que não existem no dia).
+def gerar_relatorios_loja(loja, caminho, data, saida, lote=None):
+    pasta = os.path.join(saida, data, loja)
+    os.makedirs(pasta, exist_ok=True)
+    inicio = datetime.strptime(data, '%Y-%m-%d').date()
+    periodo = (inicio.isoformat(), (inicio + timedelta(days=1)).isoformat())
+    
+    # Banco da loja no schema atual (migrado só se preciso, como nas consultas da rede), copiado em seguida
+    conn = conectar(caminho, timeout=30)
+    try:
+        if not schema_atualizado(conn):
+            criar_schema(conn)
+    finally:
+        conn.close()
+    atualizar_copia_relatorio(caminho)
+    conn = conectar(f"file:{caminho_relatorio(caminho)}?mode=ro", uri=True)
+    try:
+        if os.path.exists(caminho_arquivo(caminho)):
+            anexar_arquivo(conn, caminho, somente_leitura=True)
+        dados_em = conn.execute("SELECT valor FROM controle WHERE chave = 'copia_relatorio_em'").fetchone()[0]
+        resultado = {}
+        for nome, (titulo, consulta, colunas) in RELATORIOS.items():
+            consulta_dia = consulta(conn, inicio, periodo)
+            if consulta_dia is None:
+                continue
+            sql, params = consulta_dia
+            resultado[nome] = _gravar_relatorio(conn, os.path.join(pasta, f"{nome}.html"), loja, data, dados_em,
+                                                titulo, sql, colunas, params, lote or RELATORIOS_LOTE)
+        return resultado
+    finally:
+        conn.close()
+
+# Função para gerar os relatórios do dia de todas as lojas em paralelo, uma loja por processo.
+# Retorna {loja: {relatório: linhas}}, com a exceção no lugar quando a loja falhar.
+def gerar_relatorios(lojas, data=None, saida=None, trabalhadores=None, lote=None):
+    data = data or (date.today() - timedelta(days=1)).isoformat()
+    saida = saida or RELATORIOS_DIR
+    with ProcessPoolExecutor(max_workers=min(trabalhadores or RELATORIOS_TRABALHADORES, len(lojas) or 1)) as executor:
+        futuros = {loja: executor.submit(gerar_relatorios_loja, loja, caminho, data, saida, lote)
+                   for loja, caminho in lojas.items()}
+    
+    resultados = {}
+    for loja, futuro in futuros.items():
+        try:
+            resultados[loja] = futuro.result()
+        except Exception as e:
+            resultados[loja] = e
+    return resultados
+
+# Geração pela linha de comando (agendada no cron, por exemplo):
+# python -m estoque.relatorios_diarios --data 2025-01-31 --saida relatorios --trabalhadores 8
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Relatórios diários de estoque das lojas")
+    parser.add_argument('--data', help="dia dos relatórios (AAAA-MM-DD); padrão: ontem")
+    parser.add_argument('--saida', default=RELATORIOS_DIR, help="pasta de saída")
+    parser.add_argument('--trabalhadores', type=int, default=RELATORIOS_TRABALHADORES)
+    parser.add_argument('--loja', action='append', help="gerar só para esta loja (pode repetir)")
+    args = parser.parse_args()
+    
+    # Sem pasta de lojas, o banco único é tratado como uma loja
+    lojas = listar_lojas() or {os.path.splitext(os.path.basename(DB_PATH))[0]: DB_PATH}
+    if args.loja:
+        lojas = {loja: caminho for loja, caminho in lojas.items() if loja in args.loja}
+    
+    falhas = 0
+    for loja, resultado in gerar_relatorios(lojas, args.data, args.saida, args.trabalhadores).items():
+        if isinstance(resultado, Exception):
+            falhas += 1
+            print(f"{loja}: erro - {resultado}")
+        else:
+            print(f"{loja}: " + ', '.join(f"{nome} ({linhas} linhas)" for nome, linhas in resultado.items()))
+    raise SystemExit(1 if falhas else 0)
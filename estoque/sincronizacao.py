@@ -0,0 +1,150 @@
+import sqlite3
+
+from estoque.banco import conectar, criar_schema
+from estoque.config import SINCRONIZACAO_LOTE
+from estoque.movimentacoes import consumir_lotes, criar_lotes
+
+
+# Movimentações do terminal ainda não enviadas (o id é a sequência monotônica do terminal). As conciliações
+# do livro razão do terminal não são enviadas: elas corrigem o razão local, e no central não mudariam o
+# saldo, mas entrariam no razão.
+SQL_PENDENTES = '''
+    SELECT id, tipo, quantidade, produto_id, observacao, local_id, criado_em, custo_unitario, transferencia
+    FROM movimentacoes
+    WHERE id > ? AND conciliacao = 0
+    ORDER BY id
+    LIMIT ?
+'''
+
+# Função para obter a última movimentação do terminal confirmada pelo banco central
+def get_sincronizado_ate(conn):
+    row = conn.execute("SELECT valor FROM controle WHERE chave = 'sincronizado_ate'").fetchone()
+    return int(row[0]) if row else 0
+
+# Função para contar as movimentações do terminal que aguardam envio
+def get_pendentes(conn):
+    return conn.execute(
+        "SELECT COUNT(*) FROM movimentacoes WHERE id > ? AND conciliacao = 0", (get_sincronizado_ate(conn),)
+    ).fetchone()[0]
+
+# Função para agrupar as movimentações de um lote: a saída e a entrada de uma transferência entre locais
+# (gravadas em sequência por registrar_transferencia) formam um grupo, aplicado de uma vez no central
+def _agrupar_transferencias(movimentacoes):
+    grupos = []
+    for movimentacao in movimentacoes:
+        _, tipo, quantidade, produto_id, _, _, _, _, transferencia = movimentacao
+        anterior = grupos[-1] if grupos else None
+        if (transferencia and tipo == 'ENTRADA' and anterior and len(anterior) == 1 and anterior[0][8]
+                and anterior[0][1] == 'SAIDA' and anterior[0][3] == produto_id and anterior[0][2] == quantidade):
+            anterior.append(movimentacao)
+        else:
+            grupos.append([movimentacao])
+    return grupos
+
+# Função para aplicar no banco central, em uma transação, um lote de movimentações de um terminal.
+# Movimentações já recebidas são ignoradas; saídas maiores que o saldo central viram conflito (nas
+# transferências, a saída e a entrada). Os lotes consumidos pela saída de uma transferência entram no
+# local de destino, como em registrar_transferencia. Retorna (aplicadas, conflitos).
+def receber_lote(central, terminal, movimentacoes):
+    aplicadas = conflitos = 0
+    cursor = central.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        for grupo in _agrupar_transferencias(movimentacoes):
+            novas = []
+            for movimentacao in grupo:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO sincronizacao_recebidas (terminal, seq) VALUES (?, ?)",
+                    (terminal, movimentacao[0])
+                )
+                if cursor.rowcount:
+                    novas.append(movimentacao)
+            if not novas:
+                continue
+            
+            cursor.execute("SAVEPOINT movimentacao")
+            try:
+                consumidos = []
+                for (seq, tipo, quantidade, produto_id, observacao, local_id, criado_em, custo_unitario,
+                     transferencia) in novas:
+                    if tipo == 'SAIDA':
+                        consumidos = consumir_lotes(cursor, produto_id, local_id, quantidade)
+                    elif transferencia and consumidos:
+                        criar_lotes(cursor, produto_id, local_id, consumidos)
+                    cursor.execute('''
+                        INSERT INTO movimentacoes
+                            (tipo, quantidade, produto_id, observacao, local_id, criado_em, custo_unitario,
+                             transferencia)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (tipo, quantidade, produto_id, f"[{terminal}] {observacao or ''}".strip(), local_id, criado_em,
+                          custo_unitario, transferencia))
+                    cursor.execute(
+                        "UPDATE sincronizacao_recebidas SET movimentacao_id = ? WHERE terminal = ? AND seq = ?",
+                        (cursor.lastrowid, terminal, seq)
+                    )
+                cursor.execute("RELEASE movimentacao")
+                aplicadas += len(novas)
+            except sqlite3.IntegrityError as e:
+                cursor.execute("ROLLBACK TO movimentacao")
+                cursor.execute("RELEASE movimentacao")
+                cursor.executemany('''
+                    INSERT INTO sincronizacao_conflitos
+                        (terminal, seq, tipo, quantidade, produto_id, local_id, observacao, criado_em, motivo)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(terminal, seq, tipo, quantidade, produto_id, local_id, observacao, criado_em, str(e))
+                      for seq, tipo, quantidade, produto_id, observacao, local_id, criado_em, _, _ in novas])
+                conflitos += len(novas)
+        central.commit()
+    except Exception:
+        central.rollback()
+        raise
+    return aplicadas, conflitos
+
+# Função para enviar ao banco central, em lotes, as movimentações pendentes do terminal.
+# A confirmação no terminal só é gravada depois do commit no central; se a conexão cair no meio,
+# o lote é reenviado e as movimentações já recebidas são ignoradas pelo central.
+def sincronizar(caminho_terminal, caminho_central, terminal, lote=None):
+    lote = lote or SINCRONIZACAO_LOTE
+    resultado = {'enviadas': 0, 'aplicadas': 0, 'conflitos': 0}
+    
+    local = conectar(caminho_terminal, timeout=30)
+    central = conectar(caminho_central, timeout=30)
+    try:
+        criar_schema(central)
+        while True:
+            movimentacoes = local.execute(SQL_PENDENTES, (get_sincronizado_ate(local), lote)).fetchall()
+            if not movimentacoes:
+                break
+            # O lote não separa a saída e a entrada de uma transferência
+            if movimentacoes[-1][1] == 'SAIDA' and movimentacoes[-1][8]:
+                movimentacoes += local.execute(SQL_PENDENTES, (movimentacoes[-1][0], 1)).fetchall()
+            
+            aplicadas, conflitos = receber_lote(central, terminal, movimentacoes)
+            with local:
+                local.execute(
+                    "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('sincronizado_ate', ?)",
+                    (str(movimentacoes[-1][0]),)
+                )
+            resultado['enviadas'] += len(movimentacoes)
+            resultado['aplicadas'] += aplicadas
+            resultado['conflitos'] += conflitos
+    finally:
+        central.close()
+        local.close()
+    return resultado
+
+# Função para preparar o banco de um terminal a partir de uma cópia do banco central (API de backup).
+# As movimentações copiadas já estão no central e ficam marcadas como sincronizadas.
+def provisionar_terminal(caminho_central, caminho_terminal):
+    central = conectar(caminho_central, timeout=30)
+    local = conectar(caminho_terminal)
+    try:
+        central.backup(local)
+        with local:
+            local.execute(
+                "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('sincronizado_ate', "
+                "(SELECT COALESCE(MAX(id), 0) FROM movimentacoes))"
+            )
+    finally:
+        local.close()
+        central.close()
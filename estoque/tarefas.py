@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from estoque.arquivo import arquivar_movimentacoes, expurgar_produtos, get_ultimo_arquivamento, get_ultimo_expurgo
+from estoque.banco import conectar, anexar_arquivo, caminho_relatorio
+from estoque.config import (
+    ARQUIVAMENTO_ESPERA_FALHA_S, CENTRAL_DB_PATH, RELATORIO_INTERVALO_S, SINCRONIZACAO_INTERVALO_S, TERMINAL_NOME
+)
+from estoque.conexao import get_versao_dados, init_database, invalidar_cache_loja
+from estoque.lojas import get_banco_atual
+from estoque.relatorio import atualizar_copia_relatorio
+from estoque.sincronizacao import get_pendentes, sincronizar
+
+
+# Estado compartilhado das tarefas de manutenção executadas em segundo plano, com a hora da última falha
+# de cada comando em cada banco (loja)
+@st.cache_resource
+def get_estado_manutencao():
+    return {'lock': threading.Lock(), 'thread': None, 'comando': None, 'inicio': None, 'fim': None, 'erro': None,
+            'resultado': None, 'falhas': {}}
+
+# Reconstrução dos saldos pelo livro razão (o módulo do razão carrega o pandas, importado só quando o
+# comando é executado, para não pesar na inicialização do aplicativo)
+def _reconstruir_saldos(conn):
+    from estoque.razao import reconstruir_saldos
+    return reconstruir_saldos(conn)
+
+# Comandos de manutenção disponíveis
+COMANDOS_MANUTENCAO = {
+    'ANALYZE': lambda conn: conn.execute('ANALYZE'),
+    'VACUUM': lambda conn: conn.execute('VACUUM'),
+    'PRAGMA optimize': lambda conn: conn.execute('PRAGMA optimize'),
+    'Arquivar movimentações': arquivar_movimentacoes,
+    'Expurgar produtos inativos': expurgar_produtos,
+    'Reconstruir saldos': _reconstruir_saldos,
+}
+
+def _executar_manutencao(estado, comando, caminho):
+    # Conexão própria: a conexão compartilhada das páginas não fica bloqueada
+    try:
+        conn = conectar(caminho, timeout=60)
+        try:
+            anexar_arquivo(conn, caminho)
+            estado['resultado'] = COMANDOS_MANUTENCAO[comando](conn)
+            conn.commit()
+        finally:
+            conn.close()
+        invalidar_cache_loja(caminho)
+    except Exception as e:
+        estado['erro'] = str(e)
+        estado['falhas'][(caminho, comando)] = datetime.now()
+    finally:
+        estado['fim'] = datetime.now()
+
+# Função para iniciar uma tarefa de manutenção em segundo plano (no banco da loja da sessão)
+def iniciar_manutencao(comando):
+    estado = get_estado_manutencao()
+    with estado['lock']:
+        if estado['thread'] is not None and estado['thread'].is_alive():
+            return False
+        estado.update(comando=comando, inicio=datetime.now(), fim=None, erro=None, resultado=None)
+        estado['thread'] = threading.Thread(target=_executar_manutencao, args=(estado, comando, get_banco_atual()), daemon=True)
+        estado['thread'].start()
+    return True
+
+# Função para disparar o arquivamento automático das movimentações e, depois dele, o expurgo dos
+# produtos inativos (cada um no máximo uma vez por dia). A última execução só é gravada quando o comando
+# termina; depois de uma falha, o comando espera ARQUIVAMENTO_ESPERA_FALHA_S antes de nova tentativa.
+def agendar_arquivamento():
+    conn = init_database()
+    agora = datetime.now()
+    falhas = get_estado_manutencao()['falhas']
+    for comando, ultima in (('Arquivar movimentações', get_ultimo_arquivamento(conn)),
+                            ('Expurgar produtos inativos', get_ultimo_expurgo(conn))):
+        if ultima is None or datetime.strptime(ultima, '%Y-%m-%d %H:%M:%S') < agora - timedelta(days=1):
+            falha = falhas.get((get_banco_atual(), comando))
+            if falha is None or (agora - falha).total_seconds() >= ARQUIVAMENTO_ESPERA_FALHA_S:
+                iniciar_manutencao(comando)
+            return
+
+# Estado da atualização da cópia de leitura dos relatórios (independente das tarefas de manutenção), com a
+# versão do banco de cada loja (PRAGMA data_version) em que a última cópia foi feita
+@st.cache_resource
+def get_estado_relatorio():
+    return {'lock': threading.Lock(), 'thread': None, 'erro': None, 'versoes': {}}
+
+def _executar_copia_relatorio(estado, caminho, versao):
+    try:
+        atualizar_copia_relatorio(caminho)
+        estado['versoes'][caminho] = versao
+        estado['erro'] = None
+    except Exception as e:
+        estado['erro'] = str(e)
+
+# Função para disparar a atualização da cópia de leitura quando ela estiver mais velha que o intervalo (ou
+# na hora, com imediata) e o banco da loja tiver mudado desde a última cópia. Sem alterações, a cópia e a
+# versão dos relatórios ficam como estão, e as páginas não refazem as consultas; com a cópia nova, a versão
+# dos relatórios muda e só as consultas da loja são refeitas.
+def agendar_copia_relatorio(imediata=False):
+    caminho = get_banco_atual()
+    destino = caminho_relatorio(caminho)
+    existe = os.path.exists(destino)
+    if not imediata and existe and time.time() - os.path.getmtime(destino) < RELATORIO_INTERVALO_S:
+        return
+    
+    estado = get_estado_relatorio()
+    versao = get_versao_dados()
+    with estado['lock']:
+        if existe and estado['versoes'].get(caminho) == versao:
+            return
+        if estado['thread'] is not None and estado['thread'].is_alive():
+            return
+        estado['thread'] = threading.Thread(target=_executar_copia_relatorio, args=(estado, caminho, versao), daemon=True)
+        estado['thread'].start()
+
+# Estado do envio das movimentações do terminal ao banco central
+@st.cache_resource
+def get_estado_sincronizacao():
+    return {'lock': threading.Lock(), 'thread': None, 'ultima': None, 'resultado': None, 'erro': None}
+
+def _executar_sincronizacao(estado, caminho):
+    try:
+        estado['resultado'] = sincronizar(caminho, CENTRAL_DB_PATH, TERMINAL_NOME)
+        estado['erro'] = None
+    except Exception as e:
+        # Central inacessível: as movimentações continuam na fila local até a próxima tentativa
+        estado['erro'] = str(e)
+    finally:
+        estado['ultima'] = datetime.now()
+
+# Função para disparar o envio ao banco central (modo terminal), no máximo uma vez por intervalo
+def agendar_sincronizacao():
+    if not CENTRAL_DB_PATH:
+        return
+    
+    estado = get_estado_sincronizacao()
+    with estado['lock']:
+        if estado['thread'] is not None and estado['thread'].is_alive():
+            return
+        if estado['ultima'] and (datetime.now() - estado['ultima']).total_seconds() < SINCRONIZACAO_INTERVALO_S:
+            return
+        estado['thread'] = threading.Thread(
+            target=_executar_sincronizacao, args=(estado, get_banco_atual()), daemon=True
+        )
+        estado['thread'].start()
+
+# Função para exibir no menu lateral a fila de envio do terminal ao banco central
+def exibir_status_sincronizacao():
+    if not CENTRAL_DB_PATH:
+        return
+    
+    estado = get_estado_sincronizacao()
+    pendentes = get_pendentes(init_database())
+    st.caption(f"🔄 Terminal {TERMINAL_NOME}: {pendentes} movimentação(ões) na fila")
+    if estado['erro']:
+        st.caption(f"⚠️ Central indisponível ({estado['ultima']:%H:%M:%S}): {estado['erro']}")
+    elif estado['ultima']:
+        conflitos = estado['resultado']['conflitos'] if estado['resultado'] else 0
+        st.caption(f"Última sincronização: {estado['ultima']:%H:%M:%S}" + (f" · {conflitos} conflito(s)" if conflitos else ""))
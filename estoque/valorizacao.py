@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+import pandas as pd
+
+from estoque.consultas import SQL_ESTOQUE_DATA, SQL_PRECOS_PERIODO, SQL_SALDOS_PERIODO
+
+
+# Função para calcular a evolução diária do valor do estoque da loja entre duas datas (inclusive):
+# valor de venda (quantidade x preço vigente) e custo PEPS no fim de cada dia.
+# O estado de cada produto no início vem de uma consulta com as-of join no banco; depois, só os saldos
+# de custo e as mudanças de preço do período são lidos, e cada evento vira a variação do valor do
+# produto (com quantidade e preço propagados por produto), acumulada no tempo.
+def evolucao_valor(conn, inicio, fim):
+    limite_inicio = str(inicio)
+    limite_fim = str(fim + timedelta(days=1))
+    
+    inicial = pd.read_sql_query(SQL_ESTOQUE_DATA, conn, params=(limite_inicio, limite_inicio))
+    inicial['em'] = limite_inicio
+    saldos = pd.read_sql_query(SQL_SALDOS_PERIODO, conn, params=(limite_inicio, limite_fim))
+    precos = pd.read_sql_query(SQL_PRECOS_PERIODO, conn, params=(limite_inicio, limite_fim))
+    
+    eventos = pd.concat([inicial, saldos, precos], ignore_index=True)
+    eventos['em'] = pd.to_datetime(eventos['em'], format='ISO8601')
+    eventos = eventos.sort_values(['produto_id', 'em'], kind='stable')
+    colunas = ['quantidade', 'valor_fifo', 'preco']
+    eventos[colunas] = eventos.groupby('produto_id')[colunas].ffill().fillna(0)
+    eventos['valor_venda'] = eventos['quantidade'] * eventos['preco']
+    
+    # Variação do valor de cada produto a cada evento, somada no tempo
+    valores = ['valor_venda', 'valor_fifo']
+    variacoes = eventos.groupby('produto_id')[valores].diff().fillna(eventos[valores])
+    variacoes.index = eventos['em']
+    dias = pd.date_range(inicio, fim, freq='D')
+    serie = variacoes.sort_index().cumsum().resample('D').last().reindex(dias).ffill().fillna(0)
+    return serie.rename_axis('data').reset_index()
@@ -0,0 +1,98 @@
+import streamlit as st
+
+from estoque.config import CENTRAL_DB_PATH
+from estoque.dados import get_categorias, get_produtos
+from estoque.locais import get_local_operacao, get_nome_local
+from estoque.operacoes import adicionar_produto, dar_entrada_estoque
+
+# Página para adicionar produto
+def adicionar_produto_page():
+    st.markdown('<div class="main-header"><h1>➕ Adicionar Novo Produto</h1></div>', unsafe_allow_html=True)
+    
+    st.caption(f"🏬 O estoque inicial será lançado em: {get_nome_local(get_local_operacao())}")
+    
+    categorias = {categoria_id: nome for categoria_id, nome, _ in get_categorias()}
+    pereciveis = {categoria_id for categoria_id, _, perecivel in get_categorias() if perecivel}
+    
+    # Terminal: os ids dos produtos são gerados pelo banco central (um produto criado no terminal teria um id
+    # que pode já existir no central), então o cadastro fica só no central
+    if CENTRAL_DB_PATH:
+        st.info("🔄 Modo terminal: novos produtos são cadastrados no banco central e chegam ao terminal no "
+                "próximo provisionamento.")
+    else:
+        _formulario_novo_produto(categorias, pereciveis)
+    
+    # Entrada de estoque (novo lote) de um produto já cadastrado
+    df_produtos = get_produtos()
+    if df_produtos.empty:
+        return
+    
+    st.subheader("📥 Entrada de Estoque")
+    produtos = dict(zip(df_produtos['id'].tolist(), df_produtos['nome'].tolist()))
+    categorias_produtos = dict(zip(df_produtos['id'].tolist(), df_produtos['categoria_id'].tolist()))
+    
+    with st.form("entrada_estoque_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            produto_id = st.selectbox("Produto*", list(produtos), format_func=produtos.get)
+            quantidade = st.number_input("Quantidade*", min_value=1, step=1)
+            custo = st.number_input("Custo Unitário (R$)", min_value=0.0, step=0.01, value=None,
+                                    help="Sem custo, a entrada é valorizada pelo custo médio atual "
+                                         "(ou, sem custo médio, pelo preço de venda)")
+        
+        with col2:
+            codigo_lote = st.text_input("Lote", placeholder="Ex: L2024-01")
+            validade = st.date_input("Validade", value=None, format="DD/MM/YYYY")
+        
+        observacao = st.text_input("Observação", placeholder="Ex: Compra do fornecedor")
+        
+        submitted = st.form_submit_button("📥 Registrar Entrada")
+        
+        if submitted:
+            if categorias_produtos[produto_id] in pereciveis and validade is None:
+                st.error("❌ Informe a validade do lote para produtos perecíveis.")
+            elif dar_entrada_estoque(produto_id, quantidade, observacao or 'Entrada de estoque', get_local_operacao(),
+                                     codigo_lote or None, validade, custo):
+                st.success("✅ Entrada registrada com sucesso!")
+                st.cache_data.clear()
+                st.rerun()
+
+# Formulário de cadastro de um novo produto, com o estoque inicial no local de operação
+def _formulario_novo_produto(categorias, pereciveis):
+    with st.form("adicionar_produto_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            nome = st.text_input("Nome do Produto*", placeholder="Ex: Notebook Dell")
+            codigo = st.text_input("Código (SKU/EAN)", placeholder="Ex: 7891234567890")
+            categoria_id = st.selectbox("Categoria*", list(categorias), format_func=categorias.get)
+            preco = st.number_input("Preço Unitário (R$)*", min_value=0.01, step=0.01)
+            custo = st.number_input("Custo Unitário (R$)", min_value=0.0, step=0.01, value=None,
+                                    help="Custo de compra do estoque inicial (valorização PEPS e custo médio)")
+        
+        with col2:
+            quantidade = st.number_input("Quantidade em Estoque*", min_value=0, step=1)
+            estoque_minimo = st.number_input("Estoque Mínimo*", min_value=0, step=1)
+            descricao = st.text_area("Descrição", placeholder="Descrição opcional do produto")
+        
+        # Lote do estoque inicial (perecíveis)
+        col3, col4 = st.columns(2)
+        with col3:
+            codigo_lote = st.text_input("Lote", placeholder="Ex: L2024-01")
+        with col4:
+            validade = st.date_input("Validade", value=None, format="DD/MM/YYYY")
+        
+        submitted = st.form_submit_button("💾 Salvar Produto")
+        
+        if submitted:
+            if categoria_id in pereciveis and quantidade > 0 and validade is None:
+                st.error("❌ Informe a validade do lote para produtos perecíveis.")
+            elif nome and categoria_id and preco > 0:
+                if adicionar_produto(nome, descricao, categoria_id, preco, quantidade, estoque_minimo,
+                                     get_local_operacao(), codigo_lote or None, validade, codigo.strip() or None, custo):
+                    st.success("✅ Produto adicionado com sucesso!")
+                    st.cache_data.clear()
+                    st.rerun()
+            else:
+                st.error("❌ Por favor, preencha todos os campos obrigatórios.")
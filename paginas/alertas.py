@@ -0,0 +1,69 @@
+import streamlit as st
+
+from estoque.config import VALIDADE_ALERTA_DIAS
+from estoque.dados import get_lotes_vencendo, get_produtos, get_resumo_locais, get_estoque_baixo_locais
+from estoque.locais import get_local_atual, get_nome_local
+from paginas.compras import botao_gerar_pedidos
+
+# Página de alertas
+def alertas():
+    st.markdown('<div class="main-header"><h1>🔔 Alertas de Estoque</h1></div>', unsafe_allow_html=True)
+    
+    local_id = get_local_atual()
+    st.caption(f"🏬 {get_nome_local(local_id)}")
+    
+    df_produtos = get_produtos(local_id=local_id)
+    
+    if not df_produtos.empty:
+        # Produtos com estoque baixo
+        produtos_baixo = df_produtos[df_produtos['quantidade'] <= df_produtos['estoque_minimo']]
+        
+        if not produtos_baixo.empty:
+            st.subheader(f"⚠️ Produtos com Estoque Baixo ({len(produtos_baixo)})")
+            
+            for _, produto in produtos_baixo.iterrows():
+                col1, col2, col3 = st.columns([3, 1, 1])
+                
+                with col1:
+                    status_icon = "🔴" if produto['quantidade'] == 0 else "🟡"
+                    st.write(f"{status_icon} **{produto['nome']}** - {produto['categoria']}")
+                
+                with col2:
+                    st.write(f"Estoque: {produto['quantidade']}")
+                
+                with col3:
+                    st.write(f"Mínimo: {produto['estoque_minimo']}")
+            
+            botao_gerar_pedidos()
+        else:
+            st.success("🎉 Nenhum produto com estoque baixo!")
+    else:
+        st.info("Nenhum produto cadastrado ainda.")
+    
+    # Lotes vencendo
+    dias = st.number_input("⏳ Lotes vencendo em até (dias):", min_value=0, value=VALIDADE_ALERTA_DIAS, step=1)
+    df_vencendo = get_lotes_vencendo(dias, local_id)
+    if not df_vencendo.empty:
+        st.subheader(f"⏳ Lotes Vencendo ({len(df_vencendo)})")
+        st.dataframe(
+            df_vencendo,
+            column_config={'validade': st.column_config.DateColumn('validade', format="DD/MM/YYYY")},
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.success(f"🎉 Nenhum lote vencendo nos próximos {dias} dias!")
+    
+    # Alertas por local (todos os locais da loja)
+    if local_id is None:
+        df_locais = get_resumo_locais()
+        if len(df_locais) > 1:
+            st.subheader("🏬 Alertas por Local")
+            st.dataframe(
+                df_locais[['local', 'estoque_baixo', 'esgotados']],
+                use_container_width=True,
+                hide_index=True
+            )
+            df_baixo_locais = get_estoque_baixo_locais()
+            if not df_baixo_locais.empty:
+                st.dataframe(df_baixo_locais, use_container_width=True, hide_index=True)
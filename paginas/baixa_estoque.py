@@ -0,0 +1,102 @@
+import streamlit as st
+
+from estoque.dados import get_lotes_produto, get_produtos
+from estoque.locais import get_local_operacao, get_nome_local
+from estoque.operacoes import dar_baixa_estoque, dar_baixa_por_codigo
+
+# Callback do campo de leitura: o scanner digita o código e envia Enter, e a baixa é aplicada na hora
+def _ler_codigo(local_id):
+    codigo = st.session_state.codigo_leitura.strip()
+    st.session_state.codigo_leitura = ""
+    if not codigo:
+        return
+    
+    quantidade = st.session_state.quantidade_leitura
+    resultado = dar_baixa_por_codigo(codigo, quantidade, local_id)
+    if resultado is None:
+        mensagem = ('error', f"❌ Código {codigo} não encontrado.")
+    else:
+        nome, nova_qtd, estoque_minimo = resultado
+        if nova_qtd is None:
+            mensagem = ('error', f"❌ {nome}: quantidade maior que o estoque. Baixa não realizada.")
+        elif nova_qtd <= estoque_minimo:
+            mensagem = ('warning', f"⚠️ {nome}: -{quantidade} (estoque: {nova_qtd}, abaixo do mínimo)")
+        else:
+            mensagem = ('success', f"✅ {nome}: -{quantidade} (estoque: {nova_qtd})")
+        st.cache_data.clear()
+    
+    # Últimas leituras, da mais recente para a mais antiga
+    st.session_state.leituras = [mensagem] + st.session_state.get('leituras', [])[:9]
+
+# Baixa por leitura de código (SKU/EAN)
+def _baixa_por_leitura(local_id):
+    st.number_input("📦 Quantidade por leitura:", min_value=1, step=1, key="quantidade_leitura")
+    st.text_input(
+        "📷 Código (SKU/EAN):",
+        key="codigo_leitura",
+        on_change=_ler_codigo,
+        args=(local_id,),
+        placeholder="Leia o código de barras ou digite e tecle Enter"
+    )
+    
+    for tipo, mensagem in st.session_state.get('leituras', []):
+        getattr(st, tipo)(mensagem)
+
+# Página de baixa de estoque
+def baixa_estoque():
+    st.markdown('<div class="main-header"><h1>📉 Baixa de Estoque</h1></div>', unsafe_allow_html=True)
+    
+    local_id = get_local_operacao()
+    st.caption(f"🏬 Baixa no local: {get_nome_local(local_id)}")
+    
+    modo = st.radio("Modo:", ["📷 Leitor de código", "🔍 Selecionar produto"], horizontal=True)
+    if modo == "📷 Leitor de código":
+        _baixa_por_leitura(local_id)
+        return
+    
+    df_produtos = get_produtos(local_id=local_id)
+    if df_produtos.empty:
+        st.info("Nenhum produto cadastrado ainda.")
+        return
+
+    df_produtos = df_produtos.set_index("id")
+    produto_id = st.selectbox(
+        "🔍 Selecione um produto:",
+        df_produtos.index.tolist(),
+        format_func=lambda i: df_produtos.at[i, "nome"]
+    )
+    produto = df_produtos.loc[produto_id]
+    produto_id = int(produto_id)
+
+    estoque_atual = int(produto["quantidade"])
+    estoque_minimo = int(produto["estoque_minimo"])
+
+    st.write(f"**Estoque atual:** {estoque_atual} unidades")
+    st.write(f"**Estoque mínimo:** {estoque_minimo} unidades")
+    
+    # Lotes do produto no local, na ordem em que serão consumidos (vence primeiro, sai primeiro)
+    df_lotes = get_lotes_produto(produto_id, local_id)
+    if not df_lotes.empty:
+        st.caption("📦 Lotes (a baixa consome primeiro os que vencem antes)")
+        st.dataframe(df_lotes, use_container_width=True, hide_index=True)
+
+    quantidade_baixa = st.number_input("📦 Quantidade para dar baixa:", min_value=1, step=1)
+    observacao = st.text_area("📝 Observação (opcional):", placeholder="Ex: Venda realizada")
+
+    if st.button("✅ Confirmar Baixa"):
+        if quantidade_baixa > estoque_atual:
+            st.error("❌ Quantidade digitada é maior que o estoque atual. Operação cancelada.")
+            return
+
+        nova_qtd = dar_baixa_estoque(produto_id, quantidade_baixa, observacao, local_id)
+        if nova_qtd is None:
+            st.error("❌ Baixa não realizada: o estoque foi alterado por outra operação.")
+            return
+
+        st.success(f"✅ Baixa realizada! Novo estoque: {nova_qtd} unidades")
+
+        if nova_qtd <= estoque_minimo:
+            st.warning("⚠️ Atenção: Estoque ficou abaixo do mínimo!")
+
+        st.cache_data.clear()
+        st.rerun()
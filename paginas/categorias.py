@@ -0,0 +1,65 @@
+import streamlit as st
+
+from estoque.dados import get_categorias, get_resumo_categorias
+from estoque.operacoes import adicionar_categoria, editar_categoria
+
+# Página de categorias de produtos
+def categorias():
+    st.markdown('<div class="main-header"><h1>🏷️ Categorias</h1></div>', unsafe_allow_html=True)
+    
+    # Resumo por categoria
+    df_categorias = get_resumo_categorias()
+    st.subheader("📋 Estoque por Categoria")
+    st.dataframe(
+        df_categorias[['categoria', 'perecivel', 'produtos', 'unidades', 'valor', 'estoque_baixo']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'categoria': 'Categoria',
+            'perecivel': st.column_config.CheckboxColumn('Perecível'),
+            'produtos': 'Produtos',
+            'unidades': 'Unidades',
+            'valor': st.column_config.NumberColumn('Valor (R$)', format="%.2f"),
+            'estoque_baixo': 'Estoque Baixo',
+        }
+    )
+    
+    # Nova categoria
+    st.subheader("➕ Nova Categoria")
+    with st.form("adicionar_categoria_form", clear_on_submit=True):
+        nome = st.text_input("Nome da Categoria*", placeholder="Ex: Papelaria")
+        perecivel = st.checkbox("Perecível (entradas com lote e validade)")
+        submitted = st.form_submit_button("💾 Salvar Categoria")
+        
+        if submitted:
+            if nome.strip():
+                if adicionar_categoria(nome.strip(), perecivel):
+                    st.success("✅ Categoria adicionada com sucesso!")
+                    st.cache_data.clear()
+                    st.rerun()
+            else:
+                st.error("❌ Por favor, informe o nome da categoria.")
+    
+    # Edição de uma categoria
+    lista = get_categorias()
+    if not lista:
+        return
+    
+    st.subheader("✏️ Editar Categoria")
+    categorias_dict = {categoria_id: (nome, perecivel) for categoria_id, nome, perecivel in lista}
+    categoria_id = st.selectbox("Categoria", list(categorias_dict), format_func=lambda x: categorias_dict[x][0])
+    
+    with st.form("editar_categoria_form"):
+        nome_atual, perecivel_atual = categorias_dict[categoria_id]
+        nome = st.text_input("Nome da Categoria*", value=nome_atual)
+        perecivel = st.checkbox("Perecível (entradas com lote e validade)", value=bool(perecivel_atual))
+        submitted = st.form_submit_button("💾 Salvar Alterações")
+        
+        if submitted:
+            if nome.strip():
+                if editar_categoria(categoria_id, nome.strip(), perecivel):
+                    st.success("✅ Categoria atualizada com sucesso!")
+                    st.cache_data.clear()
+                    st.rerun()
+            else:
+                st.error("❌ Por favor, informe o nome da categoria.")
@@ -0,0 +1,128 @@
+import streamlit as st
+
+from estoque.dados import get_fornecedores, get_itens_pedido, get_pedidos_compra, get_produtos
+from estoque.locais import get_local_atual, get_local_operacao, get_nome_local
+from estoque.operacoes import (
+    adicionar_fornecedor, cancelar_pedido_compra, definir_fornecedor_produtos, gerar_pedidos_estoque_baixo,
+    receber_pedido_compra, salvar_itens_pedido
+)
+
+# Botão que gera os pedidos de compra de todos os produtos com estoque baixo (usado também em Alertas)
+def botao_gerar_pedidos(key='gerar_pedidos'):
+    local_id = get_local_atual()
+    if st.button("🛒 Gerar pedidos de compra do estoque baixo", key=key,
+                 help=f"Um pedido por fornecedor, a receber em {get_nome_local(get_local_operacao())}"):
+        resultado = gerar_pedidos_estoque_baixo(get_local_operacao(), local_id)
+        if resultado is not None:
+            pedidos, itens = resultado
+            if pedidos:
+                st.success(f"✅ {pedidos} pedido(s) em rascunho com {itens} item(ns). Veja na página Compras.")
+                st.cache_data.clear()
+            else:
+                st.info("Nenhum produto com estoque baixo fora de pedidos em rascunho.")
+
+# Página de compras
+def compras():
+    st.markdown('<div class="main-header"><h1>🛒 Compras</h1></div>', unsafe_allow_html=True)
+    
+    st.caption(f"🏬 {get_nome_local(get_local_atual())}")
+    botao_gerar_pedidos()
+    
+    # Pedidos em rascunho
+    df_pedidos = get_pedidos_compra('rascunho')
+    st.subheader(f"📋 Pedidos em Rascunho ({len(df_pedidos)})")
+    
+    for _, pedido in df_pedidos.iterrows():
+        pedido_id = int(pedido['id'])
+        with st.expander(f"Pedido {pedido_id} · {pedido['fornecedor']} · {pedido['itens']} item(ns) · {pedido['local']}"):
+            df_itens = get_itens_pedido(pedido_id)
+            editado = st.data_editor(
+                df_itens,
+                key=f"itens_pedido_{pedido_id}",
+                disabled=['produto_id', 'nome'],
+                column_config={
+                    'produto_id': None,
+                    'perecivel': None,
+                    'nome': "Produto",
+                    'quantidade': st.column_config.NumberColumn("Quantidade", min_value=0, step=1),
+                    'custo_unitario': st.column_config.NumberColumn("Custo Unitário (R$)", min_value=0.0, format="%.2f"),
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            # Lote e validade de cada item perecível, pedidos no recebimento
+            lotes = {}
+            pereciveis = df_itens[df_itens['perecivel'].astype(bool) & (df_itens['quantidade'] > 0)]
+            if not pereciveis.empty:
+                st.caption("🗓️ Itens perecíveis: informe o lote e a validade para receber o pedido")
+            for produto_id, nome in zip(pereciveis['produto_id'].tolist(), pereciveis['nome'].tolist()):
+                col_lote, col_validade = st.columns(2)
+                with col_lote:
+                    codigo_lote = st.text_input(f"Lote · {nome}", key=f"lote_pedido_{pedido_id}_{produto_id}")
+                with col_validade:
+                    validade = st.date_input(f"Validade · {nome}*", value=None, format="DD/MM/YYYY",
+                                             key=f"validade_pedido_{pedido_id}_{produto_id}")
+                lotes[produto_id] = (codigo_lote or None, validade)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("💾 Salvar itens", key=f"salvar_pedido_{pedido_id}"):
+                    itens = editado[['produto_id', 'quantidade', 'custo_unitario']].astype(object)
+                    itens = itens.where(itens.notna(), None).itertuples(index=False, name=None)
+                    if salvar_itens_pedido(pedido_id, list(itens)):
+                        st.success("✅ Pedido atualizado!")
+                        st.cache_data.clear()
+                        st.rerun()
+            with col2:
+                if st.button("📥 Receber pedido", key=f"receber_pedido_{pedido_id}", type="primary"):
+                    entradas = receber_pedido_compra(pedido_id, lotes)
+                    if entradas is not None:
+                        st.success(f"✅ Pedido recebido: {entradas} entrada(s) registrada(s).")
+                        st.cache_data.clear()
+                        st.rerun()
+            with col3:
+                if st.button("🗑️ Cancelar pedido", key=f"cancelar_pedido_{pedido_id}"):
+                    if cancelar_pedido_compra(pedido_id):
+                        st.success("✅ Pedido cancelado!")
+                        st.cache_data.clear()
+                        st.rerun()
+    
+    # Pedidos recebidos
+    df_recebidos = get_pedidos_compra('recebido')
+    if not df_recebidos.empty:
+        st.subheader("📦 Pedidos Recebidos")
+        st.dataframe(
+            df_recebidos[['id', 'fornecedor', 'local', 'recebido_em', 'itens', 'unidades', 'valor']],
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    # Fornecedores
+    st.subheader("🏭 Fornecedores")
+    with st.form("adicionar_fornecedor_form", clear_on_submit=True):
+        nome = st.text_input("Nome do Fornecedor*")
+        if st.form_submit_button("💾 Salvar Fornecedor"):
+            if nome:
+                if adicionar_fornecedor(nome):
+                    st.success("✅ Fornecedor adicionado com sucesso!")
+                    st.cache_data.clear()
+                    st.rerun()
+            else:
+                st.error("❌ Por favor, informe o nome do fornecedor.")
+    
+    fornecedores = dict(get_fornecedores())
+    df_produtos = get_produtos()
+    if not fornecedores or df_produtos.empty:
+        return
+    
+    with st.form("definir_fornecedor_form", clear_on_submit=True):
+        produtos = dict(zip(df_produtos['id'].tolist(), df_produtos['nome'].tolist()))
+        fornecedor_id = st.selectbox("Fornecedor*", list(fornecedores), format_func=fornecedores.get)
+        produtos_ids = st.multiselect("Produtos*", list(produtos), format_func=produtos.get)
+        if st.form_submit_button("🔗 Definir fornecedor dos produtos"):
+            if not produtos_ids:
+                st.error("❌ Selecione ao menos um produto.")
+            elif definir_fornecedor_produtos(fornecedor_id, produtos_ids):
+                st.success(f"✅ Fornecedor definido para {len(produtos_ids)} produto(s)!")
+                st.cache_data.clear()
@@ -0,0 +1,72 @@
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+from estoque.abc import resumir_abc
+from estoque.config import ABC_LIMITES
+from estoque.conexao import get_versao_dados
+from estoque.dados import get_curva_abc, get_data_relatorio
+from estoque.locais import get_local_atual, get_nome_local
+
+# Pontos da curva de Pareto desenhados no gráfico (a curva é amostrada em catálogos grandes)
+PONTOS_GRAFICO = 1000
+
+# Página da curva ABC (Pareto)
+def curva_abc():
+    st.markdown('<div class="main-header"><h1>📈 Curva ABC</h1></div>', unsafe_allow_html=True)
+    
+    local_id = get_local_atual()
+    versao = get_versao_dados(relatorio=True)
+    st.caption(f"🏬 {get_nome_local(local_id)} · 🕒 Dados de {get_data_relatorio() or 'agora (tempo real)'}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        criterio = st.radio(
+            "Classificar por:", ['valor', 'saidas'], horizontal=True,
+            format_func=lambda c: "💰 Valor em estoque" if c == 'valor' else "📤 Volume de saídas"
+        )
+    with col2:
+        dias = st.selectbox("Período das saídas (dias):", [30, 90, 180, 365], index=1, disabled=criterio == 'valor')
+    
+    df = get_curva_abc(criterio, dias, local_id, versao=versao)
+    if df.empty or df['valor'].sum() <= 0:
+        st.info("Nenhum valor em estoque ou saída no período para classificar.")
+        return
+    
+    # Resumo por classe
+    resumo = resumir_abc(df)
+    colunas = st.columns(len(resumo))
+    for coluna, (_, classe) in zip(colunas, resumo.iterrows()):
+        coluna.metric(
+            f"Classe {classe['classe']}",
+            f"{classe['itens']:,} itens ({classe['% itens']:.1f}%)",
+            f"{classe['% valor']:.1f}% do {'valor' if criterio == 'valor' else 'volume'}",
+            delta_color="off"
+        )
+    
+    # Curva de Pareto: participação acumulada x percentual dos itens
+    pontos = np.unique(np.linspace(0, len(df) - 1, min(len(df), PONTOS_GRAFICO)).astype('int64'))
+    curva = df.iloc[pontos][['nome', 'acumulado', 'classe']].assign(itens=(pontos + 1) / len(df) * 100)
+    fig = px.area(
+        curva, x='itens', y='acumulado', color='classe', hover_name='nome',
+        color_discrete_map={'A': '#1f4e79', 'B': '#FFD93D', 'C': '#FF6B6B'},
+        labels={'itens': '% dos itens', 'acumulado': '% acumulado'},
+        title="Curva de Pareto"
+    )
+    for limite in ABC_LIMITES:
+        fig.add_hline(y=limite * 100, line_dash='dot', line_color='gray')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Itens da classe escolhida
+    classe = st.selectbox("Mostrar itens da classe:", ['A', 'B', 'C'])
+    itens = df[df['classe'] == classe]
+    st.subheader(f"📋 Classe {classe}: {len(itens):,} itens")
+    st.dataframe(
+        itens[['nome', 'categoria', 'valor', 'acumulado']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'valor': st.column_config.NumberColumn("Valor" if criterio == 'valor' else "Saídas", format="%.2f"),
+            'acumulado': st.column_config.NumberColumn("% acumulado", format="%.1f%%"),
+        }
+    )
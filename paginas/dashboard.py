@@ -0,0 +1,188 @@
+import plotly.express as px
+import streamlit as st
+
+from estoque.config import DASHBOARD_INTERVALO_S
+from estoque.conexao import get_versao_dados
+from estoque.dados import (
+    get_data_relatorio, get_produtos, get_estatisticas, get_resumo_locais, get_valor_custo, get_valor_venda,
+    get_evolucao_valor
+)
+from estoque.locais import get_local_atual, get_nome_local
+from estoque.lojas import get_lojas
+from estoque.rede import get_estatisticas_rede
+from estoque.tarefas import agendar_copia_relatorio
+
+# Atualização automática: a cada intervalo, uma alteração no banco da loja (PRAGMA data_version) refaz a
+# cópia de leitura na hora, sem esperar o intervalo das cópias; quando a cópia nova fica pronta, a versão
+# dos relatórios muda e a página é executada de novo, refazendo as consultas
+@st.fragment(run_every=DASHBOARD_INTERVALO_S)
+def _verificar_alteracoes(versao):
+    agendar_copia_relatorio(imediata=True)
+    if get_versao_dados(relatorio=True) != versao:
+        st.rerun()
+
+# Página principal (Dashboard)
+def dashboard():
+    st.markdown('<div class="main-header"><h1>📦 Estoque Fácil - Dashboard</h1></div>', unsafe_allow_html=True)
+    
+    local_id = get_local_atual()
+    versao = get_versao_dados(relatorio=True)
+    data_relatorio = get_data_relatorio()
+    st.caption(f"🏬 {get_nome_local(local_id)} · 🕒 Dados de {data_relatorio or 'agora (tempo real)'}")
+    
+    if st.toggle("🔄 Atualização automática", key='dashboard_automatico',
+                 help=f"Verifica a cada {DASHBOARD_INTERVALO_S} s se os dados mudaram e só então atualiza a página "
+                      f"(as alterações aparecem em até {2 * DASHBOARD_INTERVALO_S} s)"):
+        _verificar_alteracoes(versao)
+    
+    # Obter estatísticas (da cópia de leitura dos relatórios)
+    stats = get_estatisticas(local_id, relatorio=True, versao=versao)
+    
+    # Métricas principais
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="Total de Produtos",
+            value=stats['total_produtos'],
+            delta=None
+        )
+    
+    with col2:
+        st.metric(
+            label="Estoque Baixo",
+            value=stats['produtos_baixo_estoque'],
+            delta=None
+        )
+    
+    with col3:
+        st.metric(
+            label="Valor Total",
+            value=f"R$ {stats['valor_total']:,.2f}",
+            delta=None
+        )
+    
+    with col4:
+        st.metric(
+            label="Produtos Esgotados",
+            value=stats['produtos_esgotados'],
+            delta=None
+        )
+    
+    # Valor de custo do estoque da loja (PEPS e custo médio), atual ou em uma data
+    if local_id is None:
+        col1, col2, col3, col4 = st.columns(4)
+        with col4:
+            data_custo = st.date_input("Valores do estoque em:", value=None, format="DD/MM/YYYY",
+                                       help="Vazio = valores atuais")
+        custo = get_valor_custo(data_custo, relatorio=True, versao=versao)
+        col1.metric("Custo do Estoque (PEPS)", f"R$ {custo['valor_fifo']:,.2f}")
+        col2.metric("Custo do Estoque (Custo Médio)", f"R$ {custo['valor_medio']:,.2f}")
+        if data_custo:
+            valor_venda = get_valor_venda(data_custo, relatorio=True, versao=versao)
+            col3.metric("Valor de Venda na Data", f"R$ {valor_venda:,.2f}")
+    
+    # Alertas
+    if stats['produtos_baixo_estoque'] > 0:
+        st.markdown(f'''
+        <div class="alert-low">
+            <strong>⚠️ Atenção!</strong> Você tem {stats['produtos_baixo_estoque']} produto(s) com estoque baixo.
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    if stats['produtos_esgotados'] > 0:
+        st.markdown(f'''
+        <div class="alert-danger">
+            <strong>🚨 Alerta!</strong> Você tem {stats['produtos_esgotados']} produto(s) esgotado(s).
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    # Visão da rede de lojas (consulta todas as lojas em paralelo)
+    if len(get_lojas()) > 1:
+        df_lojas, totais = get_estatisticas_rede()
+        st.subheader(f"🏪 Rede de Lojas ({len(df_lojas)})")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Total de Produtos", f"{totais['total_produtos']:,.0f}")
+        col2.metric("Estoque Baixo", f"{totais['produtos_baixo_estoque']:,.0f}")
+        col3.metric("Valor Total", f"R$ {totais['valor_total']:,.2f}")
+        col4.metric("Produtos Esgotados", f"{totais['produtos_esgotados']:,.0f}")
+        
+        fig_lojas = px.bar(df_lojas, x='loja', y='valor_total', title="Valor em Estoque por Loja")
+        st.plotly_chart(fig_lojas, use_container_width=True)
+        
+        falhas = df_lojas[df_lojas['erro'].notna()]
+        if not falhas.empty:
+            st.warning(f"⚠️ Lojas sem resposta: {', '.join(falhas['loja'])}")
+        st.dataframe(df_lojas.drop(columns='erro'), use_container_width=True, hide_index=True)
+    
+    # Estoque por local (todos os locais da loja)
+    if local_id is None:
+        df_locais = get_resumo_locais(relatorio=True, versao=versao)
+        if len(df_locais) > 1:
+            st.subheader("🏬 Estoque por Local")
+            st.dataframe(
+                df_locais[['local', 'produtos', 'unidades', 'valor', 'estoque_baixo', 'esgotados']],
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    # Evolução do valor do estoque da loja (preço vigente em cada dia e custo PEPS)
+    if local_id is None:
+        st.subheader("📈 Evolução do Valor do Estoque")
+        dias = st.selectbox("Período:", [30, 90, 365], format_func=lambda d: f"Últimos {d} dias")
+        df_evolucao = get_evolucao_valor(dias, relatorio=True, versao=versao)
+        fig_evolucao = px.line(
+            df_evolucao, x='data', y=['valor_venda', 'valor_fifo'],
+            labels={'data': 'Data', 'value': 'R$', 'variable': ''},
+            title="Valor de Venda x Custo (PEPS)"
+        )
+        nomes = {'valor_venda': 'Valor de venda', 'valor_fifo': 'Custo (PEPS)'}
+        fig_evolucao.for_each_trace(lambda trace: trace.update(name=nomes[trace.name]))
+        st.plotly_chart(fig_evolucao, use_container_width=True)
+    
+    # Gráficos
+    df_produtos = get_produtos(local_id=local_id, relatorio=True, versao=versao)
+    
+    if not df_produtos.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📊 Produtos por Categoria")
+            categoria_count = df_produtos['categoria'].value_counts()
+            fig_categoria = px.pie(
+                values=categoria_count.values,
+                names=categoria_count.index,
+                title="Distribuição por Categoria"
+            )
+            st.plotly_chart(fig_categoria, use_container_width=True)
+        
+        with col2:
+            st.subheader("📈 Status do Estoque")
+            df_produtos['status'] = df_produtos.apply(lambda row: 
+                'Esgotado' if row['quantidade'] == 0 
+                else 'Baixo' if row['quantidade'] <= row['estoque_minimo']
+                else 'Normal', axis=1)
+            
+            status_count = df_produtos['status'].value_counts()
+            colors = {'Esgotado': '#FF6B6B', 'Baixo': '#FFD93D', 'Normal': '#6BCF7F'}
+            
+            fig_status = px.bar(
+                x=status_count.index,
+                y=status_count.values,
+                color=status_count.index,
+                color_discrete_map=colors,
+                title="Status do Estoque"
+            )
+            st.plotly_chart(fig_status, use_container_width=True)
+        
+        # Tabela de produtos com estoque baixo
+        st.subheader("🔔 Produtos com Estoque Baixo")
+        produtos_baixo = df_produtos[df_produtos['quantidade'] <= df_produtos['estoque_minimo']]
+        
+        if not produtos_baixo.empty:
+            st.dataframe(
+                produtos_baixo[['nome', 'categoria', 'quantidade', 'estoque_minimo', 'preco']],
+                use_container_width=True
+            )
+        else:
+            st.success("🎉 Nenhum produto com estoque baixo!")
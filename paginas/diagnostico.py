@@ -0,0 +1,155 @@
+import streamlit as st
+
+from estoque.config import (
+    ARQUIVO_HORIZONTE_DIAS, ORCAMENTO_INICIALIZACAO_MS, ORCAMENTO_EXECUCAO_MS
+)
+from estoque.banco import caminho_arquivo
+from estoque.consultas import CONSULTAS_APP
+from estoque.dados import (
+    get_info_paginas, get_estatisticas_tabelas, get_plano_consulta, get_info_arquivo, get_uso_memoria_produtos,
+    get_sincronizacao_terminais, get_conflitos_sincronizacao
+)
+from estoque.desempenho import get_tempos_execucao
+from estoque.lojas import get_banco_atual
+from estoque.operacoes import conciliar_livro_razao, conferir_livro_razao
+from estoque.tarefas import COMANDOS_MANUTENCAO, get_estado_manutencao, iniciar_manutencao
+
+# Página de diagnóstico do banco de dados
+def diagnostico():
+    st.markdown('<div class="main-header"><h1>🩺 Diagnóstico do Banco de Dados</h1></div>', unsafe_allow_html=True)
+    
+    # Uso de páginas e fragmentação
+    info = get_info_paginas()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tamanho do Arquivo", f"{info['tamanho_bytes'] / 1024:,.0f} KB")
+    col2.metric("Páginas", info['page_count'])
+    col3.metric("Páginas Livres", info['freelist_count'])
+    col4.metric("Fragmentação", f"{info['fragmentacao']:.1f}%")
+    
+    # Tabelas e índices
+    df_tabelas, df_indices, df_stat = get_estatisticas_tabelas()
+    
+    st.subheader("🗃️ Tabelas")
+    st.dataframe(df_tabelas, use_container_width=True)
+    
+    st.subheader("🗂️ Índices")
+    if not df_indices.empty:
+        st.dataframe(df_indices, use_container_width=True)
+    else:
+        st.info("Nenhum índice encontrado.")
+    
+    if not df_stat.empty:
+        st.caption("Estatísticas do ANALYZE (sqlite_stat1)")
+        st.dataframe(df_stat, use_container_width=True)
+    
+    # Memória do DataFrame de produtos em cache
+    st.subheader("💾 Memória do Cache de Produtos")
+    df_memoria = get_uso_memoria_produtos()
+    total_compacto = df_memoria['compacto'].sum()
+    total_original = df_memoria['sem_conversao'].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Em cache", f"{total_compacto / 1024:,.1f} KB")
+    col2.metric("Sem conversão de tipos", f"{total_original / 1024:,.1f} KB")
+    col3.metric("Redução", f"{total_original / total_compacto:.1f}x" if total_compacto else "-")
+    with st.expander("Uso de memória por coluna (bytes)"):
+        st.dataframe(df_memoria, use_container_width=True)
+    
+    # Planos de execução
+    st.subheader("🔎 Planos de Execução das Consultas")
+    for nome, (sql, params) in CONSULTAS_APP.items():
+        plano = get_plano_consulta(sql, params)
+        varredura = (plano['detail'].str.startswith('SCAN') & ~plano['detail'].str.contains('USING')).any()
+        icone = "🟡" if varredura else "🟢"
+        with st.expander(f"{icone} {nome}"):
+            st.code(sql.strip(), language="sql")
+            st.dataframe(plano, use_container_width=True)
+    
+    # Arquivo morto das movimentações
+    st.subheader("🗄️ Arquivo de Movimentações")
+    df_particoes, ultima_execucao = get_info_arquivo()
+    st.caption(f"Movimentações com mais de {ARQUIVO_HORIZONTE_DIAS} dias são movidas para tabelas mensais em "
+               f"`{caminho_arquivo(get_banco_atual())}`. Último arquivamento: {ultima_execucao or 'nunca'}")
+    if not df_particoes.empty:
+        st.dataframe(df_particoes, use_container_width=True)
+    
+    # Movimentações recebidas dos terminais (banco central)
+    df_terminais = get_sincronizacao_terminais()
+    if not df_terminais.empty:
+        st.subheader("🔄 Sincronização dos Terminais")
+        st.dataframe(df_terminais, use_container_width=True, hide_index=True)
+        df_conflitos = get_conflitos_sincronizacao()
+        if not df_conflitos.empty:
+            st.warning(f"⚠️ {len(df_conflitos)} movimentação(ões) recebida(s) sem aplicar (saldo insuficiente no banco central)")
+            st.dataframe(df_conflitos, use_container_width=True, hide_index=True)
+    
+    # Conferência dos saldos com o livro razão (somente as movimentações novas desde a última conferência)
+    st.subheader("📒 Conferência do Livro Razão")
+    if st.button("🔍 Conferir saldos"):
+        st.session_state.conferencia_razao = conferir_livro_razao()
+    
+    conferencia = st.session_state.get('conferencia_razao')
+    if conferencia:
+        divergencias, lidas = conferencia
+        col1, col2 = st.columns(2)
+        col1.metric("Movimentações conferidas", lidas)
+        col2.metric("Saldos divergentes", len(divergencias))
+        if divergencias.empty:
+            st.success("✅ Todos os saldos conferem com o livro razão.")
+        else:
+            st.dataframe(divergencias, use_container_width=True, hide_index=True)
+            st.caption("Linhas sem local comparam o total do produto com o razão. Os ajustes de conciliação "
+                       "registram a diferença no razão sem alterar o saldo dos locais, e refazem o total do produto "
+                       "pela soma dos locais. Para corrigir os saldos a partir do razão, use \"Reconstruir saldos\" "
+                       "na manutenção.")
+            if st.button("🧾 Registrar ajustes de conciliação"):
+                incluidas = conciliar_livro_razao(divergencias)
+                if incluidas is not None:
+                    st.session_state.conferencia_razao = None
+                    st.cache_data.clear()
+                    st.success(f"✅ {incluidas} ajustes de conciliação registrados.")
+    
+    # Manutenção em segundo plano
+    st.subheader("🧹 Manutenção")
+    estado = get_estado_manutencao()
+    em_execucao = estado['thread'] is not None and estado['thread'].is_alive()
+    
+    cols = st.columns(len(COMANDOS_MANUTENCAO))
+    for col, comando in zip(cols, COMANDOS_MANUTENCAO):
+        with col:
+            if st.button(f"▶️ {comando}", disabled=em_execucao):
+                if iniciar_manutencao(comando):
+                    st.rerun()
+                else:
+                    st.warning("⚠️ Já existe uma tarefa de manutenção em execução.")
+    
+    if em_execucao:
+        st.info(f"⏳ {estado['comando']} em execução desde {estado['inicio']:%H:%M:%S}...")
+        if st.button("🔄 Atualizar"):
+            st.rerun()
+    elif estado['comando']:
+        if estado['erro']:
+            st.error(f"Erro ao executar {estado['comando']}: {estado['erro']}")
+        else:
+            duracao = (estado['fim'] - estado['inicio']).total_seconds()
+            linhas = f", {estado['resultado']} linhas" if isinstance(estado['resultado'], int) else ""
+            st.success(f"✅ {estado['comando']} concluído às {estado['fim']:%H:%M:%S} ({duracao:.1f}s{linhas})")
+    
+    # Tempos de execução do script
+    st.subheader("⏱️ Tempos de Execução")
+    tempos = get_tempos_execucao()
+    inicializacao = tempos['inicializacao']
+    col1, col2 = st.columns(2)
+    if inicializacao:
+        col1.metric(
+            f"Primeira execução ({inicializacao['pagina']})",
+            f"{inicializacao['ms']:.0f} ms",
+            help=f"Orçamento: {ORCAMENTO_INICIALIZACAO_MS} ms"
+        )
+    execucoes = list(tempos['execucoes'])
+    if execucoes:
+        col2.metric(
+            "Última execução",
+            f"{execucoes[-1]['ms']:.0f} ms",
+            help=f"Orçamento: {ORCAMENTO_EXECUCAO_MS} ms"
+        )
+        st.dataframe(execucoes[::-1], use_container_width=True)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from estoque.conexao import get_versao_dados
+from estoque.dados import get_data_relatorio, get_movimentacoes
+from estoque.locais import get_local_atual, get_nome_local
+
+# Página de histórico
+def historico():
+    st.markdown('<div class="main-header"><h1>📚 Histórico de Movimentações</h1></div>', unsafe_allow_html=True)
+    
+    versao = get_versao_dados(relatorio=True)
+    st.caption(f"🕒 Dados de {get_data_relatorio() or 'agora (tempo real)'}")
+    
+    # Período (consulta o arquivo morto somente quando o intervalo alcança meses arquivados)
+    filtrar_periodo = st.checkbox("📅 Filtrar por período")
+    if filtrar_periodo:
+        periodo = st.date_input(
+            "Período:",
+            value=(datetime.now().date() - timedelta(days=30), datetime.now().date())
+        )
+        if len(periodo) != 2:
+            st.info("Selecione a data inicial e a data final.")
+            return
+        df_movimentacoes = get_movimentacoes(data_inicio=periodo[0], data_fim=periodo[1], relatorio=True,
+                                             versao=versao)
+    else:
+        df_movimentacoes = get_movimentacoes(relatorio=True, versao=versao)
+    
+    if not df_movimentacoes.empty:
+        # Filtros
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            produtos_lista = df_movimentacoes['produto_nome'].unique()
+            filtro_produto = st.selectbox("Filtrar por produto:", ['Todos'] + list(produtos_lista))
+        
+        with col2:
+            filtro_tipo = st.selectbox("Tipo de movimentação:", ['Todos', 'ENTRADA', 'SAIDA'])
+        
+        # Aplicar filtros
+        df_filtrado = df_movimentacoes.copy()
+        
+        if filtro_produto != 'Todos':
+            df_filtrado = df_filtrado[df_filtrado['produto_nome'] == filtro_produto]
+        
+        if filtro_tipo != 'Todos':
+            df_filtrado = df_filtrado[df_filtrado['tipo'] == filtro_tipo]
+        
+        local_id = get_local_atual()
+        if local_id:
+            df_filtrado = df_filtrado[df_filtrado['local_id'] == local_id]
+        
+        # Mostrar movimentações
+        st.subheader(f"📋 Movimentações: {len(df_filtrado)}")
+        
+        for _, mov in df_filtrado.iterrows():
+            col1, col2, col3, col4 = st.columns([3, 1, 1, 2])
+            
+            with col1:
+                st.write(f"**{mov['produto_nome']}**")
+                st.caption(f"🏬 {get_nome_local(mov['local_id'])}")
+            
+            with col2:
+                icon = "📥" if mov['tipo'] == 'ENTRADA' else "📤"
+                st.write(f"{icon} {mov['tipo']}")
+            
+            with col3:
+                st.write(f"Qtd: {mov['quantidade']}")
+            
+            with col4:
+                st.write(f"{mov['criado_em'][:16]}")
+            
+            if mov['observacao']:
+                st.caption(f"📝 {mov['observacao']}")
+            
+            st.divider()
+    else:
+        st.info("Nenhuma movimentação registrada ainda.")
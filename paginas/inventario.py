@@ -0,0 +1,77 @@
+import pandas as pd
+import streamlit as st
+
+from estoque.dados import get_produtos
+from estoque.locais import get_local_operacao, get_nome_local
+from estoque.operacoes import aplicar_inventario_local, conferir_inventario
+
+# Página de inventário (contagem do estoque de um local e ajuste em lote)
+def inventario():
+    st.markdown('<div class="main-header"><h1>📋 Inventário</h1></div>', unsafe_allow_html=True)
+    
+    local_id = get_local_operacao()
+    st.caption(f"🏬 Contagem do local: {get_nome_local(local_id)}")
+    
+    origem = st.radio("Contagem:", ["📝 Digitar na grade", "📄 Enviar planilha (CSV)"], horizontal=True)
+    df_produtos = get_produtos(local_id=local_id)
+    df_contagem = None
+    
+    if origem == "📝 Digitar na grade":
+        # Contagem cíclica: só as categorias escolhidas (vazio = todas)
+        categorias = st.multiselect("Categorias a contar:", sorted(df_produtos['categoria'].dropna().unique()))
+        if categorias:
+            df_produtos = df_produtos[df_produtos['categoria'].isin(categorias)]
+        
+        grade = df_produtos[['id', 'codigo', 'nome', 'quantidade']].assign(contado=pd.NA).astype({'contado': 'Int64'})
+        editado = st.data_editor(
+            grade,
+            key=f"grade_inventario_{local_id}",
+            disabled=['id', 'codigo', 'nome', 'quantidade'],
+            column_config={
+                'id': None,
+                'codigo': "Código",
+                'nome': "Produto",
+                'quantidade': "Sistema",
+                'contado': st.column_config.NumberColumn("Contado", min_value=0, step=1),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+        df_contagem = editado[['id', 'contado']]
+    else:
+        st.caption("Colunas: `codigo` (ou `produto_id`) e `contado` (ou `quantidade`). Produtos fora da planilha não são alterados.")
+        arquivo = st.file_uploader("Planilha da contagem", type=['csv'])
+        if arquivo is not None:
+            df_contagem = pd.read_csv(arquivo, sep=None, engine='python', dtype={'codigo': str})
+    
+    if df_contagem is not None and st.button("🔍 Conferir contagem"):
+        resultado = conferir_inventario(df_contagem, local_id)
+        st.session_state.inventario = (local_id, *resultado) if resultado else None
+    
+    # Diferenças da última conferência (do local atual)
+    conferencia = st.session_state.get('inventario')
+    if not conferencia or conferencia[0] != local_id:
+        return
+    _, contagem, diferencas = conferencia
+    
+    st.subheader(f"🔍 Diferenças: {len(diferencas)} de {len(contagem)} produto(s) contado(s)")
+    if diferencas.empty:
+        st.success("🎉 A contagem confere com o sistema!")
+        return
+    
+    col1, col2 = st.columns(2)
+    col1.metric("Sobras", f"{diferencas.loc[diferencas['diferenca'] > 0, 'diferenca'].sum():,}")
+    col2.metric("Faltas", f"{-diferencas.loc[diferencas['diferenca'] < 0, 'diferenca'].sum():,}")
+    nomes = get_produtos().set_index('id')['nome']
+    st.dataframe(
+        diferencas.assign(produto=diferencas['produto_id'].map(nomes))[['produto', 'sistema', 'contado', 'diferenca']],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    if st.button(f"✅ Aplicar {len(diferencas)} ajuste(s)", type="primary"):
+        aplicadas = aplicar_inventario_local(contagem, local_id)
+        if aplicadas is not None:
+            st.session_state.inventario = None
+            st.success(f"✅ Inventário aplicado: {len(aplicadas)} ajuste(s) registrado(s).")
+            st.cache_data.clear()
@@ -0,0 +1,62 @@
+import streamlit as st
+
+from estoque.dados import get_produtos, get_resumo_locais
+from estoque.locais import get_locais
+from estoque.operacoes import adicionar_local, transferir_estoque
+
+# Página de locais de estoque
+def locais():
+    st.markdown('<div class="main-header"><h1>🏬 Locais de Estoque</h1></div>', unsafe_allow_html=True)
+    
+    # Resumo por local
+    df_locais = get_resumo_locais()
+    st.subheader("📋 Estoque por Local")
+    st.dataframe(
+        df_locais[['local', 'produtos', 'unidades', 'valor', 'estoque_baixo', 'esgotados']],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # Novo local
+    st.subheader("➕ Novo Local")
+    with st.form("adicionar_local_form", clear_on_submit=True):
+        nome = st.text_input("Nome do Local*", placeholder="Ex: Depósito Centro")
+        submitted = st.form_submit_button("💾 Salvar Local")
+        
+        if submitted:
+            if nome:
+                if adicionar_local(nome):
+                    st.success("✅ Local adicionado com sucesso!")
+                    st.cache_data.clear()
+                    st.rerun()
+            else:
+                st.error("❌ Por favor, informe o nome do local.")
+    
+    # Transferência entre locais
+    locais_dict = dict(get_locais())
+    if len(locais_dict) < 2:
+        return
+    
+    st.subheader("🔁 Transferência entre Locais")
+    
+    # A origem fica fora do formulário: dentro dele, trocar a origem não recarregaria a lista de produtos
+    local_origem = st.selectbox("Origem*", list(locais_dict), format_func=locais_dict.get,
+                                key="transferencia_origem")
+    df_origem = get_produtos(local_id=local_origem)
+    produtos_origem = dict(zip(df_origem['id'].tolist(), df_origem['nome'].tolist()))
+    destinos = [local_id for local_id in locais_dict if local_id != local_origem]
+    
+    with st.form("transferir_estoque_form"):
+        local_destino = st.selectbox("Destino*", destinos, format_func=locais_dict.get)
+        produto_id = st.selectbox("Produto*", list(produtos_origem), format_func=produtos_origem.get)
+        quantidade = st.number_input("Quantidade*", min_value=1, step=1)
+        
+        submitted = st.form_submit_button("🔁 Transferir")
+        
+        if submitted:
+            if produto_id is None:
+                st.error("❌ Não há produtos no local de origem.")
+            elif transferir_estoque(produto_id, quantidade, local_origem, local_destino):
+                st.success("✅ Transferência realizada com sucesso!")
+                st.cache_data.clear()
+                st.rerun()
@@ -0,0 +1,205 @@
+import streamlit as st
+
+from estoque.dados import get_categorias, get_produto_edicao, get_produtos
+from estoque.locais import get_local_atual, get_local_operacao, get_nome_local
+from estoque.operacoes import (
+    alterar_categoria_produtos, definir_minimo_produtos, editar_produto, reajustar_preco_produtos,
+    remover_produtos_selecionados
+)
+
+# Página de produtos
+def produtos():
+    st.markdown('<div class="main-header"><h1>📦 Gerenciar Produtos</h1></div>', unsafe_allow_html=True)
+    
+    categorias = {categoria_id: nome for categoria_id, nome, _ in get_categorias()}
+    
+    # Filtros
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        filtro_nome = st.text_input("🔍 Buscar por nome ou código:")
+    
+    with col2:
+        filtro_categoria = st.selectbox("📂 Categoria:", [None, *categorias],
+                                        format_func=lambda x: 'Todos' if x is None else categorias[x])
+    
+    with col3:
+        filtro_status = st.selectbox("📊 Status:", ['Todos', 'Normal', 'Estoque Baixo', 'Esgotado'])
+    
+    # Obter produtos
+    df_produtos = get_produtos(local_id=get_local_atual())
+    
+    if not df_produtos.empty:
+        # Aplicar filtros
+        if filtro_nome:
+            df_produtos = df_produtos[
+                df_produtos['nome'].str.contains(filtro_nome, case=False, na=False) |
+                (df_produtos['codigo'] == filtro_nome.strip())
+            ]
+        
+        if filtro_categoria is not None:
+            df_produtos = df_produtos[df_produtos['categoria_id'] == filtro_categoria]
+        
+        if filtro_status != 'Todos':
+            if filtro_status == 'Normal':
+                df_produtos = df_produtos[df_produtos['quantidade'] > df_produtos['estoque_minimo']]
+            elif filtro_status == 'Estoque Baixo':
+                df_produtos = df_produtos[
+                    (df_produtos['quantidade'] <= df_produtos['estoque_minimo']) & 
+                    (df_produtos['quantidade'] > 0)
+                ]
+            elif filtro_status == 'Esgotado':
+                df_produtos = df_produtos[df_produtos['quantidade'] == 0]
+        
+        # Adicionar status e formatação
+        df_produtos['status'] = df_produtos.apply(lambda row: 
+            '🔴 Esgotado' if row['quantidade'] == 0 
+            else '🟡 Baixo' if row['quantidade'] <= row['estoque_minimo']
+            else '🟢 Normal', axis=1)
+        
+        df_produtos['preco_formatado'] = df_produtos['preco'].apply(lambda x: f"R$ {x:,.2f}")
+        
+        # Mostrar produtos
+        st.subheader(f"📋 Produtos Encontrados: {len(df_produtos)}")
+        
+        if not df_produtos.empty:
+            st.write("Selecione um ou mais produtos na tabela para editar em lote, ou um para editar o cadastro:")
+            
+            # A chave da tabela muda depois de uma ação em lote, o que limpa a seleção
+            if 'tabela_produtos_versao' not in st.session_state:
+                st.session_state.tabela_produtos_versao = 0
+            
+            evento = st.dataframe(
+                df_produtos[['nome', 'codigo', 'categoria', 'preco_formatado', 'quantidade', 'estoque_minimo', 'status']],
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key=f"tabela_produtos_{st.session_state.tabela_produtos_versao}",
+                column_config={
+                    'nome': 'Nome',
+                    'codigo': 'Código',
+                    'categoria': 'Categoria',
+                    'preco_formatado': 'Preço',
+                    'quantidade': 'Estoque',
+                    'estoque_minimo': 'Mínimo',
+                    'status': 'Status',
+                }
+            )
+            selecionados = df_produtos['id'].iloc[evento.selection.rows].astype(int).tolist()
+            
+            if selecionados:
+                _acoes_em_lote(selecionados)
+            
+            if st.button("📝 Editar Produto Selecionado", disabled=len(selecionados) != 1):
+                # Cadastro lido do banco na abertura da edição, com a versão usada na gravação
+                st.session_state.produto_editando = get_produto_edicao(selecionados[0], get_local_operacao())
+                st.session_state.editando = True
+                st.rerun()
+            
+            # Formulário de edição
+            if 'editando' in st.session_state and st.session_state.editando:
+                st.divider()
+                st.subheader("✏️ Editar Produto")
+                
+                produto = st.session_state.produto_editando
+                
+                if st.session_state.pop('conflito_edicao', False):
+                    st.warning("⚠️ O produto foi alterado por outra pessoa; o formulário mostra os dados atuais.")
+                
+                with st.form("editar_produto_form"):
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        nome = st.text_input("Nome do Produto*", value=produto['nome'])
+                        codigo = st.text_input("Código (SKU/EAN)", value=produto.get('codigo') or '')
+                        opcoes = list(categorias)
+                        categoria_id = st.selectbox(
+                            "Categoria*", opcoes, format_func=categorias.get,
+                            index=opcoes.index(produto['categoria_id']) if produto['categoria_id'] in categorias else None
+                        )
+                        preco = st.number_input("Preço Unitário (R$)*", min_value=0.01, step=0.01, value=float(produto['preco']))
+                    
+                    with col2:
+                        quantidade = st.number_input(
+                            f"Quantidade em Estoque ({get_nome_local(get_local_operacao())})*",
+                            min_value=0, step=1, value=int(produto['quantidade'])
+                        )
+                        estoque_minimo = st.number_input("Estoque Mínimo*", min_value=0, step=1, value=int(produto['estoque_minimo']))
+                        descricao = st.text_area("Descrição", value=produto.get('descricao', '') or '')
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        submitted = st.form_submit_button("💾 Salvar Alterações")
+                    
+                    with col2:
+                        cancelar = st.form_submit_button("❌ Cancelar")
+                    
+                    if submitted:
+                        if nome and categoria_id and preco > 0:
+                            # A quantidade vai como ajuste sobre o saldo lido, preservando as vendas feitas durante a edição
+                            resultado = editar_produto(produto['id'], nome, descricao, categoria_id, preco,
+                                                       quantidade - int(produto['quantidade']), estoque_minimo,
+                                                       get_local_operacao(), codigo.strip() or None, produto['versao'])
+                            if resultado:
+                                st.success("✅ Produto atualizado com sucesso!")
+                                st.session_state.editando = False
+                                del st.session_state.produto_editando
+                                st.cache_data.clear()
+                                st.rerun()
+                            elif resultado is None:
+                                # Conflito: recarrega o cadastro atual para o usuário refazer as alterações
+                                st.session_state.produto_editando = get_produto_edicao(produto['id'], get_local_operacao())
+                                st.session_state.conflito_edicao = True
+                                st.cache_data.clear()
+                                st.rerun()
+                        else:
+                            st.error("❌ Por favor, preencha todos os campos obrigatórios.")
+                    
+                    if cancelar:
+                        st.session_state.editando = False
+                        del st.session_state.produto_editando
+                        st.rerun()
+        else:
+            st.info("Nenhum produto encontrado com os filtros aplicados.")
+    else:
+        st.info("Nenhum produto cadastrado ainda.")
+
+# Função para concluir uma ação em lote: limpa a seleção, o cache e recarrega a página
+def _concluir_acao_em_lote():
+    st.session_state.tabela_produtos_versao += 1
+    st.cache_data.clear()
+    st.rerun()
+
+# Ações em lote sobre os produtos selecionados (cada uma é um UPDATE só no banco)
+def _acoes_em_lote(selecionados):
+    st.subheader(f"🧰 Ações em Lote ({len(selecionados)} selecionado(s))")
+    categorias = {categoria_id: nome for categoria_id, nome, _ in get_categorias()}
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        zerar_estoque = st.checkbox("Zerar o estoque dos produtos", help="Registra a saída de todo o saldo em cada local")
+        if st.button("🗑️ Remover Selecionados"):
+            removidos = remover_produtos_selecionados(selecionados, zerar_estoque)
+            if removidos is not None:
+                st.success(f"✅ {removidos} produto(s) removido(s) com sucesso!")
+                _concluir_acao_em_lote()
+    
+    with col2:
+        categoria_id = st.selectbox("Nova categoria", list(categorias), format_func=categorias.get)
+        if st.button("📂 Alterar Categoria"):
+            if alterar_categoria_produtos(selecionados, categoria_id) is not None:
+                _concluir_acao_em_lote()
+    
+    with col3:
+        estoque_minimo = st.number_input("Novo estoque mínimo", min_value=0, step=1)
+        if st.button("📉 Definir Mínimo"):
+            if definir_minimo_produtos(selecionados, estoque_minimo) is not None:
+                _concluir_acao_em_lote()
+    
+    with col4:
+        percentual = st.number_input("Reajuste de preço (%)", min_value=-99.0, step=1.0, value=0.0)
+        if st.button("💲 Reajustar Preços", disabled=percentual == 0):
+            if reajustar_preco_produtos(selecionados, percentual) is not None:
+                _concluir_acao_em_lote()
@@ -0,0 +1,146 @@
+import pytest
+
+from estoque.banco import conectar, criar_schema
+from estoque.movimentacoes import registrar_movimentacao, registrar_transferencia
+from estoque.razao import verificar_razao
+from estoque.sincronizacao import (
+    SQL_PENDENTES, get_pendentes, get_sincronizado_ate, provisionar_terminal, receber_lote, sincronizar
+)
+
+
+# Banco central com um produto perecível no local Principal (10 unidades em um lote) e um segundo local,
+# e um terminal provisionado a partir dele
+@pytest.fixture
+def bancos(tmp_path):
+    central = str(tmp_path / 'central.db')
+    terminal = str(tmp_path / 'terminal.db')
+    
+    conn = conectar(central)
+    criar_schema(conn)
+    conn.execute("INSERT INTO locais (id, nome) VALUES (2, 'Depósito')")
+    conn.execute('''
+        INSERT INTO produtos (id, nome, categoria_id, preco, quantidade, estoque_minimo)
+        VALUES (1, 'Leite', (SELECT id FROM categorias WHERE perecivel = 1 LIMIT 1), 5, 0, 0)
+    ''')
+    registrar_movimentacao(conn.cursor(), 'ENTRADA', 10, 1, 'Estoque inicial', 1, [('L1', '2030-01-01', 10)], 3)
+    conn.commit()
+    conn.close()
+    
+    provisionar_terminal(central, terminal)
+    return central, terminal
+
+# Função para registrar movimentações no terminal (uma transação)
+def _no_terminal(caminho, *movimentacoes):
+    conn = conectar(caminho)
+    try:
+        cursor = conn.cursor()
+        for registrar, args in movimentacoes:
+            registrar(cursor, *args)
+        conn.commit()
+    finally:
+        conn.close()
+
+# Função para consultar o banco central
+def _consultar(caminho, sql, params=()):
+    conn = conectar(caminho)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+# Saldos de estoque_locais do produto 1 no banco central {local_id: quantidade}
+def _saldos(caminho):
+    return dict(_consultar(caminho, "SELECT local_id, quantidade FROM estoque_locais WHERE produto_id = 1"))
+
+def test_provisionamento_marca_tudo_como_sincronizado(bancos):
+    _, terminal = bancos
+    conn = conectar(terminal)
+    try:
+        assert get_sincronizado_ate(conn) == 1
+        assert get_pendentes(conn) == 0
+    finally:
+        conn.close()
+
+def test_lote_reenviado_nao_e_aplicado_de_novo(bancos):
+    central, terminal = bancos
+    _no_terminal(terminal, (registrar_movimentacao, ('SAIDA', 2, 1, 'Venda', 1)),
+                 (registrar_movimentacao, ('SAIDA', 1, 1, 'Venda', 1)))
+    
+    # O central confirma o lote, mas a confirmação não chega ao terminal
+    conn_terminal = conectar(terminal)
+    conn_central = conectar(central)
+    try:
+        pendentes = conn_terminal.execute(SQL_PENDENTES, (get_sincronizado_ate(conn_terminal), 100)).fetchall()
+        assert receber_lote(conn_central, 'caixa1', pendentes) == (2, 0)
+    finally:
+        conn_central.close()
+        conn_terminal.close()
+    
+    resultado = sincronizar(terminal, central, 'caixa1')
+    assert resultado == {'enviadas': 2, 'aplicadas': 0, 'conflitos': 0}
+    assert _saldos(central) == {1: 7}
+    assert _consultar(central, "SELECT COUNT(*) FROM sincronizacao_recebidas WHERE terminal = 'caixa1'") == [(2,)]
+
+def test_saida_sem_saldo_no_central_vira_conflito(bancos):
+    central, terminal = bancos
+    # O central vende 8 das 10 unidades depois do provisionamento; o terminal ainda vê 10
+    conn = conectar(central)
+    registrar_movimentacao(conn.cursor(), 'SAIDA', 8, 1, 'Venda no balcão', 1)
+    conn.commit()
+    conn.close()
+    _no_terminal(terminal, (registrar_movimentacao, ('SAIDA', 5, 1, 'Venda', 1)),
+                 (registrar_movimentacao, ('SAIDA', 1, 1, 'Venda', 1)))
+    
+    resultado = sincronizar(terminal, central, 'caixa1')
+    assert resultado == {'enviadas': 2, 'aplicadas': 1, 'conflitos': 1}
+    assert _saldos(central) == {1: 1}
+    assert _consultar(central, "SELECT seq, tipo, quantidade FROM sincronizacao_conflitos") == [(2, 'SAIDA', 5)]
+    
+    conn = conectar(terminal)
+    try:
+        assert get_pendentes(conn) == 0
+    finally:
+        conn.close()
+
+def test_transferencia_nao_e_separada_entre_lotes(bancos):
+    central, terminal = bancos
+    _no_terminal(terminal, (registrar_transferencia, (1, 4, 1, 2, 'Transferência do local 1 para o local 2')))
+    
+    # Lote de uma movimentação: o lote é estendido para levar a entrada junto com a saída
+    resultado = sincronizar(terminal, central, 'caixa1', lote=1)
+    assert resultado == {'enviadas': 2, 'aplicadas': 2, 'conflitos': 0}
+    assert _saldos(central) == {1: 6, 2: 4}
+    lotes = _consultar(central, "SELECT local_id, codigo, quantidade FROM lotes WHERE quantidade > 0 ORDER BY local_id")
+    assert lotes == [(1, 'L1', 6), (2, 'L1', 4)]
+    assert _consultar(central, "SELECT COUNT(*) FROM movimentacoes WHERE transferencia = 1") == [(2,)]
+    # A transferência não muda o custo do estoque
+    assert _consultar(central, "SELECT quantidade, valor_fifo FROM custo_produtos WHERE produto_id = 1") == [(10, 30.0)]
+
+def test_conciliacoes_do_terminal_nao_sao_enviadas(bancos):
+    central, terminal = bancos
+    conn = conectar(terminal)
+    conn.execute('''
+        INSERT INTO movimentacoes (tipo, quantidade, produto_id, observacao, local_id, conciliacao)
+        VALUES ('ENTRADA', 3, 1, 'Conciliação do livro razão', 1, 1)
+    ''')
+    conn.commit()
+    conn.close()
+    _no_terminal(terminal, (registrar_movimentacao, ('SAIDA', 2, 1, 'Venda', 1)))
+    
+    conn = conectar(terminal)
+    try:
+        assert get_pendentes(conn) == 1
+    finally:
+        conn.close()
+    
+    resultado = sincronizar(terminal, central, 'caixa1')
+    assert resultado == {'enviadas': 1, 'aplicadas': 1, 'conflitos': 0}
+    assert _consultar(central, "SELECT COUNT(*) FROM movimentacoes WHERE conciliacao = 1") == [(0,)]
+    
+    # O razão do central continua conferindo com os saldos
+    conn = conectar(central)
+    try:
+        divergencias, _ = verificar_razao(conn)
+        assert divergencias.empty
+    finally:
+        conn.close()